@@ -11,4 +11,4 @@ class UserAdmin(ModelView, model=User):
     async def on_model_change(self, data, model, is_created, request) -> None:
         if is_created:
             # Hash the password before saving into DB !
-            data["hashed_password"] = get_password_hash(data["hashed_password"])
+            data["hashed_password"] = await get_password_hash(data["hashed_password"])
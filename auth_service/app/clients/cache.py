@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    In-memory кэш с ограничением размера (LRU) и временем жизни записей.
+
+    Атрибуты:
+        maxsize (int): Максимальное количество записей, при превышении вытесняются давно не использованные.
+        ttl (float): Время жизни записи по умолчанию в секундах.
+        hits (int): Количество попаданий в кэш.
+        misses (int): Количество промахов кэша.
+
+    Просроченные записи не удаляются при чтении, а хранятся до вытеснения: их можно получить
+    через get_stale, если источник данных недоступен.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Получение значения из кэша"""
+        item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Сохранение значения, время жизни не больше ttl по умолчанию"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_stale(self, key: Hashable) -> Any | None:
+        """Получение значения из кэша без учета времени жизни"""
+        item = self._data.get(key)
+        return None if item is None else item[1]
+
+    def delete(self, key: Hashable) -> None:
+        """Удаление значения из кэша"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистка кэша"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Статистика использования кэша"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
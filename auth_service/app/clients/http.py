@@ -0,0 +1,53 @@
+import httpx
+
+from app.config import settings
+from app.logging_config import logger
+
+
+class HTTPClientPool:
+    """
+    Долгоживущие HTTP-клиенты для запросов к другим сервисам: по одному httpx.AsyncClient на сервис.
+
+    Клиенты переиспользуют соединения (keep-alive) вместо установки нового TCP-соединения на каждый запрос.
+    Создаются в lifespan приложения и закрываются при его остановке. Если клиент запрошен вне lifespan
+    (скрипты, консьюмеры), он создается при первом обращении.
+    HTTP/2 используется только для HTTPS: для http:// httpx работает по HTTP/1.1.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, service: str) -> httpx.AsyncClient:
+        """Получение клиента для сервиса"""
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._clients[service] = self._create_client()
+        return client
+
+    def open(self, *services: str) -> None:
+        """Создание клиентов при старте приложения"""
+        for service in services:
+            self.get(service)
+        logger.info(f"Открыты HTTP-клиенты для сервисов: {', '.join(services)}")
+
+    async def close(self) -> None:
+        """Закрытие всех клиентов и их соединений"""
+        for service, client in self._clients.items():
+            await client.aclose()
+            logger.info(f"Закрыт HTTP-клиент для сервиса {service}")
+        self._clients.clear()
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=settings.HTTP2_ENABLED,
+        )
+
+
+http_clients = HTTPClientPool()
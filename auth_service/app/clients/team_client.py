@@ -3,27 +3,42 @@ from typing import Any
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.cache import TTLCache
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 from app.logging_config import logger
-from app.schemas.users import TeamRoleResponse
+from app.schemas.users import EmployeeRole, TeamRoleResponse
 
 BASE_TEAM_URL = settings.get_team_url()
+inflight = SingleFlight()
+# Роли работников в командах по ключу (user_id, team_id), инвалидируются событиями Team Service
+role_cache = TTLCache(maxsize=settings.ROLE_CACHE_MAXSIZE, ttl=settings.ROLE_CACHE_TTL)
+# Счетчик инвалидаций: роль, запрошенная до инвалидации, не должна попасть в кэш после нее
+_role_invalidations = 0
+
+
+def invalidate_employee_role(user_id: int, team_id: int) -> None:
+    """Удаление роли работника из кэша"""
+    global _role_invalidations
+    _role_invalidations += 1
+    role_cache.delete((user_id, team_id))
 
 
 class TeamServiceClient:
     """Клиент для взаимодействия с Team Service"""
 
-    def __init__(self, base_url: str = BASE_TEAM_URL):
+    def __init__(self, base_url: str = BASE_TEAM_URL, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
         self.headers = {"X-API-KEY": settings.TEAM_API_KEY}
-        self.timeout = httpx.Timeout(10.0, connect=5.0)
 
     async def _request(self, method: str, url: str, **kwargs):
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(method, url, headers=self.headers, **kwargs)
-                response.raise_for_status()
-                return response
+            client = self.http_client or http_clients.get("team")
+            response = await client.request(method, url, headers=self.headers, **kwargs)
+            response.raise_for_status()
+            return response
         except httpx.HTTPStatusError as e:
             logger.error(f"Ошибка при обращении к Team Service: {e}")
             status_code = e.response.status_code
@@ -42,9 +57,32 @@ class TeamServiceClient:
             ) from e
 
     async def get_employee_role(self, user_id: int, team_id: int) -> TeamRoleResponse:
-        """Получение роли работника из Team Service"""
+        """
+        Получение роли работника.
+        Роль берется из кэша, при промахе запрашивается в Team Service. Если Team Service недоступен,
+        используется последняя известная роль, а при ее отсутствии - роль сотрудника (минимальные права).
+        """
+        key = (user_id, team_id)
+        role = role_cache.get(key)
+        if role is not None:
+            return role
+        invalidations = _role_invalidations
+        try:
+            role = await self._get_employee_role(user_id, team_id)
+        except (HTTPException, httpx.HTTPError) as e:
+            if isinstance(e, HTTPException) and e.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                raise
+            role = role_cache.get_stale(key) or TeamRoleResponse(role=EmployeeRole.EMPLOYEE)
+            logger.warning(f"Team Service недоступен, для работника {user_id} используется роль {role.role.value}")
+            return role
+        if invalidations == _role_invalidations:
+            role_cache.set(key, role)
+        return role
+
+    async def _get_employee_role(self, user_id: int, team_id: int) -> TeamRoleResponse:
+        """Запрос роли работника в Team Service, одновременные одинаковые запросы объединяются"""
         url = f"{self.base_url}/teams/{team_id}/employees/{user_id}"
-        response = await self._request("GET", url)
+        response = await inflight.do(url, lambda: self._request("GET", url))
         return TeamRoleResponse.model_validate(response.json())
 
     async def add_employee_to_team(self, employee_id: int, team_code: str) -> dict[str, Any]:
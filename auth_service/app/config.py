@@ -15,6 +15,19 @@ class Setting(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    RABBITMQ_URL: str
+
+    JWT_KEYS_DIR: Path = Path(__file__).parent.parent / "keys"
+    JWT_KEY_ROTATION_DAYS: int = 30
+    JWKS_MAX_AGE: int = 300
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    ROLE_CACHE_TTL: int = 600
+    ROLE_CACHE_MAXSIZE: int = 10000
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
 
     LOG_DIR: Path = Path(__file__).parent.parent / "logs"
     LOG_DIR.mkdir(parents=True, exist_ok=True)
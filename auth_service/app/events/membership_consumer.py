@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import aio_pika
+from pydantic import ValidationError
+
+from app.clients.team_client import invalidate_employee_role
+from app.config import settings
+from app.logging_config import logger
+from app.schemas.membership_messages import MembershipMessage, MembershipMessageType
+
+# Пауза перед повторным подключением, если брокер недоступен при старте (сек)
+RECONNECT_DELAY = 5
+
+
+class MembershipEventConsumer:
+    """
+    Консьюмер событий изменения состава команд из Team Service.
+
+    По событию роль работника удаляется из кэша и при следующем входе запрашивается заново.
+    Каждый экземпляр сервиса получает все события через собственную временную очередь.
+    """
+
+    def __init__(self, exchange_name: str = "team_membership", rabbitmq_url: str = settings.RABBITMQ_URL):
+        self.rabbitmq_url = rabbitmq_url
+        self.exchange_name = exchange_name
+        self.connection: aio_pika.abc.AbstractRobustConnection | None = None
+
+    async def start_consumer(self) -> None:
+        """Подключение к брокеру и запуск консьюмера"""
+        while self.connection is None:
+            try:
+                self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
+            except (aio_pika.exceptions.AMQPError, OSError) as e:
+                logger.warning(f"Брокер сообщений недоступен, повторное подключение через {RECONNECT_DELAY} сек: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+        logger.info("Открыто соединение с брокером")
+        try:
+            channel = await self.connection.channel()
+            exchange = await channel.declare_exchange(self.exchange_name, aio_pika.ExchangeType.FANOUT)
+            queue = await channel.declare_queue(exclusive=True)
+            await queue.bind(exchange)
+            await queue.consume(self.handle_event)
+            logger.info("[Auth Service] Waiting for team membership events...")
+            await asyncio.Future()
+        finally:
+            await self.connection.close()
+            logger.info("Соединение с брокером закрыто")
+
+    async def handle_event(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        """Обработчик событий"""
+        async with message.process():
+            try:
+                data = json.loads(message.body)
+                event_type = MembershipMessageType(data["type"])
+                event = MembershipMessage.model_validate(data["payload"])
+            except (KeyError, ValueError, ValidationError) as e:
+                logger.error(f"Некорректное событие изменения состава команды: {e}")
+                return
+            invalidate_employee_role(event.employee_id, event.team_id)
+            logger.info(
+                f"Событие {event_type.value}: роль работника {event.employee_id} в команде {event.team_id} "
+                "удалена из кэша"
+            )
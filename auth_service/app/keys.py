@@ -0,0 +1,135 @@
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+import rsa
+from jose import jwk
+
+from app.config import settings
+from app.logging_config import logger
+
+SIGNING_ALGORITHM = "RS256"
+KEY_SIZE = 2048
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """Ключ подписи JWT"""
+
+    kid: str
+    created_at: int
+    private_pem: str
+
+    @cached_property
+    def public_jwk(self) -> dict:
+        """Публичная часть ключа в формате JWK"""
+        data = jwk.construct(self.private_pem, SIGNING_ALGORITHM).public_key().to_dict()
+        return data | {"kid": self.kid, "use": "sig"}
+
+
+class KeyStore:
+    """
+    Хранилище ключей подписи JWT.
+
+    Ключи хранятся в каталоге в виде PEM-файлов `<kid>.pem`, kid начинается с времени создания ключа.
+    Токены подписываются самым новым ключом. После ротации предыдущие ключи остаются в JWKS,
+    пока подписанные ими токены могут быть действительны, затем удаляются.
+    """
+
+    def __init__(
+        self,
+        keys_dir: Path = settings.JWT_KEYS_DIR,
+        rotation_days: int = settings.JWT_KEY_ROTATION_DAYS,
+        token_ttl_minutes: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+    ):
+        self.keys_dir = keys_dir
+        self.rotation_period = rotation_days * 24 * 60 * 60
+        self.retention_period = token_ttl_minutes * 60
+        self._keys: dict[str, SigningKey] = {}
+        self._dir_mtime: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> SigningKey:
+        """Текущий ключ подписи"""
+        self._reload()
+        if not self._keys:
+            self.rotate()
+        return max(self._keys.values(), key=lambda key: key.created_at)
+
+    def get(self, kid: str) -> SigningKey | None:
+        """Получение ключа по kid"""
+        self._reload()
+        return self._keys.get(kid)
+
+    def jwks(self) -> dict:
+        """Публичные ключи в формате JWKS"""
+        self._reload()
+        return {"keys": [key.public_jwk for key in sorted(self._keys.values(), key=lambda key: -key.created_at)]}
+
+    def rotate_if_due(self) -> None:
+        """Ротация ключа, если активный ключ старше периода ротации, и удаление устаревших ключей"""
+        self._reload()
+        if not self._keys or time.time() - self.active.created_at >= self.rotation_period:
+            self.rotate()
+        self._prune()
+
+    def rotate(self) -> SigningKey:
+        """Генерация нового ключа подписи"""
+        with self._lock:
+            created_at = int(time.time())
+            kid = f"{created_at}-{secrets.token_hex(4)}"
+            _, private_key = rsa.newkeys(KEY_SIZE)
+            private_pem = private_key.save_pkcs1().decode()
+
+            self.keys_dir.mkdir(parents=True, exist_ok=True)
+            path = self.keys_dir / f"{kid}.pem"
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(private_pem)
+            tmp_path.chmod(0o600)
+            os.replace(tmp_path, path)
+
+            key = SigningKey(kid=kid, created_at=created_at, private_pem=private_pem)
+            self._keys[kid] = key
+            logger.info(f"Создан новый ключ подписи JWT {kid}")
+            return key
+
+    def _prune(self) -> None:
+        """Удаление ключей, которыми уже не могут быть подписаны действующие токены"""
+        with self._lock:
+            keys = sorted(self._keys.values(), key=lambda key: key.created_at)
+            now = time.time()
+            for key, successor in zip(keys, keys[1:]):
+                if now - successor.created_at > self.retention_period:
+                    (self.keys_dir / f"{key.kid}.pem").unlink(missing_ok=True)
+                    self._keys.pop(key.kid, None)
+                    logger.info(f"Удален устаревший ключ подписи JWT {key.kid}")
+
+    def _reload(self) -> None:
+        """Перечитывание каталога ключей, если он изменился (ключи могут ротироваться другим процессом)"""
+        try:
+            mtime = self.keys_dir.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._dir_mtime:
+            return
+        with self._lock:
+            keys = {}
+            for path in self.keys_dir.glob("*.pem"):
+                kid = path.stem
+                created_at, _, _ = kid.partition("-")
+                if not created_at.isdigit():
+                    logger.warning(f"Пропущен файл ключа с некорректным kid: {path.name}")
+                    continue
+                keys[kid] = self._keys.get(kid) or SigningKey(
+                    kid=kid, created_at=int(created_at), private_pem=path.read_text()
+                )
+            self._keys = keys
+            self._dir_mtime = mtime
+
+
+key_store = KeyStore()
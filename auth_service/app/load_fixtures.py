@@ -23,7 +23,7 @@ async def load_fixtures(data: dict):
         # Загружаем User
         for ts_data in data:
             password = ts_data.pop("password")
-            ts_data["hashed_password"] = get_password_hash(password)
+            ts_data["hashed_password"] = await get_password_hash(password)
             ts = User(**ts_data)
             session.add(ts)
         await session.commit()
@@ -1,14 +1,61 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqladmin import Admin
 
 from app.admin.authentication import authentication_backend
 from app.admin.views import UserAdmin
+from app.clients.http import http_clients
+from app.config import settings
 from app.database import async_engine
+from app.events.membership_consumer import MembershipEventConsumer
+from app.keys import SIGNING_ALGORITHM, key_store
+from app.logging_config import logger
 from app.routers.auth import router as auth_router
 from app.routers.users import router as user_router
+from app.security import password_hasher
+
+# Интервал проверки необходимости ротации ключей подписи JWT (сек)
+KEY_ROTATION_CHECK_INTERVAL = 60 * 60
+
+
+async def rotate_signing_keys() -> None:
+    """Периодическая ротация ключей подписи JWT"""
+    while True:
+        await asyncio.sleep(KEY_ROTATION_CHECK_INTERVAL)
+        try:
+            await asyncio.to_thread(key_store.rotate_if_due)
+        except Exception as e:
+            logger.error("Ошибка при ротации ключей подписи JWT", exc_info=e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Подготовка ключей подписи JWT и запуск их периодической ротации, открытие HTTP-клиентов
+    и запуск консьюмера событий изменения состава команд
+    """
+    http_clients.open("team")
+    consumer_task = asyncio.create_task(MembershipEventConsumer().start_consumer())
+    if settings.ALGORITHM == SIGNING_ALGORITHM:
+        await asyncio.to_thread(key_store.rotate_if_due)
+        task = asyncio.create_task(rotate_signing_keys())
+        yield
+        task.cancel()
+    else:
+        yield
+    consumer_task.cancel()
+    try:
+        await consumer_task
+    except asyncio.CancelledError:
+        logger.info("Фоновая задача RabbitMQ остановлена")
+    await http_clients.close()
+    password_hasher.shutdown()
+
 
-app = FastAPI(root_path="/users")
+app = FastAPI(root_path="/users", lifespan=lifespan)
 
 admin = Admin(app, async_engine, authentication_backend=authentication_backend)
 
@@ -1,10 +1,14 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.routers.dependencies import AuthServiceDeps, CurrentUserDeps
+from app.config import settings
+from app.keys import key_store
+from app.routers.dependencies import AuthServiceDeps, CurrentUserDeps, RequiredAdminDeps
 from app.schemas.users import Token, UserTokenResponse
+from app.security import password_hasher
 
 router = APIRouter()
 
@@ -20,3 +24,17 @@ async def login_for_access_token(
 @router.get("/verify", response_model=UserTokenResponse, summary="Верификация токена")
 async def verify_token(user: CurrentUserDeps) -> UserTokenResponse:
     return user
+
+
+@router.get("/.well-known/jwks.json", summary="Публичные ключи для проверки токенов")
+async def get_jwks() -> JSONResponse:
+    return JSONResponse(
+        content=key_store.jwks(), headers={"Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE}"}
+    )
+
+
+@router.get(
+    "/password-hashing/stats", dependencies=[RequiredAdminDeps], summary="Состояние пула хеширования паролей"
+)
+async def get_password_hashing_stats() -> dict:
+    return password_hasher.stats()
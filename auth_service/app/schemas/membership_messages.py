@@ -0,0 +1,16 @@
+import enum
+
+from pydantic import BaseModel
+
+
+class MembershipMessageType(str, enum.Enum):
+    ADDED = "added"
+    ROLE_CHANGED = "role_changed"
+    REMOVED = "removed"
+
+
+class MembershipMessage(BaseModel):
+    """Изменение состава команды или роли работника"""
+
+    employee_id: int
+    team_id: int
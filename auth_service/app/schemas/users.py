@@ -40,6 +40,7 @@ class UserResponse(BaseModel):
     name: str
     email: EmailStr
     team_id: int
+    is_active: bool
 
     model_config = {"from_attributes": True}
 
@@ -47,7 +48,6 @@ class UserResponse(BaseModel):
 class UserTokenResponse(UserResponse):
     """Модель ответа для пользователя со статусом доступа"""
 
-    is_active: bool
     role: "EmployeeRole" = EmployeeRole.EMPLOYEE
     status: Status
 
@@ -1,10 +1,16 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
+from app.keys import SIGNING_ALGORITHM, key_store
+from app.logging_config import logger
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/auth/token")
 
@@ -12,18 +18,85 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/auth/token")
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+# Алгоритмы токенов, подписанных общим секретом SECRET_KEY
+LEGACY_ALGORITHMS = ["HS256", "HS384", "HS512"]
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def verify_password(plain_password, hashed_password) -> bool:
+class PasswordHasher:
+    """
+    Выполнение хеширования и проверки паролей в отдельном пуле потоков.
+
+    bcrypt занимает процессор на 100-300 мс и освобождает GIL, поэтому вычисления выносятся
+    из event loop в пул потоков ограниченного размера. Количество операций в пуле (выполняемых
+    и ожидающих в очереди) ограничено: при превышении лимита запрос сразу отклоняется с 503,
+    а не ждет в очереди, задерживая остальные запросы.
+
+    Атрибуты:
+        workers (int): Количество потоков для вычисления хешей.
+        max_pending (int): Максимальное количество операций в пуле.
+        rejected (int): Количество отклоненных операций.
+    """
+
+    def __init__(
+        self, workers: int = settings.PASSWORD_HASH_WORKERS, max_pending: int = settings.PASSWORD_HASH_MAX_PENDING
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rejected = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+
+    async def run(self, func, *args):
+        """Выполнение func в пуле потоков"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                logger.warning(f"Пул хеширования паролей переполнен: {self._pending} операций в очереди")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Service is busy, try again later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        # Счетчик уменьшается по завершении вычисления в потоке, а не при отмене ожидающего запроса
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Состояние пула: выполняемые операции и глубина очереди"""
+        pending = self._pending
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_progress": min(pending, self.workers),
+            "queued": max(pending - self.workers, 0),
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Остановка пула потоков"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+password_hasher = PasswordHasher()
+
+
+async def verify_password(plain_password, hashed_password) -> bool:
     """Верификация пароля по хешу"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password) -> str:
+async def get_password_hash(password) -> str:
     """Преобразование пароля в хеш"""
-    return pwd_context.hash(password)
+    return await password_hasher.run(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expiries_delta: timedelta | None = None):
@@ -34,13 +107,26 @@ def create_access_token(data: dict, expiries_delta: timedelta | None = None):
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    if ALGORITHM == SIGNING_ALGORITHM:
+        key = key_store.active
+        return jwt.encode(to_encode, key.private_pem, algorithm=ALGORITHM, headers={"kid": key.kid})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict:
+    """
+    Декодирование JWT-токена.
+    Токены с kid проверяются публичным ключом из хранилища ключей,
+    токены без kid - общим секретом (выпущенные до перехода на асимметричные ключи).
+    """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            return jwt.decode(token, SECRET_KEY, algorithms=LEGACY_ALGORITHMS)
+        key = key_store.get(kid)
+        if key is None:
+            return None
+        return jwt.decode(token, key.public_jwk, algorithms=[SIGNING_ALGORITHM])
     except JWTError:
         return None
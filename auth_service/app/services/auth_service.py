@@ -20,7 +20,7 @@ class AuthService:
     async def authenticate_user(self, email: str, password: str):
         """Аутентификация пользователя"""
         user = await self.repo.get_user_by_email(email)
-        if not (user and verify_password(password, user.hashed_password)):
+        if not (user and await verify_password(password, user.hashed_password)):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -33,9 +33,9 @@ class AuthService:
         user = await self.authenticate_user(email, password)
         if not user.is_active:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
-        data = {"sub": str(user.id), "email": user.email, "status": user.status.value}
+        data = {"sub": str(user.id), "email": user.email, "status": user.status.value, "team_id": user.team_id}
         role = await self.team_client.get_employee_role(user.id, user.team_id)
-        data |= role
+        data |= role.model_dump(mode="json")
         access_token = create_access_token(data=data)
         logger.info(f"Пользователь {user.email} успешно вошел в систему")
         return Token(access_token=access_token, token_type="bearer")
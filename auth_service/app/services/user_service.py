@@ -21,7 +21,7 @@ class UserService:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Пользователь с таким email существует")
         password = user_data.pop("password")
         team_code = user_data.pop("team_code")
-        user = await self.repo.create(hashed_password=get_password_hash(password), **user_data)
+        user = await self.repo.create(hashed_password=await get_password_hash(password), **user_data)
         try:
             team = await self.team_client.add_employee_to_team(user.id, str(team_code))
         except Exception as e:
@@ -0,0 +1,44 @@
+from app.clients.cache import TTLCache
+
+
+class CacheBackend:
+    """
+    Хранилище сериализованных ответов.
+    Методы асинхронные, чтобы за тем же интерфейсом могло стоять сетевое хранилище.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    async def delete_many(self, keys: list[str]) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process LRU кэш с временем жизни записей.
+    Инвалидация видна только в текущем процессе: другие экземпляры сервиса удаляют свои записи
+    по оповещениям об изменениях календаря, а без них запись живет до истечения ttl.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._cache.set(key, value)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
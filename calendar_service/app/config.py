@@ -21,6 +21,52 @@ class Setting(BaseSettings):
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
     RABBITMQ_URL: str
+    CALENDAR_EVENTS_QUEUE: str = "calendar_service.calendar_events"
+    CONSUMER_PREFETCH_COUNT: int = 200
+    CONSUMER_WORKERS: int = 4
+    CONSUMER_BATCH_SIZE: int = 100
+    CONSUMER_BATCH_TIMEOUT_MS: int = 50
+    CONSUMER_RETRY_DELAYS: list[int] = [1, 5, 30, 120]
+    CONSUMER_MAX_ATTEMPTS: int = 5
+    CONSUMER_METRICS_POLL_SECONDS: int = 15
+
+    LOCAL_TOKEN_VERIFICATION: bool = True
+    STRICT_TOKEN_VERIFICATION: bool = False
+    JWKS_CACHE_TTL: int = 300
+
+    TOKEN_CACHE_TTL: int = 30
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+
+    # Кэш представлений календаря в памяти процесса (LRU)
+    CALENDAR_CACHE_MAXSIZE: int = 10000
+    CALENDAR_CACHE_TTL: int = 300
+
+    # Изменения отдаются клиентам с задержкой, чтобы не пропустить еще не закоммиченные транзакции
+    CALENDAR_SYNC_LAG_SECONDS: int = 5
+    CALENDAR_CHANGES_PAGE_SIZE: int = 500
+    CALENDAR_TOMBSTONE_RETENTION_DAYS: int = 30
+    MAINTENANCE_INTERVAL_SECONDS: int = 3600
+    # Секции таблицы событий создаются заранее на столько месяцев вперед
+    CALENDAR_PARTITIONS_AHEAD_MONTHS: int = 3
+    # Секции месяцев старше этого срока отсоединяются в схему архива, 0 - архивирование отключено
+    CALENDAR_ARCHIVE_AFTER_MONTHS: int = 0
+    CALENDAR_ARCHIVE_SCHEMA: str = "events_archive"
+
+    CALENDAR_CHANGES_EXCHANGE: str = "calendar_changes"
+    SSE_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_MAX_CONNECTIONS_PER_USER: int = 5
+
+    # Размер пакета записи событий при пакетной загрузке через вебхук, каждый пакет - отдельная транзакция
+    BULK_EVENTS_BATCH_SIZE: int = 5000
+
+    # Ключ подписи токенов подписки на календарь (.ics), без ключа подписка недоступна
+    CALENDAR_FEED_SECRET: str = ""
+    CALENDAR_FEED_BATCH_SIZE: int = 500
 
     model_config = SettingsConfigDict(env_file=".env")
 
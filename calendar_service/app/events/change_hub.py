@@ -0,0 +1,101 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.logging_config import logger
+
+# Маркер переполнения очереди подписчика: клиент должен догнать изменения через /calendar/changes
+RESYNC = {"type": "resync"}
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Подписка клиента на изменения календаря сотрудника"""
+
+    employee_id: int
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE))
+
+
+class ChangeHub:
+    """
+    Рассылка уведомлений об изменениях календаря подключенным клиентам внутри процесса.
+
+    Подписки хранятся по employee_id, у каждой подписки ограниченная очередь. Если клиент не успевает
+    забирать уведомления и очередь переполнена, подписка отключается: в очередь кладется маркер RESYNC,
+    после которого поток уведомлений завершается, а клиент запрашивает пропущенное по курсору.
+    """
+
+    def __init__(self, max_per_user: int = settings.SSE_MAX_CONNECTIONS_PER_USER):
+        self.max_per_user = max_per_user
+        self._subscriptions: dict[int, set[Subscription]] = {}
+
+    def check_limit(self, employee_id: int) -> None:
+        """Проверка количества подключений сотрудника до начала ответа, чтобы вернуть клиенту 429"""
+        if len(self._subscriptions.get(employee_id, ())) >= self.max_per_user:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Превышено количество подключений к календарю"
+            )
+
+    def subscribe(self, employee_id: int) -> Subscription:
+        self.check_limit(employee_id)
+        subscription = Subscription(employee_id)
+        self._subscriptions.setdefault(employee_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.employee_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.employee_id]
+
+    def publish(self, employee_id: int, notification: dict) -> None:
+        """Отправка уведомления всем подпискам сотрудника без ожидания"""
+        for subscription in list(self._subscriptions.get(employee_id, ())):
+            try:
+                subscription.queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                logger.warning(f"Очередь уведомлений сотрудника {employee_id} переполнена, подписка отключена")
+                self.unsubscribe(subscription)
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(RESYNC)
+
+    async def stream(self, employee_id: int, heartbeat: int = settings.SSE_HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+        """
+        Уведомления об изменениях календаря сотрудника в формате Server-Sent Events.
+        Подписка создается при начале отправки ответа и снимается при его завершении: если клиент отключился
+        раньше, подписка не создается. Без уведомлений раз в heartbeat секунд отправляется комментарий,
+        чтобы прокси не закрывали соединение.
+        """
+        try:
+            subscription = self.subscribe(employee_id)
+        except HTTPException as e:
+            # Лимит мог быть исчерпан другими подключениями после проверки в обработчике запроса
+            logger.warning(f"Подписка сотрудника {employee_id} на изменения календаря отклонена: {e.detail}")
+            return
+        try:
+            while True:
+                try:
+                    notification = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {notification['type']}\ndata: {json.dumps(notification)}\n\n"
+                if notification is RESYNC:
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscriptions),
+            "subscriptions": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+        }
+
+
+change_hub = ChangeHub()
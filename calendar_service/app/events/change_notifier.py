@@ -0,0 +1,149 @@
+import asyncio
+import json
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+
+import aio_pika
+
+from app.config import settings
+from app.events.change_hub import ChangeHub, change_hub
+from app.logging_config import logger
+from app.repositories.event_repo import EventPeriod
+from app.services.calendar_cache import CalendarViewCache, calendar_cache
+
+# Пауза перед повторным подключением к брокеру (сек)
+RECONNECT_DELAY = 5
+
+
+class CalendarChangeNotifier:
+    """
+    Оповещение экземпляров сервиса об изменениях календаря.
+
+    Сообщения из общей очереди событий распределяются между экземплярами, поэтому изменения, примененные
+    одним экземпляром, публикуются в fanout exchange. Каждый экземпляр слушает его через свою эксклюзивную
+    очередь: инвалидирует локальный кэш календаря и рассылает уведомления своим подключенным клиентам.
+    Если брокер недоступен, изменения применяются только в текущем процессе, а подключение
+    повторяется в фоне, пока не удастся. Дальнейшие разрывы восстанавливает robust-соединение.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str = settings.RABBITMQ_URL,
+        exchange_name: str = settings.CALENDAR_CHANGES_EXCHANGE,
+        hub: ChangeHub = change_hub,
+        cache: CalendarViewCache = calendar_cache,
+    ):
+        self.rabbitmq_url = rabbitmq_url
+        self.exchange_name = exchange_name
+        self.hub = hub
+        self.cache = cache
+        self.instance_id = uuid.uuid4().hex
+        self.connection: aio_pika.abc.AbstractRobustConnection | None = None
+        self.exchange: aio_pika.abc.AbstractExchange | None = None
+        self._connect_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Подключение к брокеру в фоне: запуск сервиса не ждет брокер"""
+        self._connect_task = asyncio.create_task(self._connect())
+
+    async def _connect(self) -> None:
+        failures = 0
+        while True:
+            try:
+                await self._subscribe()
+            except Exception as e:
+                failures += 1
+                if failures == 1:
+                    logger.error(f"Не удалось подключиться к брокеру, изменения календаря не будут рассылаться: {e}")
+                else:
+                    logger.warning(f"Брокер недоступен, повторное подключение через {RECONNECT_DELAY} сек: {e}")
+                await self._close_connection()
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            if failures:
+                logger.info(f"Подключение к брокеру восстановлено после {failures} попыток")
+            return
+
+    async def _subscribe(self) -> None:
+        self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
+        channel = await self.connection.channel()
+        exchange = await channel.declare_exchange(self.exchange_name, aio_pika.ExchangeType.FANOUT)
+        queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+        await queue.bind(exchange)
+        await queue.consume(self._on_message, no_ack=True)
+        self.exchange = exchange
+        logger.info(f"Подписка на изменения календаря через {self.exchange_name}")
+
+    async def close(self) -> None:
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            await asyncio.gather(self._connect_task, return_exceptions=True)
+            self._connect_task = None
+        await self._close_connection()
+
+    async def _close_connection(self) -> None:
+        self.exchange = None
+        if self.connection is not None:
+            try:
+                await self.connection.close()
+            except Exception as e:
+                logger.warning(f"Ошибка при закрытии соединения с брокером: {e}")
+        self.connection = None
+
+    async def publish(self, periods: Iterable[EventPeriod]) -> None:
+        """
+        Оповещение об измененных периодах событий. Вызывается после коммита изменений.
+        Локальный кэш инвалидируется сразу, остальные экземпляры получают сообщение через брокер.
+        """
+        periods = list(periods)
+        if not periods:
+            return
+        await self.cache.invalidate(periods)
+        changes = [
+            {
+                "employee_id": employee_id,
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat() if end_time else None,
+            }
+            for employee_id, start_time, end_time in periods
+        ]
+        if self.exchange is not None:
+            body = json.dumps({"origin": self.instance_id, "changes": changes}).encode()
+            try:
+                await self.exchange.publish(aio_pika.Message(body=body), routing_key="")
+                return
+            except Exception as e:
+                logger.error(f"Не удалось опубликовать изменения календаря: {e}")
+        self._notify(changes)
+
+    async def _on_message(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        try:
+            data = json.loads(message.body)
+            changes = data["changes"]
+            if data.get("origin") != self.instance_id:
+                await self.cache.invalidate(
+                    (
+                        change["employee_id"],
+                        datetime.fromisoformat(change["start_time"]),
+                        datetime.fromisoformat(change["end_time"]) if change["end_time"] else None,
+                    )
+                    for change in changes
+                )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Некорректное сообщение об изменении календаря: {e}")
+            return
+        self._notify(changes)
+
+    def _notify(self, changes: list[dict]) -> None:
+        """Уведомления подключенным клиентам, по одному на сотрудника"""
+        by_employee: dict[int, list[dict]] = {}
+        for change in changes:
+            by_employee.setdefault(change["employee_id"], []).append(
+                {"start_time": change["start_time"], "end_time": change["end_time"]}
+            )
+        for employee_id, periods in by_employee.items():
+            self.hub.publish(employee_id, {"type": "changed", "periods": periods})
+
+
+change_notifier = CalendarChangeNotifier()
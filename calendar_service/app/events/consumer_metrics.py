@@ -0,0 +1,183 @@
+import math
+import time
+from collections import deque
+from collections.abc import Iterable
+
+# Границы гистограмм: задержка обработки сообщения в секундах и размер пачки
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 200, 500, 1000)
+# Окно расчета пропускной способности (сообщений в секунду)
+THROUGHPUT_WINDOW_SECONDS = 60
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Метрика в текстовом формате Prometheus с набором значений по меткам"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+
+    def samples(self) -> Iterable[tuple[str, Labels, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{format_labels(labels)} {format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[tuple[str, Labels, float]]:
+        return ((self.name, labels, value) for labels, value in sorted(self.values.items()))
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram(Metric):
+    """Гистограмма с фиксированными границами, ведро хранит количество наблюдений не больше границы"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: Iterable[float]):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets))
+        self.values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        counts, total = self.values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        total[0] += value
+
+    def samples(self) -> Iterable[tuple[str, Labels, float]]:
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", (*labels, ("le", format_value(bound))), cumulative
+            yield f"{self.name}_sum", labels, total[0]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Throughput:
+    """Количество событий в секунду за последние window секунд (посекундные счетчики)"""
+
+    def __init__(self, window: int = THROUGHPUT_WINDOW_SECONDS):
+        self.window = window
+        self._seconds: deque[list[int]] = deque()
+
+    def add(self, amount: int = 1) -> None:
+        now = int(time.monotonic())
+        if self._seconds and self._seconds[-1][0] == now:
+            self._seconds[-1][1] += amount
+        else:
+            self._seconds.append([now, amount])
+        self._trim(now)
+
+    def rate(self) -> float:
+        now = int(time.monotonic())
+        self._trim(now)
+        return sum(amount for _, amount in self._seconds) / self.window
+
+    def _trim(self, now: int) -> None:
+        while self._seconds and self._seconds[0][0] <= now - self.window:
+            self._seconds.popleft()
+
+
+class ConsumerMetrics:
+    """
+    Метрики консьюмера событий календаря.
+
+    Обновляются консьюмером при обработке сообщений, глубина очередей - периодическим passive declare.
+    Отдаются в текстовом формате Prometheus на /metrics.
+    """
+
+    def __init__(self):
+        self.messages = Counter("calendar_consumer_messages_total", "Обработанные сообщения по типу и результату")
+        self.redelivered = Counter(
+            "calendar_consumer_redelivered_total",
+            "Повторно доставленные сообщения: broker - повторная доставка брокером, retry - из очереди ожидания",
+        )
+        self.latency = Histogram(
+            "calendar_consumer_message_latency_seconds",
+            "Время от получения сообщения до подтверждения по типу сообщения",
+            LATENCY_BUCKETS,
+        )
+        self.batch_duration = Histogram(
+            "calendar_consumer_batch_duration_seconds", "Время применения пачки событий", LATENCY_BUCKETS
+        )
+        self.batch_size = Histogram("calendar_consumer_batch_size", "Количество сообщений в пачке", BATCH_SIZE_BUCKETS)
+        self.throughput = Gauge(
+            "calendar_consumer_messages_per_second",
+            f"Подтвержденные сообщения в секунду за последние {THROUGHPUT_WINDOW_SECONDS} секунд",
+        )
+        self.backlog = Gauge("calendar_consumer_worker_backlog", "Полученные, но еще не обработанные сообщения")
+        self.last_ack = Gauge(
+            "calendar_consumer_last_ack_timestamp_seconds", "Время последнего подтверждения сообщения (unix time)"
+        )
+        self.queue_messages = Gauge("calendar_consumer_queue_messages", "Сообщения в очереди RabbitMQ")
+        self.queue_consumers = Gauge("calendar_consumer_queue_consumers", "Консьюмеры очереди RabbitMQ")
+        self._throughput = Throughput()
+
+    def acked(self, message_type: str, latency: float, result: str = "applied") -> None:
+        """Учет подтвержденного сообщения"""
+        self.messages.inc(type=message_type, result=result)
+        self.latency.observe(latency, type=message_type)
+        self._throughput.add()
+        self.last_ack.set(time.time())
+
+    def render(self) -> str:
+        self.throughput.set(self._throughput.rate())
+        metrics = (
+            self.messages,
+            self.redelivered,
+            self.latency,
+            self.batch_duration,
+            self.batch_size,
+            self.throughput,
+            self.backlog,
+            self.last_ack,
+            self.queue_messages,
+            self.queue_consumers,
+        )
+        return "".join(metric.render() for metric in metrics)
+
+
+consumer_metrics = ConsumerMetrics()
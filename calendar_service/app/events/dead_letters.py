@@ -0,0 +1,83 @@
+"""
+Просмотр и повторная обработка сообщений из очереди dead letter.
+
+Использование:
+    python -m app.events.dead_letters list [--limit N]
+    python -m app.events.dead_letters replay [--limit N]
+    python -m app.events.dead_letters purge
+"""
+
+import argparse
+import asyncio
+
+import aio_pika
+
+from app.config import settings
+from app.events.retry import ATTEMPT_HEADER, ERROR_HEADER, RetryTopology
+
+
+async def list_messages(channel: aio_pika.abc.AbstractChannel, topology: RetryTopology, limit: int) -> None:
+    """Вывод сообщений без удаления, неподтвержденные сообщения вернутся в очередь при закрытии канала"""
+    queue = await channel.get_queue(topology.dead_letter_queue_name)
+    for _ in range(limit):
+        message = await queue.get(no_ack=False, fail=False)
+        if message is None:
+            break
+        headers = message.headers or {}
+        print(f"attempt={headers.get(ATTEMPT_HEADER, 0)} error={headers.get(ERROR_HEADER, '')}")
+        print(message.body.decode(errors="replace"))
+
+
+async def replay_messages(channel: aio_pika.abc.AbstractChannel, topology: RetryTopology, limit: int) -> None:
+    """Возврат сообщений в основную очередь со сброшенным счетчиком попыток"""
+    queue = await channel.get_queue(topology.dead_letter_queue_name)
+    replayed = 0
+    for _ in range(limit):
+        message = await queue.get(no_ack=False, fail=False)
+        if message is None:
+            break
+        headers = {
+            key: value for key, value in (message.headers or {}).items() if key not in (ATTEMPT_HEADER, ERROR_HEADER)
+        }
+        await channel.default_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                content_type=message.content_type,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=topology.queue_name,
+        )
+        await message.ack()
+        replayed += 1
+    print(f"Возвращено в очередь {topology.queue_name}: {replayed}")
+
+
+async def purge_messages(channel: aio_pika.abc.AbstractChannel, topology: RetryTopology) -> None:
+    """Удаление всех сообщений из очереди dead letter"""
+    queue = await channel.get_queue(topology.dead_letter_queue_name)
+    result = await queue.purge()
+    print(f"Удалено сообщений: {result.message_count}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Очередь dead letter событий календаря")
+    parser.add_argument("command", choices=["list", "replay", "purge"])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--queue", default=settings.CALENDAR_EVENTS_QUEUE)
+    args = parser.parse_args()
+
+    topology = RetryTopology(args.queue)
+    connection = await aio_pika.connect(settings.RABBITMQ_URL)
+    async with connection:
+        channel = await connection.channel()
+        if args.command == "list":
+            await list_messages(channel, topology, args.limit)
+        elif args.command == "replay":
+            await replay_messages(channel, topology, args.limit)
+        else:
+            await purge_messages(channel, topology)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
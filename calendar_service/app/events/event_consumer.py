@@ -1,29 +1,72 @@
 import asyncio
 import json
-from typing import Any
+import time
+from itertools import groupby
 
 import aio_pika
+from pydantic import ValidationError
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import context_session
+from app.events.change_notifier import change_notifier
+from app.events.consumer_metrics import consumer_metrics
+from app.events.retry import ATTEMPT_HEADER, RetryTopology
 from app.logging_config import logger
-from app.repositories.event_repo import EventRepository
+from app.repositories.event_repo import EventPeriod, EventRepository
 from app.schemas.producer_messages import (
+    BaseProducerMessage,
     MessageType,
     ProducerMessageCreate,
     ProducerMessageDelete,
     ProducerMessageUpdate,
 )
 
+MESSAGE_SCHEMAS: dict[MessageType, type[BaseProducerMessage]] = {
+    MessageType.CREATED: ProducerMessageCreate,
+    MessageType.UPDATED: ProducerMessageUpdate,
+    MessageType.DELETED: ProducerMessageDelete,
+}
+
 
 class EventConsumer:
-    """Консьюмер RabbitMQ"""
+    """
+    Консьюмер RabbitMQ.
+
+    Все экземпляры сервиса читают одну именованную durable очередь и делят сообщения между собой.
+    Внутри процесса сообщения обрабатываются workers обработчиками параллельно, количество
+    неподтвержденных сообщений ограничено prefetch_count. Сообщения об одном и том же событии
+    (source_id, event_type, employee_id) попадают к одному обработчику и применяются по порядку.
+    Обработчик собирает сообщения в пачки и применяет каждую пачку в одной транзакции.
+    Неудачно обработанные сообщения повторяются с задержкой через RetryTopology.
+    Пропускная способность, задержка обработки и глубина очередей учитываются в consumer_metrics.
+    """
 
-    def __init__(self, exchange_name: str, rabbitmq_url: str = settings.RABBITMQ_URL):
+    def __init__(
+        self,
+        exchange_name: str,
+        rabbitmq_url: str = settings.RABBITMQ_URL,
+        queue_name: str = settings.CALENDAR_EVENTS_QUEUE,
+        prefetch_count: int = settings.CONSUMER_PREFETCH_COUNT,
+        workers: int = settings.CONSUMER_WORKERS,
+        batch_size: int = settings.CONSUMER_BATCH_SIZE,
+        batch_timeout_ms: int = settings.CONSUMER_BATCH_TIMEOUT_MS,
+        metrics_poll_seconds: int = settings.CONSUMER_METRICS_POLL_SECONDS,
+    ):
         self.rabbitmq_url = rabbitmq_url
         self.exchange_name = exchange_name
+        self.queue_name = queue_name
+        self.prefetch_count = prefetch_count
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout_ms / 1000
+        self.metrics_poll_seconds = metrics_poll_seconds
         self.connection = None
+        self.retry_topology = RetryTopology(queue_name)
+        self._worker_queues: list[asyncio.Queue] = []
+        # Время получения неподтвержденных сообщений по delivery_tag
+        self._received_at: dict[int, float] = {}
 
     async def _connect(self):
         """Открытие подключения"""
@@ -45,72 +88,184 @@ class EventConsumer:
     async def _close(self) -> None:
         """Закрытие подключения"""
         if not self.connection.is_closed:
-            self.connection.close()
+            await self.connection.close()
 
     async def start_consumer(self) -> None:
         """Запуск консьюмера"""
         channel = await self.connection.channel()
+        await channel.set_qos(prefetch_count=self.prefetch_count)
         exchange = await channel.declare_exchange(self.exchange_name, aio_pika.ExchangeType.FANOUT)
-        queue = await channel.declare_queue(exclusive=True, durable=True)
+        queue = await self.retry_topology.declare(channel)
         await queue.bind(exchange)
 
-        await queue.consume(self.handle_event)
-        logger.info("[Calendar Service] Waiting for task events...")
-        await asyncio.Future()
+        self._worker_queues = [asyncio.Queue() for _ in range(self.workers)]
+        workers = [asyncio.create_task(self._worker(worker_queue)) for worker_queue in self._worker_queues]
+        workers.append(asyncio.create_task(self._poll_queue_depth()))
+        try:
+            await queue.consume(self.dispatch)
+            logger.info(f"[Calendar Service] Waiting for task events, {self.workers} workers...")
+            await asyncio.Future()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-    async def handle_event(self, message: aio_pika.IncomingMessage) -> None:
-        """Обработчик событий"""
-        async with message.process():
-            data = json.loads(message.body)
-            if data["type"] == MessageType.CREATED:
-                event = ProducerMessageCreate.model_validate(data["payload"])
-                await self.create_event(**event.model_dump())
-            elif data["type"] == MessageType.DELETED:
-                event = ProducerMessageDelete.model_validate(data["payload"])
-                await self.delete_event(**event.model_dump())
-            elif data["type"] == MessageType.UPDATED:
-                event = ProducerMessageUpdate.model_validate(data["payload"])
-                await self.update_event(**event.model_dump())
+    async def dispatch(self, message: aio_pika.IncomingMessage) -> None:
+        """Передача сообщения обработчику, выбранному по ключу события"""
+        self._received_at[message.delivery_tag] = time.monotonic()
+        if message.redelivered:
+            consumer_metrics.redelivered.inc(reason="broker")
+        if (message.headers or {}).get(ATTEMPT_HEADER):
+            consumer_metrics.redelivered.inc(reason="retry")
+        self._worker_queues[self._shard(message)].put_nowait(message)
+        consumer_metrics.backlog.set(self._backlog())
+
+    def _backlog(self) -> int:
+        return sum(worker_queue.qsize() for worker_queue in self._worker_queues)
+
+    def _acked(self, message: aio_pika.IncomingMessage, message_type: str, result: str) -> None:
+        """Учет подтвержденного сообщения: задержка от получения до подтверждения"""
+        received_at = self._received_at.pop(message.delivery_tag, None)
+        latency = time.monotonic() - received_at if received_at is not None else 0.0
+        consumer_metrics.acked(message_type, latency, result)
+
+    async def _retry(self, message: aio_pika.IncomingMessage, message_type: MessageType, error: Exception) -> None:
+        dead_lettered = await self.retry_topology.retry(message, error)
+        self._acked(message, message_type.value, "dead_letter" if dead_lettered else "retried")
+
+    async def _poll_queue_depth(self) -> None:
+        """
+        Периодический опрос глубины основной очереди и dead letter через passive declare.
+        Ошибка passive declare закрывает канал, поэтому опрос идет в отдельном канале
+        """
+        queue_names = (self.queue_name, self.retry_topology.dead_letter_queue_name)
+        channel = None
+        while True:
+            try:
+                if channel is None or channel.is_closed:
+                    channel = await self.connection.channel()
+                for queue_name in queue_names:
+                    queue = await channel.declare_queue(queue_name, passive=True)
+                    consumer_metrics.queue_messages.set(queue.declaration_result.message_count, queue=queue_name)
+                    consumer_metrics.queue_consumers.set(queue.declaration_result.consumer_count, queue=queue_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось получить глубину очередей: {e}")
+            await asyncio.sleep(self.metrics_poll_seconds)
+
+    def _shard(self, message: aio_pika.IncomingMessage) -> int:
+        try:
+            payload = json.loads(message.body)["payload"]
+            key = (payload["source_id"], payload.get("event_type"), payload["employee_id"])
+        except (KeyError, TypeError, ValueError):
+            return 0
+        return hash(key) % len(self._worker_queues)
+
+    async def _worker(self, worker_queue: asyncio.Queue) -> None:
+        """Обработчик сообщений: собирает пачку до batch_size сообщений или не дольше batch_timeout"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await worker_queue.get()]
+            deadline = loop.time() + self.batch_timeout
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(worker_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            consumer_metrics.backlog.set(self._backlog())
+            try:
+                await self.handle_batch(batch)
+            except Exception as e:
+                logger.error("Ошибка при обработке пачки событий", exc_info=e)
+
+    async def handle_batch(self, messages: list[aio_pika.IncomingMessage]) -> None:
+        """
+        Применение пачки событий в одной транзакции, сообщения подтверждаются после коммита.
+        Если пачку применить не удалось из-за недоступности БД, вся пачка уходит на повторную обработку.
+        При других ошибках события применяются по одному, чтобы повторять только ошибочные.
+        Некорректные сообщения отклоняются и попадают в dead letter.
+        """
+        consumer_metrics.batch_size.observe(len(messages))
+        started_at = time.monotonic()
+        events = []
+        for message in messages:
+            event = self.parse_message(message)
+            if event is None:
+                await message.reject()
+                self._acked(message, "unknown", "rejected")
             else:
-                logger.error(f"Тип события {data['type']} не возможно определить")
+                events.append((message, event))
+        if not events:
+            return
+        try:
+            periods = await self.apply_events([event for _, event in events])
+        except (OperationalError, InterfaceError, OSError) as e:
+            for message, (message_type, _) in events:
+                await self._retry(message, message_type, e)
+            return
+        except Exception as e:
+            logger.warning(f"Не удалось применить пачку из {len(events)} событий, применяем по одному: {e}")
+            for message, event in events:
+                try:
+                    periods = await self.apply_events([event])
+                except Exception as error:
+                    await self._retry(message, event[0], error)
+                else:
+                    await change_notifier.publish(periods)
+                    await message.ack()
+                    self._acked(message, event[0].value, "applied")
+            consumer_metrics.batch_duration.observe(time.monotonic() - started_at)
+            return
+        await change_notifier.publish(periods)
+        for message, (message_type, _) in events:
+            await message.ack()
+            self._acked(message, message_type.value, "applied")
+        consumer_metrics.batch_duration.observe(time.monotonic() - started_at)
+        logger.info(f"Применено {len(events)} событий в календаре")
+
+    @staticmethod
+    def parse_message(message: aio_pika.IncomingMessage) -> tuple[MessageType, BaseProducerMessage] | None:
+        """Разбор и валидация сообщения"""
+        try:
+            data = json.loads(message.body)
+            message_type = MessageType(data["type"])
+            event = MESSAGE_SCHEMAS[message_type].model_validate(data["payload"])
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            logger.error(f"Некорректное сообщение о событии: {e}")
+            return None
+        return message_type, event
 
     @context_session
-    async def create_event(self, session: AsyncSession, **event: Any) -> None:
-        """Создание события"""
+    async def apply_events(
+        self, events: list[tuple[MessageType, BaseProducerMessage]], session: AsyncSession
+    ) -> list[EventPeriod]:
+        """
+        Применение событий в одной транзакции.
+        Подряд идущие создания и обновления применяются одним upsert, подряд идущие удаления - одним запросом,
+        порядок событий сохраняется. Повторная доставка сообщения не создает дубликатов.
+        Возвращает старые и новые периоды измененных событий для инвалидации кэша календаря.
+        """
         repo = EventRepository(session)
-        await repo.create(**event)
-        await session.commit()
-        logger.info(
-            f"Создано событие {event['source_id']} с типом {event['event_type']} в календаре для "
-            f"пользователя {event['employee_id']}"
-        )
-
-    async def delete_event(self, session: AsyncSession, **event: Any) -> None:
-        """Удаление события"""
-        repo = EventRepository(session)
-        await repo.delete_by_source(**event)
-        await session.commit()
-        logger.info(
-            f"Удалено событие {event['source_id']} с типом {event['event_type'].value} из календаре для "
-            f"пользователя {event['employee_id']}"
-        )
-
-    async def update_event(self, session: AsyncSession, **event: Any) -> None:
-        """Обновление события"""
-        repo = EventRepository(session)
-        source_id = event.pop("source_id")
-        event_type = event.pop("event_type")
-        employee_id = event.pop("employee_id")
-        await repo.update_by_source(source_id, event_type, employee_id, **event)
-        await session.commit()
-        logger.info(
-            f"Обновлено событие {event['source_id']} с типом {event['event_type'].value} из календаре для "
-            f"пользователя {event['employee_id']}"
-        )
+        periods = []
+        for is_delete, run in groupby(events, key=lambda item: item[0] == MessageType.DELETED):
+            run_events = [event for _, event in run]
+            keys = [(event.source_id, event.event_type, event.employee_id) for event in run_events]
+            if not is_delete:
+                periods.extend(await repo.get_periods_by_source(keys))
+                await repo.upsert_many([event.model_dump() for event in run_events])
+                periods.extend((event.employee_id, event.start_time, event.end_time) for event in run_events)
+            else:
+                sent_at = {key: event.sent_at for key, event in zip(keys, run_events)}
+                periods.extend(await repo.delete_many_by_source(keys, sent_at))
+        return periods
 
 
 async def main():
-    async with EventConsumer() as consumer:
+    async with EventConsumer("calendar_events") as consumer:
         await consumer.start_consumer()
 
 
@@ -0,0 +1,82 @@
+import aio_pika
+
+from app.config import settings
+from app.logging_config import logger
+
+ATTEMPT_HEADER = "x-attempt"
+ERROR_HEADER = "x-error"
+
+
+class RetryTopology:
+    """
+    Очереди повторной обработки и dead letter для очереди событий.
+
+    Сообщение, которое не удалось применить, публикуется в очередь ожидания с TTL, соответствующим
+    номеру попытки (экспоненциальная задержка). По истечении TTL брокер возвращает его в основную очередь.
+    Номер попытки хранится в заголовке x-attempt. После max_attempts попыток, а также некорректные
+    сообщения (reject) попадают в dead letter exchange и хранятся в очереди <queue_name>.dead.
+    Пока сообщение ожидает повтора, могут быть применены более новые изменения того же события:
+    вернувшееся сообщение применяется, только если оно опубликовано не раньше них (sent_at).
+    """
+
+    def __init__(
+        self,
+        queue_name: str = settings.CALENDAR_EVENTS_QUEUE,
+        retry_delays: list[int] = settings.CONSUMER_RETRY_DELAYS,
+        max_attempts: int = settings.CONSUMER_MAX_ATTEMPTS,
+    ):
+        self.queue_name = queue_name
+        self.retry_delays = retry_delays
+        self.max_attempts = max_attempts
+        self.dead_letter_exchange_name = f"{queue_name}.dlx"
+        self.dead_letter_queue_name = f"{queue_name}.dead"
+        self.channel: aio_pika.abc.AbstractChannel | None = None
+        self.dead_letter_exchange: aio_pika.abc.AbstractExchange | None = None
+
+    def retry_queue_name(self, delay: int) -> str:
+        return f"{self.queue_name}.retry.{delay}s"
+
+    async def declare(self, channel: aio_pika.abc.AbstractChannel) -> aio_pika.abc.AbstractQueue:
+        """Объявление основной очереди, очередей ожидания и dead letter, возвращает основную очередь"""
+        self.channel = channel
+        self.dead_letter_exchange = await channel.declare_exchange(
+            self.dead_letter_exchange_name, aio_pika.ExchangeType.FANOUT, durable=True
+        )
+        dead_letter_queue = await channel.declare_queue(self.dead_letter_queue_name, durable=True)
+        await dead_letter_queue.bind(self.dead_letter_exchange)
+        for delay in self.retry_delays:
+            await channel.declare_queue(
+                self.retry_queue_name(delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay * 1000,
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.queue_name,
+                },
+            )
+        return await channel.declare_queue(
+            self.queue_name, durable=True, arguments={"x-dead-letter-exchange": self.dead_letter_exchange_name}
+        )
+
+    async def retry(self, message: aio_pika.abc.AbstractIncomingMessage, error: Exception) -> bool:
+        """
+        Отправка сообщения на повторную обработку или в dead letter, исходное сообщение подтверждается.
+        Возвращает True, если сообщение отправлено в dead letter
+        """
+        attempt = int((message.headers or {}).get(ATTEMPT_HEADER, 0)) + 1
+        headers = {**(message.headers or {}), ATTEMPT_HEADER: attempt, ERROR_HEADER: str(error)[:500]}
+        retry_message = aio_pika.Message(
+            body=message.body,
+            headers=headers,
+            content_type=message.content_type,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        )
+        if attempt >= self.max_attempts:
+            await self.dead_letter_exchange.publish(retry_message, routing_key="")
+            logger.error(f"Сообщение отправлено в dead letter после {attempt} попыток: {error}")
+        else:
+            delay = self.retry_delays[min(attempt, len(self.retry_delays)) - 1]
+            await self.channel.default_exchange.publish(retry_message, routing_key=self.retry_queue_name(delay))
+            logger.warning(f"Повторная обработка сообщения через {delay} сек, попытка {attempt}: {error}")
+        await message.ack()
+        return attempt >= self.max_attempts
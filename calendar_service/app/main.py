@@ -3,15 +3,24 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.clients.http import http_clients
+from app.events.change_notifier import change_notifier
 from app.events.event_consumer import EventConsumer
 from app.logging_config import logger
+from app.maintenance import run_maintenance
 from app.routers.calendar import router as calendar_router
 from app.routers.events import router as event_router
+from app.routers.metrics import router as metrics_router
+from app.routers.series import router as series_router
+from app.routers.token_cache import router as token_cache_router
 from app.routers.webhooks import router as webhook_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    http_clients.open("user")
+    maintenance_task = asyncio.create_task(run_maintenance())
+    await change_notifier.start()
     async with EventConsumer("calendar_events") as consumer:
         task = asyncio.create_task(consumer.start_consumer())
         await asyncio.sleep(0)
@@ -21,11 +30,21 @@ async def lifespan(app: FastAPI):
             await task
         except asyncio.CancelledError:
             logger.info("Фоновая задача RabbitMQ остановлена")
+    await change_notifier.close()
+    maintenance_task.cancel()
+    try:
+        await maintenance_task
+    except asyncio.CancelledError:
+        logger.info("Фоновая задача обслуживания остановлена")
+    await http_clients.close()
 
 
 app = FastAPI(root_path="/calendar-service", lifespan=lifespan)
 
 
+app.include_router(series_router, prefix="/events/series", tags=["series"])
 app.include_router(event_router, prefix="/events", tags=["events"])
 app.include_router(calendar_router, prefix="/calendar", tags=["calendar"])
 app.include_router(webhook_router, prefix="/webhooks", tags=["webhooks"])
+app.include_router(metrics_router, tags=["metrics"])
+app.include_router(token_cache_router, tags=["token cache"])
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import context_session
+from app.logging_config import logger
+from app.repositories.event_repo import EventRepository
+from app.repositories.event_series_repo import EventSeriesRepository
+from app.repositories.partition_repo import EventPartitionRepository, add_months, partition_month, partition_name
+
+
+@context_session
+async def purge_tombstones(session: AsyncSession) -> int:
+    """
+    Удаление tombstones событий и серий старше срока хранения, курсоры синхронизации старше этого срока
+    недействительны
+    """
+    before = datetime.now(timezone.utc) - timedelta(days=settings.CALENDAR_TOMBSTONE_RETENTION_DAYS)
+    purged = await EventRepository(session).purge_tombstones(before)
+    return purged + await EventSeriesRepository(session).purge_tombstones(before)
+
+
+@context_session
+async def check_duplicate_sources(session: AsyncSession) -> int:
+    """Количество ключей источника с несколькими неудаленными событиями"""
+    return await EventRepository(session).count_duplicate_sources()
+
+
+@context_session
+async def maintain_partitions(session: AsyncSession, today: date | None = None) -> tuple[list[str], list[str]]:
+    """
+    Создание секций событий с прошлого месяца до CALENDAR_PARTITIONS_AHEAD_MONTHS вперед и,
+    если задан CALENDAR_ARCHIVE_AFTER_MONTHS, архивирование секций старых месяцев.
+    Возвращает имена созданных и архивированных секций
+    """
+    repo = EventPartitionRepository(session)
+    if not await repo.try_lock():
+        logger.info("Обслуживание секций событий выполняет другой экземпляр сервиса")
+        return [], []
+    current = (today or datetime.now(timezone.utc).date()).replace(day=1)
+    partitions = await repo.get_partitions()
+    created = []
+    for offset in range(-1, settings.CALENDAR_PARTITIONS_AHEAD_MONTHS + 1):
+        month = add_months(current, offset)
+        if partition_name(month) not in partitions:
+            await repo.create_partition(month)
+            created.append(partition_name(month))
+    archived = []
+    if settings.CALENDAR_ARCHIVE_AFTER_MONTHS > 0:
+        # Секции прошлого и текущего месяца не архивируются, иначе они будут сразу созданы заново
+        boundary = add_months(current, -max(settings.CALENDAR_ARCHIVE_AFTER_MONTHS, 1))
+        for name in sorted(partitions):
+            month = partition_month(name)
+            if month and add_months(month, 1) <= boundary:
+                await repo.archive_partition(name, settings.CALENDAR_ARCHIVE_SCHEMA)
+                archived.append(name)
+    return created, archived
+
+
+async def run_maintenance(interval: int = settings.MAINTENANCE_INTERVAL_SECONDS) -> None:
+    """Периодическое обслуживание таблицы событий, ошибки не прерывают цикл"""
+    while True:
+        try:
+            created, archived = await maintain_partitions()
+            if created or archived:
+                logger.info(f"Секции событий: создано {created}, архивировано {archived}")
+            purged = await purge_tombstones()
+            if purged:
+                logger.info(f"Удалено {purged} tombstones событий и серий")
+            duplicates = await check_duplicate_sources()
+            if duplicates:
+                logger.error(f"Найдено {duplicates} ключей источника с несколькими событиями")
+        except Exception as e:
+            logger.error(f"Ошибка обслуживания таблицы событий: {e}")
+        await asyncio.sleep(interval)
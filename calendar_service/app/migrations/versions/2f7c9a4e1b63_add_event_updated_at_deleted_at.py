@@ -0,0 +1,36 @@
+"""Add events.updated_at and events.deleted_at
+
+Revision ID: 2f7c9a4e1b63
+Revises: 8e4b1f6a2c90
+Create Date: 2026-10-18 23:11:26.804193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7c9a4e1b63'
+down_revision: Union[str, None] = '8e4b1f6a2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('events', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    # Существующие события считаем измененными в момент создания
+    op.execute('UPDATE events SET updated_at = created_at')
+    op.create_index('ix_events_employee_updated', 'events', ['employee_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_employee_updated', table_name='events')
+    # Удаленные события без поддержки tombstones должны быть удалены физически
+    op.execute('DELETE FROM events WHERE deleted_at IS NOT NULL')
+    op.drop_column('events', 'deleted_at')
+    op.drop_column('events', 'updated_at')
@@ -0,0 +1,39 @@
+"""Add unique (source_id, event_type, employee_id)
+
+Revision ID: 5d2a9c81e7f4
+Revises: f3248994135e
+Create Date: 2026-10-18 21:14:03.552617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a9c81e7f4'
+down_revision: Union[str, None] = 'f3248994135e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Удаляем дубликаты, оставляя последнюю созданную запись
+    op.execute(
+        """
+        DELETE FROM events e
+        USING events newer
+        WHERE e.source_id = newer.source_id
+          AND e.event_type = newer.event_type
+          AND e.employee_id = newer.employee_id
+          AND e.id < newer.id
+        """
+    )
+    op.create_unique_constraint('uq_event_source', 'events', ['source_id', 'event_type', 'employee_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_event_source', 'events', type_='unique')
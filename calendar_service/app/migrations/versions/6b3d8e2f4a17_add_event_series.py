@@ -0,0 +1,51 @@
+"""Add event_series for recurring events
+
+Revision ID: 6b3d8e2f4a17
+Revises: 2f7c9a4e1b63
+Create Date: 2026-10-19 00:27:52.316408
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b3d8e2f4a17'
+down_revision: Union[str, None] = '2f7c9a4e1b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_series',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=250), nullable=False),
+    sa.Column('description', sa.String(length=1000), nullable=True),
+    sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('event_type', postgresql.ENUM('MEETING', 'TASK', 'PERSONAL', name='eventtype', create_type=False), nullable=False),
+    sa.Column('rrule', sa.String(length=250), nullable=False),
+    sa.Column('timezone', sa.String(length=64), nullable=False),
+    sa.Column('exdates', postgresql.ARRAY(sa.DateTime(timezone=True)), nullable=False),
+    sa.Column('until_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('span', postgresql.TSTZRANGE(), sa.Computed('tstzrange(start_time, until_time)', persisted=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_event_series_employee_id'), 'event_series', ['employee_id'], unique=False)
+    op.create_index(op.f('ix_event_series_id'), 'event_series', ['id'], unique=False)
+    op.create_index('ix_event_series_employee_span', 'event_series', ['employee_id', 'span'], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_series_employee_span', table_name='event_series', postgresql_using='gist')
+    op.drop_index(op.f('ix_event_series_id'), table_name='event_series')
+    op.drop_index(op.f('ix_event_series_employee_id'), table_name='event_series')
+    op.drop_table('event_series')
@@ -0,0 +1,38 @@
+"""Add events.period tstzrange with GiST index
+
+Revision ID: 8e4b1f6a2c90
+Revises: 5d2a9c81e7f4
+Create Date: 2026-10-18 22:03:41.217904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b1f6a2c90'
+down_revision: Union[str, None] = '5d2a9c81e7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist нужен для integer-колонки employee_id в GiST индексе
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.add_column('events', sa.Column(
+        'period',
+        postgresql.TSTZRANGE(),
+        sa.Computed('CASE WHEN end_time > start_time THEN tstzrange(start_time, end_time) END', persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_events_employee_period', 'events', ['employee_id', 'period'], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_employee_period', table_name='events', postgresql_using='gist')
+    op.drop_column('events', 'period')
@@ -0,0 +1,142 @@
+"""Partition events by month of start_time
+
+Revision ID: a4c7e9d2b815
+Revises: 6b3d8e2f4a17
+Create Date: 2026-10-19 01:48:09.552130
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e9d2b815'
+down_revision: Union[str, None] = '6b3d8e2f4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = 'id, employee_id, title, description, start_time, end_time, event_type, source_id, created_at, updated_at, deleted_at'
+# Секции создаются с месяца самого раннего события, но не раньше этого срока, более старые события
+# попадают в секцию по умолчанию
+MAX_HISTORY_MONTHS = 120
+PARTITIONS_AHEAD_MONTHS = 3
+
+
+def add_months(month: date, months: int) -> date:
+    year, index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return date(year, index + 1, 1)
+
+
+def events_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('events_id_seq'::regclass)"), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=250), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('event_type', postgresql.ENUM('MEETING', 'TASK', 'PERSONAL', name='eventtype', create_type=False), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'period',
+            postgresql.TSTZRANGE(),
+            sa.Computed('CASE WHEN end_time > start_time THEN tstzrange(start_time, end_time) END', persisted=True),
+            nullable=True,
+        ),
+    ]
+
+
+def drop_events_indexes(table: str) -> None:
+    op.drop_index('ix_events_employee_updated', table_name=table)
+    op.drop_index('ix_events_employee_period', table_name=table, postgresql_using='gist')
+    op.drop_index('ix_events_start_time', table_name=table)
+    op.drop_index('ix_events_id', table_name=table)
+    op.drop_index('ix_events_employee_id', table_name=table)
+
+
+def create_events_indexes() -> None:
+    op.create_index('ix_events_employee_id', 'events', ['employee_id'], unique=False)
+    op.create_index('ix_events_id', 'events', ['id'], unique=False)
+    op.create_index('ix_events_start_time', 'events', ['start_time'], unique=False)
+    op.create_index('ix_events_employee_period', 'events', ['employee_id', 'period'], unique=False, postgresql_using='gist')
+    op.create_index('ix_events_employee_updated', 'events', ['employee_id', 'updated_at', 'id'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующую таблицу нельзя сделать секционированной: создаем новую и переносим события
+    op.rename_table('events', 'events_unpartitioned')
+    drop_events_indexes('events_unpartitioned')
+    op.drop_constraint('uq_event_source', 'events_unpartitioned', type_='unique')
+    op.drop_constraint('events_pkey', 'events_unpartitioned', type_='primary')
+
+    # Первичный и уникальные ключи секционированной таблицы должны включать start_time,
+    # уникальность ключа источника обеспечивает приложение
+    op.create_table('events',
+    *events_columns(),
+    sa.PrimaryKeyConstraint('id', 'start_time', name='events_pkey'),
+    postgresql_partition_by='RANGE (start_time)',
+    )
+    op.execute('ALTER SEQUENCE events_id_seq OWNED BY events.id')
+    create_events_indexes()
+    op.create_index('ix_events_source', 'events', ['source_id', 'event_type', 'employee_id'], unique=False)
+
+    op.execute('CREATE TABLE events_default PARTITION OF events DEFAULT')
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    first_start = op.get_bind().scalar(sa.text('SELECT min(start_time) FROM events_unpartitioned'))
+    month = add_months(current, -1)
+    if first_start is not None:
+        first_month = first_start.astimezone(timezone.utc).date().replace(day=1)
+        month = max(min(first_month, month), add_months(current, -MAX_HISTORY_MONTHS))
+    while month <= add_months(current, PARTITIONS_AHEAD_MONTHS):
+        next_month = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE events_y{month.year:04d}m{month.month:02d} PARTITION OF events "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{next_month.isoformat()} 00:00:00+00')"
+        )
+        month = next_month
+
+    op.execute(f'INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM events_unpartitioned')
+    op.drop_table('events_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # События архивных (отсоединенных) секций не возвращаются в таблицу
+    op.rename_table('events', 'events_partitioned')
+    drop_events_indexes('events_partitioned')
+    op.drop_index('ix_events_source', table_name='events_partitioned')
+    op.drop_constraint('events_pkey', 'events_partitioned', type_='primary')
+
+    op.create_table('events',
+    *events_columns(),
+    sa.PrimaryKeyConstraint('id', name='events_pkey'),
+    sa.UniqueConstraint('source_id', 'event_type', 'employee_id', name='uq_event_source'),
+    )
+    op.execute('ALTER SEQUENCE events_id_seq OWNED BY events.id')
+    create_events_indexes()
+
+    # Секционированная таблица не гарантирует уникальность ключа источника: удаляем дубликаты,
+    # оставляя последнюю измененную запись
+    op.execute(
+        """
+        DELETE FROM events_partitioned e
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY source_id, event_type, employee_id ORDER BY updated_at DESC, id DESC
+            ) AS position
+            FROM events_partitioned
+            WHERE source_id IS NOT NULL
+        ) duplicate
+        WHERE e.id = duplicate.id AND duplicate.position > 1
+        """
+    )
+    op.execute(f'INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM events_partitioned')
+    op.drop_table('events_partitioned')
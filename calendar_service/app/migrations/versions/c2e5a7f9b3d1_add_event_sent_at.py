@@ -0,0 +1,28 @@
+"""Add events.sent_at
+
+Revision ID: c2e5a7f9b3d1
+Revises: a4c7e9d2b815
+Create Date: 2026-10-19 09:14:37.215804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e5a7f9b3d1'
+down_revision: Union[str, None] = 'a4c7e9d2b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'sent_at')
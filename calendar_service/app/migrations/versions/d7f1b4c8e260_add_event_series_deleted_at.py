@@ -0,0 +1,32 @@
+"""Add event_series.deleted_at
+
+Revision ID: d7f1b4c8e260
+Revises: c2e5a7f9b3d1
+Create Date: 2026-10-19 09:52:18.640317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f1b4c8e260'
+down_revision: Union[str, None] = 'c2e5a7f9b3d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('event_series', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_event_series_employee_updated', 'event_series', ['employee_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_series_employee_updated', table_name='event_series')
+    # Удаленные серии без поддержки tombstones должны быть удалены физически
+    op.execute('DELETE FROM event_series WHERE deleted_at IS NOT NULL')
+    op.drop_column('event_series', 'deleted_at')
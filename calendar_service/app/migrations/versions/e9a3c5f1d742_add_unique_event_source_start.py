@@ -0,0 +1,43 @@
+"""Add unique index on event source and start_time
+
+Revision ID: e9a3c5f1d742
+Revises: d7f1b4c8e260
+Create Date: 2026-10-19 12:07:41.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a3c5f1d742'
+down_revision: Union[str, None] = 'd7f1b4c8e260'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Удаляем дубликаты с одинаковым временем начала, оставляя последнюю измененную запись.
+    # Дубликаты с разным временем начала индекс не запрещает
+    op.execute(
+        """
+        DELETE FROM events e
+        USING events newer
+        WHERE e.source_id = newer.source_id
+          AND e.event_type = newer.event_type
+          AND e.employee_id = newer.employee_id
+          AND e.start_time = newer.start_time
+          AND (e.updated_at, e.id) < (newer.updated_at, newer.id)
+        """
+    )
+    op.create_index('uq_events_source_start', 'events', ['source_id', 'event_type', 'employee_id', 'start_time'], unique=True)
+    op.drop_index('ix_events_source', table_name='events')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_events_source', 'events', ['source_id', 'event_type', 'employee_id'], unique=False)
+    op.drop_index('uq_events_source_start', table_name='events')
@@ -0,0 +1,33 @@
+"""Add calendar_feeds
+
+Revision ID: f4b8d2a6c913
+Revises: e9a3c5f1d742
+Create Date: 2026-10-19 14:26:53.902471
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2a6c913'
+down_revision: Union[str, None] = 'e9a3c5f1d742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('calendar_feeds',
+    sa.Column('employee_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('employee_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('calendar_feeds')
@@ -2,7 +2,8 @@ import enum
 from datetime import datetime, timezone
 
 from app.database import Base
-from sqlalchemy import DateTime, Enum, String
+from sqlalchemy import Computed, DateTime, Enum, Index, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, TSTZRANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -15,7 +16,10 @@ class EventType(enum.Enum):
 
 
 class Event(Base):
-    """Модель Событий"""
+    """
+    Модель Событий. Таблица секционирована по месяцам start_time (секции events_yYYYYmMM и events_default),
+    поэтому start_time входит в первичный ключ
+    """
 
     __tablename__ = "events"
 
@@ -23,8 +27,92 @@ class Event(Base):
     employee_id: Mapped[int] = mapped_column(index=True)
     title: Mapped[str] = mapped_column(String(250))
     description: Mapped[str | None] = mapped_column(String(1000))
-    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True)
     end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     event_type: Mapped[EventType] = mapped_column(Enum(EventType))
     source_id: Mapped[int | None]
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # Время последнего изменения (включая удаление) для синхронизации клиентов по курсору
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    # Удаленное событие остается в таблице (tombstone), чтобы клиенты получили удаление при синхронизации
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Время публикации источником последнего примененного изменения: более старые изменения,
+    # пришедшие позже (после повторной обработки), не применяются
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Период события [start_time, end_time), для событий без длительности не задан
+    period: Mapped[Range[datetime] | None] = mapped_column(
+        TSTZRANGE, Computed("CASE WHEN end_time > start_time THEN tstzrange(start_time, end_time) END", persisted=True)
+    )
+
+    __table_args__ = (
+        # Событие из другого сервиса определяется источником, повторная доставка обновляет его, а не дублирует.
+        # Уникальный индекс секционированной таблицы должен включать start_time, поэтому он не запрещает
+        # дубликаты ключа источника с разным временем начала (в том числе в разных секциях). Их исключает
+        # EventRepository.upsert_many advisory-блокировками, а обслуживание проверяет count_duplicate_sources
+        Index("uq_events_source_start", "source_id", "event_type", "employee_id", "start_time", unique=True),
+        # Поиск пересечений периодов событий сотрудника (требует расширения btree_gist)
+        Index("ix_events_employee_period", "employee_id", "period", postgresql_using="gist"),
+        # Изменения событий сотрудника по курсору (updated_at, id)
+        Index("ix_events_employee_updated", "employee_id", "updated_at", "id"),
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
+
+
+class EventSeries(Base):
+    """
+    Модель серии повторяющихся событий. Серия хранится одной строкой, вхождения вычисляются
+    по правилу повторения только для запрошенного периода
+    """
+
+    __tablename__ = "event_series"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
+    employee_id: Mapped[int] = mapped_column(index=True)
+    title: Mapped[str] = mapped_column(String(250))
+    description: Mapped[str | None] = mapped_column(String(1000))
+    # Первое вхождение серии
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    event_type: Mapped[EventType] = mapped_column(Enum(EventType))
+    # Правило повторения (подмножество RRULE) и часовой пояс, по местному времени которого повторяются вхождения
+    rrule: Mapped[str] = mapped_column(String(250))
+    timezone: Mapped[str] = mapped_column(String(64), default="UTC")
+    # Начала исключенных вхождений
+    exdates: Mapped[list[datetime]] = mapped_column(ARRAY(DateTime(timezone=True)), default=list)
+    # Конец последнего вхождения, для бесконечной серии не задан
+    until_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # Время последнего изменения (включая удаление) для синхронизации клиентов по курсору
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    # Удаленная серия остается в таблице (tombstone), чтобы клиенты получили удаление при синхронизации
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Период всей серии [start_time, until_time), для бесконечной серии не ограничен сверху
+    span: Mapped[Range[datetime]] = mapped_column(
+        TSTZRANGE, Computed("tstzrange(start_time, until_time)", persisted=True)
+    )
+
+    __table_args__ = (
+        # Поиск серий сотрудника, пересекающихся с запрошенным периодом
+        Index("ix_event_series_employee_span", "employee_id", "span", postgresql_using="gist"),
+        # Изменения серий сотрудника по курсору (updated_at, id)
+        Index("ix_event_series_employee_updated", "employee_id", "updated_at", "id"),
+    )
+
+
+class CalendarFeed(Base):
+    """
+    Подписка сотрудника на календарь (.ics). Версия входит в подписанный токен подписки,
+    увеличение версии отзывает ранее выданный токен
+    """
+
+    __tablename__ = "calendar_feeds"
+
+    employee_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(default=1)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
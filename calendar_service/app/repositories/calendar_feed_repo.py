@@ -0,0 +1,39 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.events import CalendarFeed
+from app.repositories.base_repository import BaseRepository
+
+
+class CalendarFeedRepository(BaseRepository):
+    """Репозиторий подписок сотрудников на календарь"""
+
+    model: type[CalendarFeed] = CalendarFeed
+
+    async def get_version(self, employee_id: int) -> int | None:
+        """Текущая версия подписки сотрудника"""
+        stmt = select(self.model.version).where(self.model.employee_id == employee_id)
+        return await self.session.scalar(stmt)
+
+    async def get_or_create_version(self, employee_id: int) -> int:
+        """Текущая версия подписки, при первом запросе подписка создается"""
+        stmt = (
+            insert(self.model)
+            .values(employee_id=employee_id, version=1)
+            .on_conflict_do_update(index_elements=[self.model.employee_id], set_={"version": self.model.version})
+            .returning(self.model.version)
+        )
+        return await self.session.scalar(stmt)
+
+    async def rotate_version(self, employee_id: int) -> int:
+        """Увеличение версии подписки: ранее выданный токен перестает действовать"""
+        stmt = (
+            insert(self.model)
+            .values(employee_id=employee_id, version=1)
+            .on_conflict_do_update(
+                index_elements=[self.model.employee_id],
+                set_={"version": self.model.version + 1, "updated_at": func.now()},
+            )
+            .returning(self.model.version)
+        )
+        return await self.session.scalar(stmt)
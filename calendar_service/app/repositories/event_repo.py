@@ -1,40 +1,123 @@
+import hashlib
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from sqlalchemy import delete, exists, select, update
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Integer,
+    and_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.logging_config import logger
-from app.models.events import Event
+from app.models.events import Event, EventType
 from app.repositories.base_repository import BaseRepository
 
+# Период события сотрудника: (employee_id, start_time, end_time)
+EventPeriod = tuple[int, datetime, datetime | None]
+# Ключ источника события: (source_id, event_type, employee_id)
+SourceKey = tuple[int, EventType, int]
+# Поля события из другого сервиса в порядке столбцов временной таблицы events_staging
+STAGING_COLUMNS = ("source_id", "event_type", "employee_id", "title", "start_time", "end_time")
+
+
+def source_lock_id(source_id: int, event_type: EventType | str, employee_id: int) -> int:
+    """Идентификатор advisory-блокировки ключа источника события (знаковое 64-битное число)"""
+    key = f"{source_id}:{EventType(event_type).name}:{employee_id}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big", signed=True)
+
+
+def is_newer(sent_at: datetime | None, current: datetime | None) -> bool:
+    """Изменение, опубликованное в sent_at, не старше примененного в current. Без времени публикации применяется"""
+    return sent_at is None or current is None or sent_at >= current
+
+
+def same_source(alias: str) -> str:
+    """Условие совпадения ключа источника события с ключом строки alias (event_type - имя EventType)"""
+    return (
+        f"events.source_id = {alias}.source_id AND events.event_type = CAST({alias}.event_type AS eventtype) "
+        f"AND events.employee_id = {alias}.employee_id"
+    )
+
 
 class EventRepository(BaseRepository):
     """Репозиторий управления событиями"""
 
     model: type[Event] = Event
 
+    def _overlaps(self, start_time: datetime, end_time: datetime):
+        """
+        Условие пересечения периода неудаленного события с [start_time, end_time),
+        использует индекс ix_events_employee_period. Условие на start_time исключает из плана
+        секции после конца периода (partition pruning)
+        """
+        return and_(
+            self.model.deleted_at.is_(None),
+            self.model.start_time < literal(end_time, DateTime(timezone=True)),
+            self.model.period.op("&&")(
+                func.tstzrange(literal(start_time, DateTime(timezone=True)), literal(end_time, DateTime(timezone=True)))
+            ),
+        )
+
+    async def get(self, reference: int) -> Event | None:
+        """Получение неудаленного события"""
+        stmt = select(self.model).where(self.model.id == reference, self.model.deleted_at.is_(None))
+        return (await self.session.scalars(stmt)).first()
+
+    async def delete(self, reference: int) -> bool:
+        """Удаление события: событие помечается удаленным и остается в таблице до очистки tombstones"""
+        logger.info(f"Удаление события с идентификатором {reference}")
+        stmt = (
+            update(self.model)
+            .where(self.model.id == reference, self.model.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
     async def get_by_period(self, employee_id: int, start_time: datetime, end_time: datetime) -> list[Event]:
-        """Получение событий за определенный период"""
-        stmt = select(self.model).where(
-            self.model.employee_id == employee_id,
-            self.model.start_time < end_time,
-            self.model.end_time > start_time,
+        """Получение событий за определенный период в порядке начала"""
+        if end_time <= start_time:
+            return []
+        stmt = (
+            select(self.model)
+            .where(self.model.employee_id == employee_id, self._overlaps(start_time, end_time))
+            .order_by(self.model.start_time)
         )
         return (await self.session.scalars(stmt)).all()
 
-    async def delete_by_source(self, source_id: int, event_type: str, employee_id: int) -> None:
-        """Удаление события по source_id, event_type, employee_id"""
+    async def delete_by_source(self, source_id: int, event_type: str, employee_id: int) -> list[EventPeriod]:
+        """Удаление события по source_id, event_type, employee_id, возвращает периоды удаленных событий"""
         logger.info(
             f"Удаление события с идентификатором источника={source_id}, "
             f"типом события={event_type}, идентификатором сотрудника={employee_id}"
         )
-        stmt = delete(self.model).where(
-            self.model.source_id == source_id,
-            self.model.event_type == event_type,
-            self.model.employee_id == employee_id,
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.source_id == source_id,
+                self.model.event_type == event_type,
+                self.model.employee_id == employee_id,
+                self.model.deleted_at.is_(None),
+            )
+            .values(deleted_at=func.now())
+            .returning(self.model.employee_id, self.model.start_time, self.model.end_time)
         )
-        result = await self.session.execute(stmt)
+        periods = (await self.session.execute(stmt)).tuples().all()
         await self.session.commit()
-        logger.info(f"Успешно удаленно {result.rowcount} записи из {self.model.__name__}")
+        logger.info(f"Успешно удаленно {len(periods)} записи из {self.model.__name__}")
+        return periods
 
     async def update_by_source(self, source_id: int, event_type: str, employee_id: int, **update_data) -> None:
         """Обновление события по source_id, event_type, employee_id"""
@@ -55,13 +138,275 @@ class EventRepository(BaseRepository):
         await self.session.commit()
         logger.info(f"Успешно удаленно {result.rowcount} записи из {self.model.__name__}")
 
+    async def upsert(self, **data) -> None:
+        """Создание события или обновление существующего с тем же source_id, event_type, employee_id"""
+        await self.upsert_many([data])
+
+    async def lock_sources(self, keys: list[tuple[int, str, int]]) -> None:
+        """
+        Транзакционные advisory-блокировки ключей (source_id, event_type, employee_id).
+        Блокировки берутся в порядке идентификаторов, чтобы параллельные транзакции не взаимоблокировались
+        """
+        lock_ids = sorted({source_lock_id(*key) for key in keys})
+        lock_keys = func.unnest(literal(lock_ids, ARRAY(BigInteger))).table_valued("lock_id").render_derived()
+        await self.session.execute(select(func.pg_advisory_xact_lock(lock_keys.c.lock_id)))
+
+    async def upsert_many(self, events: list[dict]) -> None:
+        """
+        Создание или обновление событий с теми же source_id, event_type, employee_id.
+        Все события должны содержать одинаковый набор полей, при повторах одного события применяется
+        последнее опубликованное (sent_at). Изменение старше уже примененного к событию (в том числе удаления)
+        пропускается. Удаленное событие с тем же ключом восстанавливается.
+
+        Уникальное ограничение секционированной таблицы обязано включать start_time, поэтому ON CONFLICT
+        по ключу источника невозможен: ключи блокируются до конца транзакции, существующие события
+        обновляются одним executemany, новые создаются одним INSERT
+        """
+        if not events:
+            return
+        unique: dict[SourceKey, dict] = {}
+        for event in events:
+            key = (event["source_id"], EventType(event["event_type"]), event["employee_id"])
+            if key not in unique or is_newer(event.get("sent_at"), unique[key].get("sent_at")):
+                unique[key] = event
+        await self.lock_sources(list(unique))
+        rows = await self.session.execute(
+            select(self.model.source_id, self.model.event_type, self.model.employee_id, self.model.sent_at).where(
+                tuple_(self.model.source_id, self.model.event_type, self.model.employee_id).in_(list(unique))
+            )
+        )
+        existing = {tuple(key): sent_at for *key, sent_at in rows}
+        stale = [key for key, sent_at in existing.items() if not is_newer(unique[key].get("sent_at"), sent_at)]
+        for key in stale:
+            del unique[key], existing[key]
+        if stale:
+            logger.info(f"Пропущено {len(stale)} устаревших изменений событий")
+        key_fields = ("source_id", "event_type", "employee_id")
+        fields = [name for name in events[0] if name not in key_fields]
+        if existing:
+            table = self.model.__table__
+            values = {name: bindparam(f"new_{name}", type_=table.c[name].type) for name in fields}
+            if "sent_at" in values:
+                # Изменение без времени публикации не сбрасывает время последнего примененного изменения
+                values["sent_at"] = func.coalesce(values["sent_at"], table.c.sent_at)
+            stmt = (
+                update(table)
+                .where(*(table.c[name] == bindparam(f"key_{name}", type_=table.c[name].type) for name in key_fields))
+                .values(values | {"updated_at": func.now(), "deleted_at": None})
+            )
+            await self.session.execute(
+                stmt,
+                [
+                    {f"key_{name}": value for name, value in zip(key_fields, key)}
+                    | {f"new_{name}": unique[key][name] for name in fields}
+                    for key in existing
+                ],
+            )
+        created = [event for key, event in unique.items() if key not in existing]
+        if created:
+            await self.session.execute(insert(self.model).values(created))
+
+    async def copy_upsert(self, events: list[dict]) -> tuple[set[SourceKey], list[EventPeriod]]:
+        """
+        Создание или обновление большого количества событий из других сервисов (поля STAGING_COLUMNS).
+        Ключи (source_id, event_type, employee_id) должны быть уникальны.
+
+        События загружаются через COPY во временную таблицу, затем одним UPDATE ... FROM обновляются
+        существующие и одним INSERT ... SELECT создаются новые. Возвращает ключи обновленных событий
+        и прежние периоды обновленных событий
+        """
+        keys = [(event["source_id"], EventType(event["event_type"]), event["employee_id"]) for event in events]
+        await self.lock_sources(keys)
+        await self.session.execute(
+            text(
+                "CREATE TEMPORARY TABLE events_staging (source_id integer, event_type text, employee_id integer, "
+                "title varchar(250), start_time timestamptz, end_time timestamptz)"
+            )
+        )
+        connection = await (await self.session.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(
+            "events_staging",
+            records=[
+                tuple(EventType(event[name]).name if name == "event_type" else event[name] for name in STAGING_COLUMNS)
+                for event in events
+            ],
+            columns=STAGING_COLUMNS,
+        )
+        old_periods = (
+            await self.session.execute(
+                text(
+                    f"SELECT events.employee_id, events.start_time, events.end_time FROM events "
+                    f"JOIN events_staging s ON {same_source('s')} WHERE events.deleted_at IS NULL"
+                )
+            )
+        ).tuples().all()
+        updated = (
+            await self.session.execute(
+                text(
+                    f"UPDATE events SET title = s.title, start_time = s.start_time, end_time = s.end_time, "
+                    f"updated_at = now(), deleted_at = NULL FROM events_staging s WHERE {same_source('s')} "
+                    f"RETURNING s.source_id, s.event_type, s.employee_id"
+                )
+            )
+        ).tuples().all()
+        await self.session.execute(
+            text(
+                f"INSERT INTO events (source_id, event_type, employee_id, title, start_time, end_time, created_at) "
+                f"SELECT s.source_id, CAST(s.event_type AS eventtype), s.employee_id, s.title, s.start_time, "
+                f"s.end_time, now() FROM events_staging s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM events WHERE {same_source('s')})"
+            )
+        )
+        await self.session.execute(text("DROP TABLE events_staging"))
+        return {(source_id, EventType[name], employee_id) for source_id, name, employee_id in updated}, old_periods
+
+    async def get_periods_by_source(self, keys: list[tuple[int, str, int]]) -> list[EventPeriod]:
+        """Периоды (employee_id, start_time, end_time) событий по списку (source_id, event_type, employee_id)"""
+        if not keys:
+            return []
+        stmt = select(self.model.employee_id, self.model.start_time, self.model.end_time).where(
+            tuple_(self.model.source_id, self.model.event_type, self.model.employee_id).in_(keys),
+            self.model.deleted_at.is_(None),
+        )
+        return (await self.session.execute(stmt)).tuples().all()
+
+    async def delete_many_by_source(
+        self, keys: list[tuple[int, str, int]], sent_at: dict[SourceKey, datetime | None] | None = None
+    ) -> list[EventPeriod]:
+        """
+        Удаление событий по списку (source_id, event_type, employee_id) одним запросом,
+        возвращает периоды удаленных событий.
+
+        sent_at - время публикации удаления по ключу: событие, измененное позже, не удаляется.
+        Если события с ключом еще нет (создание ожидает повторной обработки), создается tombstone
+        с этим временем, и пришедшее позже создание не будет применено
+        """
+        if not keys:
+            return []
+        unique = list(dict.fromkeys((key[0], EventType(key[1]), key[2]) for key in keys))
+        sent_at = sent_at or {}
+        await self.lock_sources(unique)
+        params = {
+            "source_ids": [key[0] for key in unique],
+            "event_types": [key[1].name for key in unique],
+            "employee_ids": [key[2] for key in unique],
+            "sent_ats": [sent_at.get(key) for key in unique],
+        }
+        deleted_keys = (
+            "unnest(CAST(:source_ids AS integer[]), CAST(:event_types AS text[]), CAST(:employee_ids AS integer[]), "
+            "CAST(:sent_ats AS timestamptz[])) AS d(source_id, event_type, employee_id, sent_at)"
+        )
+        periods = (
+            await self.session.execute(
+                text(
+                    f"UPDATE events SET deleted_at = now(), updated_at = now(), "
+                    f"sent_at = GREATEST(events.sent_at, d.sent_at) FROM {deleted_keys} "
+                    f"WHERE {same_source('d')} AND events.deleted_at IS NULL "
+                    f"AND (events.sent_at IS NULL OR d.sent_at IS NULL OR events.sent_at <= d.sent_at) "
+                    f"RETURNING events.employee_id, events.start_time, events.end_time"
+                ),
+                params,
+            )
+        ).tuples().all()
+        await self.session.execute(
+            text(
+                f"INSERT INTO events (source_id, event_type, employee_id, title, start_time, created_at, deleted_at, "
+                f"sent_at) SELECT d.source_id, CAST(d.event_type AS eventtype), d.employee_id, '', d.sent_at, now(), "
+                f"now(), d.sent_at FROM {deleted_keys} "
+                f"WHERE d.sent_at IS NOT NULL AND NOT EXISTS (SELECT 1 FROM events WHERE {same_source('d')})"
+            ),
+            params,
+        )
+        return periods
+
+    async def get_busy_periods(
+        self, employee_ids: list[int], start_time: datetime, end_time: datetime
+    ) -> list[tuple[int, datetime, datetime]]:
+        """
+        Периоды событий нескольких сотрудников, пересекающиеся с [start_time, end_time), одним запросом.
+        Результат отсортирован по employee_id и началу события.
+        """
+        # Соединение с unnest, а не IN: GiST индекс (employee_id, period) не поддерживает поиск по массиву,
+        # а так для каждого сотрудника выполняется отдельный поиск по индексу
+        employees = func.unnest(literal(employee_ids, ARRAY(Integer))).table_valued("employee_id").render_derived()
+        stmt = (
+            select(self.model.employee_id, self.model.start_time, self.model.end_time)
+            .join(employees, employees.c.employee_id == self.model.employee_id)
+            .where(self._overlaps(start_time, end_time))
+            .order_by(self.model.employee_id, self.model.start_time)
+        )
+        return (await self.session.execute(stmt)).tuples().all()
+
     async def has_events_in_period(self, employee_id: int, start_time: datetime, end_time: datetime) -> bool:
         """Запрос выполняет проверку на существования события за определенный период"""
-        stmt = select(
-            exists().where(
-                self.model.employee_id == employee_id,
-                self.model.start_time < end_time,
-                self.model.end_time > start_time,
+        if end_time <= start_time:
+            return False
+        stmt = select(exists().where(self.model.employee_id == employee_id, self._overlaps(start_time, end_time)))
+        return bool(await self.session.scalar(stmt))
+
+    async def get_changes(
+        self, employee_id: int, after: tuple[datetime, int] | None, before: datetime, limit: int
+    ) -> list[Event]:
+        """
+        События сотрудника, измененные после курсора after=(updated_at, id) и раньше before, включая удаленные.
+        Без курсора возвращаются только неудаленные события.
+        """
+        stmt = select(self.model).where(self.model.employee_id == employee_id, self.model.updated_at < before)
+        if after is None:
+            stmt = stmt.where(self.model.deleted_at.is_(None))
+        else:
+            updated_at, event_id = after
+            stmt = stmt.where(
+                tuple_(self.model.updated_at, self.model.id)
+                > tuple_(literal(updated_at, DateTime(timezone=True)), literal(event_id))
             )
+        stmt = stmt.order_by(self.model.updated_at, self.model.id).limit(limit)
+        return (await self.session.scalars(stmt)).all()
+
+    async def stream_by_employee(self, employee_id: int, batch_size: int) -> AsyncIterator[Event]:
+        """
+        Неудаленные события сотрудника в порядке начала. Строки читаются серверным курсором
+        порциями по batch_size, в памяти одновременно находится не больше одной порции
+        """
+        stmt = (
+            select(self.model)
+            .where(self.model.employee_id == employee_id, self.model.deleted_at.is_(None))
+            .order_by(self.model.start_time, self.model.id)
+            .execution_options(yield_per=batch_size)
         )
-        return bool(await self.session.scalar(stmt))
+        async for event in await self.session.stream_scalars(stmt):
+            yield event
+
+    async def get_version(self, employee_id: int) -> tuple[int, datetime | None]:
+        """
+        Версия событий сотрудника: количество неудаленных событий и время последнего изменения (включая удаление).
+        Использует индекс ix_events_employee_updated
+        """
+        stmt = select(
+            func.count().filter(self.model.deleted_at.is_(None)), func.max(self.model.updated_at)
+        ).where(self.model.employee_id == employee_id)
+        return tuple((await self.session.execute(stmt)).one())
+
+    async def get_database_time(self) -> datetime:
+        """Текущее время по часам БД (начало транзакции)"""
+        return await self.session.scalar(select(func.now()))
+
+    async def count_duplicate_sources(self) -> int:
+        """
+        Количество ключей источника, которым соответствует больше одного неудаленного события.
+        Уникальный индекс uq_events_source_start не запрещает дубликаты с разным временем начала
+        """
+        duplicates = (
+            select(self.model.source_id)
+            .where(self.model.source_id.is_not(None), self.model.deleted_at.is_(None))
+            .group_by(self.model.source_id, self.model.event_type, self.model.employee_id)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        return await self.session.scalar(select(func.count()).select_from(duplicates))
+
+    async def purge_tombstones(self, before: datetime) -> int:
+        """Физическое удаление событий, удаленных раньше before"""
+        stmt = delete(self.model).where(self.model.deleted_at < before)
+        result = await self.session.execute(stmt)
+        return result.rowcount
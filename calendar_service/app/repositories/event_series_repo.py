@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, delete, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.logging_config import logger
+from app.models.events import EventSeries
+from app.repositories.base_repository import BaseRepository
+
+
+class EventSeriesRepository(BaseRepository):
+    """Репозиторий управления сериями повторяющихся событий"""
+
+    model: type[EventSeries] = EventSeries
+
+    async def get(self, reference: int) -> EventSeries | None:
+        """Получение неудаленной серии"""
+        stmt = select(self.model).where(self.model.id == reference, self.model.deleted_at.is_(None))
+        return (await self.session.scalars(stmt)).first()
+
+    async def delete(self, reference: int) -> bool:
+        """Удаление серии: серия помечается удаленной и остается в таблице до очистки tombstones"""
+        logger.info(f"Удаление серии событий с идентификатором {reference}")
+        stmt = (
+            update(self.model)
+            .where(self.model.id == reference, self.model.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def get_overlapping(
+        self, employee_ids: list[int], start_time: datetime, end_time: datetime
+    ) -> list[EventSeries]:
+        """
+        Неудаленные серии сотрудников, период которых пересекается с [start_time, end_time), использует индекс
+        ix_event_series_employee_span. Пересечение периода серии не означает, что в окне есть вхождения,
+        вхождения вычисляются по правилу повторения
+        """
+        if end_time <= start_time:
+            return []
+        # Соединение с unnest, а не IN: GiST индекс (employee_id, span) не поддерживает поиск по массиву
+        employees = func.unnest(literal(employee_ids, ARRAY(Integer))).table_valued("employee_id").render_derived()
+        stmt = (
+            select(self.model)
+            .join(employees, employees.c.employee_id == self.model.employee_id)
+            .where(
+                self.model.deleted_at.is_(None),
+                self.model.span.op("&&")(
+                    func.tstzrange(
+                        literal(start_time, DateTime(timezone=True)), literal(end_time, DateTime(timezone=True))
+                    )
+                ),
+            )
+            .order_by(self.model.employee_id, self.model.id)
+        )
+        return (await self.session.scalars(stmt)).all()
+
+    async def get_by_employee(self, employee_id: int) -> list[EventSeries]:
+        """Неудаленные серии сотрудника"""
+        stmt = (
+            select(self.model)
+            .where(self.model.employee_id == employee_id, self.model.deleted_at.is_(None))
+            .order_by(self.model.id)
+        )
+        return (await self.session.scalars(stmt)).all()
+
+    async def get_changes(
+        self, employee_id: int, after: tuple[datetime, int] | None, before: datetime, limit: int
+    ) -> list[EventSeries]:
+        """
+        Серии сотрудника, измененные после курсора after=(updated_at, id) и раньше before, включая удаленные.
+        Без курсора возвращаются только неудаленные серии.
+        """
+        stmt = select(self.model).where(self.model.employee_id == employee_id, self.model.updated_at < before)
+        if after is None:
+            stmt = stmt.where(self.model.deleted_at.is_(None))
+        else:
+            updated_at, series_id = after
+            stmt = stmt.where(
+                tuple_(self.model.updated_at, self.model.id)
+                > tuple_(literal(updated_at, DateTime(timezone=True)), literal(series_id))
+            )
+        stmt = stmt.order_by(self.model.updated_at, self.model.id).limit(limit)
+        return (await self.session.scalars(stmt)).all()
+
+    async def get_version(self, employee_id: int) -> tuple[int, datetime | None]:
+        """Версия серий сотрудника: количество неудаленных серий и время последнего изменения (включая удаление)"""
+        stmt = select(
+            func.count().filter(self.model.deleted_at.is_(None)), func.max(self.model.updated_at)
+        ).where(self.model.employee_id == employee_id)
+        return tuple((await self.session.execute(stmt)).one())
+
+    async def purge_tombstones(self, before: datetime) -> int:
+        """Физическое удаление серий, удаленных раньше before"""
+        stmt = delete(self.model).where(self.model.deleted_at < before)
+        result = await self.session.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,110 @@
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import logger
+from app.models.events import Event
+
+PARTITIONED_TABLE = Event.__tablename__
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{PARTITIONED_TABLE}_y(\d{{4}})m(\d{{2}})$")
+# Идентификатор advisory-блокировки обслуживания секций: обслуживание выполняет один экземпляр сервиса
+PARTITION_MAINTENANCE_LOCK_ID = 0x63616C5F70617274
+# Не ждать блокировок таблицы дольше, чтобы DDL не останавливал запросы календаря
+PARTITION_LOCK_TIMEOUT = "5s"
+
+quote = postgresql.dialect().identifier_preparer.quote
+
+
+def add_months(month: date, months: int) -> date:
+    """Первое число месяца, отстоящего от month на months месяцев"""
+    year, index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return date(year, index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITIONED_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Месяц секции по ее имени, None для секции по умолчанию и посторонних таблиц"""
+    match = PARTITION_NAME_RE.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+class EventPartitionRepository:
+    """
+    Репозиторий управления месячными секциями таблицы событий.
+
+    События вне созданных секций попадают в секцию по умолчанию. При создании секции события ее месяца
+    переносятся из секции по умолчанию, иначе PostgreSQL не позволит создать секцию.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def try_lock(self) -> bool:
+        """Блокировка обслуживания секций до конца транзакции, False - обслуживание выполняет другой экземпляр"""
+        await self.session.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+        stmt = text("SELECT pg_try_advisory_xact_lock(:lock_id)")
+        return bool(await self.session.scalar(stmt, {"lock_id": PARTITION_MAINTENANCE_LOCK_ID}))
+
+    async def get_partitions(self) -> list[str]:
+        """Имена секций таблицы событий"""
+        stmt = text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+        )
+        return list(await self.session.scalars(stmt, {"table": PARTITIONED_TABLE}))
+
+    async def create_partition(self, month: date) -> None:
+        """Создание секции месяца month с переносом его событий из секции по умолчанию"""
+        name = partition_name(month)
+        bounds = {"start": month.isoformat(), "end": add_months(month, 1).isoformat()}
+        in_month = "start_time >= CAST(:start AS timestamptz) AND start_time < CAST(:end AS timestamptz)"
+        has_rows = await self.session.scalar(
+            text(f"SELECT EXISTS (SELECT 1 FROM {quote(DEFAULT_PARTITION)} WHERE {in_month})"), bounds
+        )
+        if has_rows:
+            # Генерируемые столбцы вычисляются заново при вставке
+            columns = ", ".join(quote(column.name) for column in Event.__table__.columns if column.computed is None)
+            await self.session.execute(
+                text(
+                    f"CREATE TEMPORARY TABLE events_moved AS "
+                    f"SELECT {columns} FROM {quote(DEFAULT_PARTITION)} WITH NO DATA"
+                )
+            )
+            await self.session.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} WHERE {in_month} RETURNING {columns}) "
+                    f"INSERT INTO events_moved SELECT * FROM moved"
+                ),
+                bounds,
+            )
+        await self.session.execute(
+            text(
+                f"CREATE TABLE {quote(name)} PARTITION OF {quote(PARTITIONED_TABLE)} "
+                f"FOR VALUES FROM ('{bounds['start']} 00:00:00+00') TO ('{bounds['end']} 00:00:00+00')"
+            )
+        )
+        if has_rows:
+            result = await self.session.execute(
+                text(f"INSERT INTO {quote(PARTITIONED_TABLE)} ({columns}) SELECT {columns} FROM events_moved")
+            )
+            await self.session.execute(text("DROP TABLE events_moved"))
+            logger.info(f"В секцию {name} перенесено {result.rowcount} событий из секции по умолчанию")
+        logger.info(f"Создана секция событий {name}")
+
+    async def archive_partition(self, name: str, schema: str) -> None:
+        """
+        Отсоединение секции от таблицы событий и перенос в схему архива.
+        События архивной секции больше не видны сервису, но остаются доступны в БД
+        """
+        await self.session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {quote(schema)}"))
+        await self.session.execute(text(f"ALTER TABLE {quote(PARTITIONED_TABLE)} DETACH PARTITION {quote(name)}"))
+        await self.session.execute(text(f"ALTER TABLE {quote(name)} SET SCHEMA {quote(schema)}"))
+        logger.info(f"Секция событий {name} перенесена в архив {schema}")
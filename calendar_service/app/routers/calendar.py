@@ -1,10 +1,25 @@
 from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.responses import StreamingResponse
 
-from app.routers.dependencies import CalendarServiceDeps, CurrentUser
-from app.schemas.calendar import CalendarDayResponse, CalendarMonthResponse, YearMonthParams
+from app.events.change_hub import change_hub
+from app.routers.dependencies import (
+    CalendarExportServiceDeps,
+    CalendarFeedServiceDeps,
+    CalendarServiceDeps,
+    CurrentUser,
+)
+from app.schemas.calendar import (
+    CalendarChangesParams,
+    CalendarChangesResponse,
+    CalendarDayResponse,
+    CalendarFeedResponse,
+    CalendarMonthResponse,
+    YearMonthParams,
+)
+from app.services.calendar_export_service import CalendarExportService, etag_matches
 
 router = APIRouter()
 
@@ -12,13 +27,85 @@ router = APIRouter()
 @router.get("/month", response_model=list[CalendarMonthResponse])
 async def get_monthly_calendar(
     params: Annotated[YearMonthParams, Depends()], user: CurrentUser, calendar_service: CalendarServiceDeps
-) -> list[CalendarMonthResponse]:
-    calendar = await calendar_service.get_monthly_events(params, user)
-    return calendar
+) -> Response:
+    # Ответ уже сериализован (и, возможно, взят из кэша), повторная валидация не нужна
+    payload = await calendar_service.get_monthly_events_json(params, user)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/day", response_model=CalendarDayResponse)
 async def get_daily_calendar(
     date: date, user: CurrentUser, calendar_service: CalendarServiceDeps
-) -> CalendarDayResponse:
-    return await calendar_service.get_daily_events(date, user)
+) -> Response:
+    payload = await calendar_service.get_daily_events_json(date, user)
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/changes", response_model=CalendarChangesResponse, summary="Изменения календаря после курсора")
+async def get_calendar_changes(
+    params: Annotated[CalendarChangesParams, Depends()], user: CurrentUser, calendar_service: CalendarServiceDeps
+) -> CalendarChangesResponse:
+    return await calendar_service.get_changes(params, user)
+
+
+@router.get("/stream", summary="Уведомления об изменениях календаря (Server-Sent Events)")
+async def stream_calendar_changes(user: CurrentUser) -> StreamingResponse:
+    """
+    Событие changed содержит измененные периоды, по ним клиент перезапрашивает день, месяц или /calendar/changes.
+    Событие resync означает, что клиент не успевал получать уведомления: поток закрывается,
+    пропущенные изменения нужно получить через /calendar/changes.
+    """
+    change_hub.check_limit(user.id)
+    return StreamingResponse(
+        change_hub.stream(user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def ics_response(
+    employee_id: int, export_service: CalendarExportService, if_none_match: str | None, headers: dict | None = None
+) -> Response:
+    """Потоковая выгрузка .ics или 304, если у клиента актуальная версия"""
+    etag = await export_service.get_etag(employee_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"} | (headers or {})
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return StreamingResponse(
+        export_service.stream_calendar(employee_id), media_type="text/calendar; charset=utf-8", headers=headers
+    )
+
+
+@router.get("/export.ics", summary="Выгрузка календаря в формате iCalendar")
+async def export_calendar(
+    user: CurrentUser,
+    export_service: CalendarExportServiceDeps,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    return await ics_response(
+        user.id, export_service, if_none_match, {"Content-Disposition": 'attachment; filename="calendar.ics"'}
+    )
+
+
+@router.get("/feed", response_model=CalendarFeedResponse, summary="Ссылка подписки на календарь")
+async def get_calendar_feed(user: CurrentUser, feed_service: CalendarFeedServiceDeps) -> CalendarFeedResponse:
+    return await feed_service.get_feed(user)
+
+
+@router.delete("/feed", status_code=status.HTTP_204_NO_CONTENT, summary="Отзыв ссылки подписки на календарь")
+async def revoke_calendar_feed(user: CurrentUser, feed_service: CalendarFeedServiceDeps) -> None:
+    await feed_service.revoke_feed(user)
+
+
+@router.get("/feed/{token}.ics", summary="Подписка на календарь для внешних приложений (iCalendar)")
+async def calendar_feed(
+    token: str,
+    export_service: CalendarExportServiceDeps,
+    feed_service: CalendarFeedServiceDeps,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Доступ по подписанному токену из /calendar/feed, приложения календаря не передают заголовок Authorization.
+    Токен перестает действовать после отзыва подписки или деактивации пользователя
+    """
+    return await ics_response(await feed_service.verify_token(token), export_service, if_none_match)
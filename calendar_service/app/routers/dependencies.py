@@ -4,12 +4,14 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.clients.user_client import UserServiceClient
 from app.config import settings
 from app.database import get_session
-from app.schemas.users import EmployeeRole, User
-from app.security import verify_api_key
+from app.schemas.users import EmployeeRole, Status, User
+from app.security import TokenVerifier, token_verifier, verify_api_key
+from app.services.calendar_export_service import CalendarExportService
+from app.services.calendar_feed_service import CalendarFeedService
 from app.services.calendar_service import CalendarService
+from app.services.event_series_service import EventSeriesService
 from app.services.event_service import EventService
 from app.services.event_webhook_service import EventWebhookService
 
@@ -24,6 +26,14 @@ async def event_service(session: Annotated[AsyncSession, Depends(get_session)])
 EventServiceDeps = Annotated[EventService, Depends(event_service)]
 
 
+async def event_series_service(session: Annotated[AsyncSession, Depends(get_session)]) -> EventSeriesService:
+    """Функция для внедрения в зависимости сервис EventSeriesService"""
+    return EventSeriesService(session)
+
+
+EventSeriesServiceDeps = Annotated[EventSeriesService, Depends(event_series_service)]
+
+
 async def event_webhook_service(session: Annotated[AsyncSession, Depends(get_session)]) -> EventWebhookService:
     """Функция для внедрения в зависимости сервис EventWebhookService"""
     return EventWebhookService(session)
@@ -40,12 +50,31 @@ async def calendar_service(session: Annotated[AsyncSession, Depends(get_session)
 CalendarServiceDeps = Annotated[CalendarService, Depends(calendar_service)]
 
 
-UserClientDeps = Annotated[UserServiceClient, Depends(lambda: UserServiceClient())]
+async def calendar_export_service(session: Annotated[AsyncSession, Depends(get_session)]) -> CalendarExportService:
+    """Функция для внедрения в зависимости сервис CalendarExportService"""
+    return CalendarExportService(session)
+
+
+CalendarExportServiceDeps = Annotated[CalendarExportService, Depends(calendar_export_service)]
+
+
+async def calendar_feed_service(session: Annotated[AsyncSession, Depends(get_session)]) -> CalendarFeedService:
+    """Функция для внедрения в зависимости сервис CalendarFeedService"""
+    return CalendarFeedService(session)
+
+
+CalendarFeedServiceDeps = Annotated[CalendarFeedService, Depends(calendar_feed_service)]
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_client: UserClientDeps) -> User:
-    """Проверяет токен через User Service, возвращает данные (id, status, team_role)."""
-    user_data = await user_client.verify_token(token)
+TokenVerifierDeps = Annotated[TokenVerifier, Depends(lambda: token_verifier)]
+
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], verifier: TokenVerifierDeps) -> User:
+    """
+    Проверяет токен по публичным ключам User Service (в строгом режиме - и через User Service),
+    возвращает данные (id, status, team_role).
+    """
+    user_data = await verifier.verify(token)
     if not user_data["is_active"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
     return User.model_validate(user_data)
@@ -54,6 +83,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_c
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def require_system_admin(user: CurrentUser) -> None:
+    """Пользователь с доступом администратора системы"""
+    if user.status != Status.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не достаточно прав")
+
+
+SystemAdminDeps = Depends(require_system_admin)
+
+
 async def require_manager_or_admin(user: Annotated[User, Depends(get_current_user)]) -> User:
     """
     Разрешает действия только админам руководителям команды (role="менеджер", "админ")"""
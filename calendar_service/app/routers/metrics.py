@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from app.events.consumer_metrics import consumer_metrics
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Метрики консьюмера событий в текстовом формате Prometheus"""
+    return Response(content=consumer_metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
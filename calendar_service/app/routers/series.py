@@ -0,0 +1,35 @@
+from fastapi import APIRouter, status
+
+from app.routers.dependencies import CurrentUser, EventSeriesServiceDeps
+from app.schemas.events import EventSeriesCreate, EventSeriesOut, EventSeriesUpdate
+
+router = APIRouter()
+
+
+@router.post("/", response_model=EventSeriesOut, summary="Создание серии повторяющихся событий")
+async def create_series(
+    series_data: EventSeriesCreate, user: CurrentUser, series_service: EventSeriesServiceDeps
+) -> EventSeriesOut:
+    series = await series_service.create_series(series_data, user)
+    return series
+
+
+@router.get("/{series_id}", response_model=EventSeriesOut, summary="Получение серии повторяющихся событий")
+async def get_series(series_id: int, user: CurrentUser, series_service: EventSeriesServiceDeps) -> EventSeriesOut:
+    series = await series_service.get_series(series_id, user)
+    return series
+
+
+@router.patch("/{series_id}", response_model=EventSeriesOut, summary="Редактирование серии повторяющихся событий")
+async def update_series(
+    series_id: int, series_data: EventSeriesUpdate, user: CurrentUser, series_service: EventSeriesServiceDeps
+) -> EventSeriesOut:
+    series = await series_service.update_series(series_id, series_data, user)
+    return series
+
+
+@router.delete(
+    "/{series_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Удаление серии повторяющихся событий"
+)
+async def delete_series(series_id: int, user: CurrentUser, series_service: EventSeriesServiceDeps) -> None:
+    await series_service.delete_series(series_id, user)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.clients.user_client import token_cache
+from app.routers.dependencies import SystemAdminDeps
+
+router = APIRouter()
+
+
+@router.get("/token-cache/stats", dependencies=[SystemAdminDeps], summary="Статистика кэша проверки токенов")
+async def get_token_cache_stats() -> dict:
+    return token_cache.stats()
@@ -1,13 +1,24 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.routers.dependencies import EventWebhookServiceDeps, VerifyApiKey
-from app.schemas.event_webhooks import EventDeleteParams, EventParams, NewEventHook
+from app.schemas.event_webhooks import (
+    BulkEventsResponse,
+    EventDeleteParams,
+    EventParams,
+    FreeBusyRequest,
+    FreeBusyResponse,
+    FreeSlotsRequest,
+    FreeSlotsResponse,
+    NewEventHook,
+)
 
 router = APIRouter(dependencies=[VerifyApiKey])
 
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 
 @router.post("/new-event", summary="Вебхук для создание события")
 async def handle_new_event_webhook(event_data: NewEventHook, event_service: EventWebhookServiceDeps):
@@ -23,9 +34,52 @@ async def handle_verify_event_webhook(
     return JSONResponse(content={"exists": True}, status_code=status.HTTP_200_OK)
 
 
+@router.post(
+    "/free-busy",
+    summary="Вебхук возвращает занятость нескольких сотрудников в заданный период",
+    response_model=FreeBusyResponse,
+)
+async def handle_free_busy_webhook(request: FreeBusyRequest, event_service: EventWebhookServiceDeps):
+    return await event_service.get_free_busy(request)
+
+
+@router.post(
+    "/free-slots",
+    summary="Вебхук ищет ближайшие слоты, в которые свободны все сотрудники",
+    response_model=FreeSlotsResponse,
+)
+async def handle_free_slots_webhook(request: FreeSlotsRequest, event_service: EventWebhookServiceDeps):
+    return await event_service.find_free_slots(request)
+
+
 @router.delete("/remove-event", summary="Вебхук для удаления события")
 async def handle_delete_event_webhook(
     event_data: Annotated[EventDeleteParams, Query()], event_service: EventWebhookServiceDeps
 ):
     await event_service.delete_event(event_data)
     return JSONResponse(content={"status": "success"}, status_code=status.HTTP_200_OK)
+
+
+@router.post(
+    "/new-events/bulk",
+    response_model=BulkEventsResponse,
+    summary="Вебхук для пакетного создания событий",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": NewEventHook.model_json_schema()}},
+                "application/x-ndjson": {"schema": NewEventHook.model_json_schema()},
+            },
+        }
+    },
+)
+async def handle_bulk_events_webhook(request: Request, event_service: EventWebhookServiceDeps) -> StreamingResponse:
+    """
+    Тело запроса - JSON-массив событий NewEventHook или NDJSON (событие на строку), читается потоково.
+    Повторная загрузка того же события обновляет его. Результат возвращается по каждому событию
+    по его номеру в пакете (для NDJSON - номеру непустой строки)
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    report = await event_service.bulk_create_events(request.stream(), ndjson=media_type in NDJSON_MEDIA_TYPES)
+    return StreamingResponse(report.iter_json(), media_type="application/json")
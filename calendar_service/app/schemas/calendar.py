@@ -2,7 +2,8 @@ from datetime import date
 
 from pydantic import BaseModel, Field
 
-from app.schemas.events import EventOut
+from app.config import settings
+from app.schemas.events import EventOut, EventSeriesOut
 
 
 class YearMonthParams(BaseModel):
@@ -21,9 +22,39 @@ class CalendarMonthResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class CalendarChangesParams(BaseModel):
+    """Параметры запроса изменений календаря, без курсора возвращаются все события"""
+
+    cursor: str | None = None
+    limit: int = Field(default=settings.CALENDAR_CHANGES_PAGE_SIZE, ge=1, le=settings.CALENDAR_CHANGES_PAGE_SIZE)
+
+
+class CalendarChangesResponse(BaseModel):
+    """
+    Изменения календаря после курсора: созданные и измененные события, идентификаторы удаленных событий
+    и курсор для следующего запроса. has_more - есть ли еще изменения, не поместившиеся в ответ.
+    Повторяющиеся события передаются сериями (series_updated, series_deleted): вхождения клиент вычисляет
+    по правилу повторения, изменение серии заменяет все ее вхождения.
+    """
+
+    updated: list[EventOut]
+    deleted: list[int]
+    series_updated: list[EventSeriesOut] = []
+    series_deleted: list[int] = []
+    cursor: str
+    has_more: bool
+
+
 class CalendarDayResponse(BaseModel):
     """Отображение событий за месяц"""
 
     events: list[EventOut]
 
     model_config = {"from_attributes": True}
+
+
+class CalendarFeedResponse(BaseModel):
+    """Токен и путь подписки на календарь для внешних приложений"""
+
+    token: str
+    path: str
@@ -1,9 +1,13 @@
-from datetime import datetime
+import enum
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.models.events import EventType
 
+MAX_FREE_SLOTS_WINDOW_DAYS = 366
+
 
 class NewEventHook(BaseModel):
     """Создание событий через сервисы"""
@@ -16,6 +20,37 @@ class NewEventHook(BaseModel):
     event_type: EventType
 
 
+class BulkEventStatus(str, enum.Enum):
+    """Результат обработки события из пакета"""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    # В пакете есть более позднее событие с тем же ключом источника, применено оно
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+
+class BulkEventResult(BaseModel):
+    """Результат обработки события по его номеру в пакете"""
+
+    index: int
+    status: BulkEventStatus
+    error: str | None = None
+
+
+class BulkEventsResponse(BaseModel):
+    """Итоги пакетной загрузки событий и результат по каждому событию"""
+
+    total: int
+    created: int
+    updated: int
+    duplicate: int
+    invalid: int
+    failed: int
+    results: list[BulkEventResult]
+
+
 class EventParams(BaseModel):
     """Параметры для запросов на существование событий за определенный период"""
 
@@ -23,6 +58,12 @@ class EventParams(BaseModel):
     start_time: datetime
     end_time: datetime
 
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def set_timezone(cls, value: datetime) -> datetime:
+        """Время без часового пояса считается временем UTC"""
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 
 class EventDeleteParams(BaseModel):
     """Параметры для удаление событий через сервисы"""
@@ -30,3 +71,91 @@ class EventDeleteParams(BaseModel):
     source_id: int
     employee_id: int
     event_type: EventType
+
+
+class FreeBusyRequest(BaseModel):
+    """Запрос занятости сотрудников в окне [start_time, end_time)"""
+
+    employee_ids: list[int] = Field(min_length=1, max_length=1000)
+    start_time: datetime
+    end_time: datetime
+
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def set_timezone(cls, value: datetime) -> datetime:
+        """Время без часового пояса считается временем UTC"""
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    @model_validator(mode="after")
+    def check_period(self) -> "FreeBusyRequest":
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time должен быть больше start_time")
+        return self
+
+
+class TimeInterval(BaseModel):
+    """Интервал времени [start_time, end_time)"""
+
+    start_time: datetime
+    end_time: datetime
+
+
+class EmployeeFreeBusy(BaseModel):
+    """Объединенные интервалы занятости сотрудника"""
+
+    employee_id: int
+    busy: list[TimeInterval]
+
+
+class FreeBusyResponse(BaseModel):
+    """Занятость сотрудников в окне [start_time, end_time)"""
+
+    start_time: datetime
+    end_time: datetime
+    employees: list[EmployeeFreeBusy]
+
+
+class WorkingHours(BaseModel):
+    """Рабочие часы по местному времени, weekdays - рабочие дни недели (0 - понедельник)"""
+
+    start: time
+    end: time
+    timezone: str = "UTC"
+    weekdays: list[int] = Field(default=[0, 1, 2, 3, 4], min_length=1, max_length=7)
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: str) -> str:
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Неизвестный часовой пояс {value}") from e
+        return value
+
+    @field_validator("weekdays")
+    @classmethod
+    def check_weekdays(cls, value: list[int]) -> list[int]:
+        if any(day < 0 or day > 6 for day in value):
+            raise ValueError("Дни недели задаются числами от 0 до 6")
+        return value
+
+
+class FreeSlotsRequest(FreeBusyRequest):
+    """Поиск первых count слотов длительностью duration_minutes, в которые свободны все сотрудники"""
+
+    duration_minutes: int = Field(ge=5, le=24 * 60)
+    step_minutes: int = Field(default=15, ge=1, le=24 * 60)
+    count: int = Field(default=5, ge=1, le=100)
+    working_hours: WorkingHours | None = None
+
+    @model_validator(mode="after")
+    def check_window(self) -> "FreeSlotsRequest":
+        if self.end_time - self.start_time > timedelta(days=MAX_FREE_SLOTS_WINDOW_DAYS):
+            raise ValueError(f"Период поиска не должен превышать {MAX_FREE_SLOTS_WINDOW_DAYS} дней")
+        return self
+
+
+class FreeSlotsResponse(BaseModel):
+    """Найденные слоты в порядке возрастания времени начала"""
+
+    slots: list[TimeInterval]
@@ -1,9 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.models.events import EventType
+from app.utils.recurrence import RecurrenceRule
 
 
 class EventCreate(BaseModel):
@@ -47,5 +49,90 @@ class EventOut(BaseModel):
     event_type: EventType
     source_id: Optional[int]
     created_at: datetime
+    # Для вхождения повторяющегося события - идентификатор серии (id вхождения совпадает с ним)
+    series_id: Optional[int] = None
+
+    model_config = {"from_attributes": True}
+
+
+class EventSeriesBase(BaseModel):
+    """Общие поля серии повторяющихся событий"""
+
+    @field_validator("rrule", check_fields=False)
+    @classmethod
+    def check_rrule(cls, value: str | None) -> str | None:
+        if value is not None:
+            RecurrenceRule.parse(value)
+        return value
+
+    @field_validator("timezone", check_fields=False)
+    @classmethod
+    def check_timezone(cls, value: str | None) -> str | None:
+        if value is not None:
+            try:
+                ZoneInfo(value)
+            except (ZoneInfoNotFoundError, ValueError) as e:
+                raise ValueError(f"Неизвестный часовой пояс: {value}") from e
+        return value
+
+    @field_validator("start_time", "end_time", "exdates", check_fields=False)
+    @classmethod
+    def set_timezone(cls, value):
+        """Время без часового пояса считается временем UTC"""
+        if isinstance(value, list):
+            return [item if item.tzinfo else item.replace(tzinfo=timezone.utc) for item in value]
+        return value if value is None or value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class EventSeriesCreate(EventSeriesBase):
+    """
+    Создание серии повторяющихся событий: start_time и end_time - первое вхождение,
+    rrule - правило повторения (например, FREQ=WEEKLY;BYDAY=MO,WE), exdates - начала исключенных вхождений
+    """
+
+    title: str = Field(max_length=250)
+    description: str | None = Field(default=None, max_length=1000)
+    start_time: datetime
+    end_time: datetime
+    event_type: EventType = EventType.PERSONAL
+    rrule: str = Field(max_length=250)
+    timezone: str = "UTC"
+    exdates: list[datetime] = Field(default_factory=list, max_length=1000)
+
+    @model_validator(mode="after")
+    def check_period(self) -> "EventSeriesCreate":
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time должен быть больше start_time")
+        return self
+
+
+class EventSeriesUpdate(EventSeriesBase):
+    """Обновление серии повторяющихся событий, изменяет все вхождения серии"""
+
+    title: str | None = Field(default=None, max_length=250)
+    description: str | None = Field(default=None, max_length=1000)
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+    event_type: EventType | None = None
+    rrule: str | None = Field(default=None, max_length=250)
+    timezone: str | None = None
+    exdates: list[datetime] | None = Field(default=None, max_length=1000)
+
+
+class EventSeriesOut(BaseModel):
+    """Модель ответа серии повторяющихся событий"""
+
+    id: int
+    employee_id: int
+    title: str
+    description: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    event_type: EventType
+    rrule: str
+    timezone: str
+    exdates: list[datetime]
+    until_time: Optional[datetime]
+    created_at: datetime
 
     model_config = {"from_attributes": True}
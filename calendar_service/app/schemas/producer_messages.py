@@ -16,6 +16,8 @@ class BaseProducerMessage(BaseModel):
     source_id: int
     employee_id: int
     event_type: EventType = EventType.PERSONAL
+    # Время публикации сообщения источником, задает порядок изменений одного события
+    sent_at: datetime | None = None
 
 
 class ProducerMessageCreate(BaseProducerMessage):
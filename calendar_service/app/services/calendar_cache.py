@@ -0,0 +1,100 @@
+from calendar import monthrange
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+
+from app.clients.view_cache import CacheBackend, LocalCacheBackend
+from app.config import settings
+from app.logging_config import logger
+from app.repositories.event_repo import EventPeriod
+
+
+def months_of_period(start_time: datetime, end_time: datetime | None) -> list[tuple[int, int]]:
+    """Месяцы (по UTC), которые затрагивает период [start_time, end_time)"""
+    start = start_time.astimezone(timezone.utc) if start_time.tzinfo else start_time
+    end = end_time.astimezone(timezone.utc) if end_time and end_time.tzinfo else end_time
+    last = end - timedelta(microseconds=1) if end and end > start else start
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (last.year, last.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def coalesce_periods(periods: Iterable[EventPeriod]) -> list[EventPeriod]:
+    """
+    Замена периодов событий периодами затронутых месяцев (по одному на сотрудника и месяц).
+    Инвалидируются те же записи кэша, а оповещение о тысячах событий остается небольшим
+    """
+    months = {
+        (employee_id, year, month)
+        for employee_id, start_time, end_time in periods
+        for year, month in months_of_period(start_time, end_time)
+    }
+    coalesced = []
+    for employee_id, year, month in sorted(months):
+        start = datetime(year, month, 1, tzinfo=timezone.utc)
+        coalesced.append((employee_id, start, start + timedelta(days=monthrange(year, month)[1])))
+    return coalesced
+
+
+class CalendarViewCache:
+    """
+    Кэш сериализованных представлений календаря сотрудника за месяц и за день.
+
+    Записи относятся к месяцу (employee_id, year, month). При изменении события удаляются записи
+    всех месяцев, которые затрагивали его старый и новый период.
+    Кэш хранится в памяти процесса, другие экземпляры сервиса инвалидируют свои копии по оповещениям
+    CalendarChangeNotifier. Если брокер недоступен, их записи живут до истечения CALENDAR_CACHE_TTL.
+    Счетчик инвалидаций invalidations запоминается до чтения данных из БД: если к моменту сохранения
+    была инвалидация, прочитанные данные могли устареть и не сохраняются.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.invalidations = 0
+
+    @staticmethod
+    def month_key(employee_id: int, year: int, month: int) -> str:
+        return f"calendar:month:{employee_id}:{year}:{month}"
+
+    @staticmethod
+    def day_key(employee_id: int, day: date) -> str:
+        return f"calendar:day:{employee_id}:{day.year}:{day.month}:{day.day}"
+
+    async def get_month(self, employee_id: int, year: int, month: int) -> bytes | None:
+        return await self.backend.get(self.month_key(employee_id, year, month))
+
+    async def set_month(self, employee_id: int, year: int, month: int, payload: bytes, invalidations: int) -> None:
+        if invalidations == self.invalidations:
+            await self.backend.set(self.month_key(employee_id, year, month), payload)
+
+    async def get_day(self, employee_id: int, day: date) -> bytes | None:
+        return await self.backend.get(self.day_key(employee_id, day))
+
+    async def set_day(self, employee_id: int, day: date, payload: bytes, invalidations: int) -> None:
+        if invalidations == self.invalidations:
+            await self.backend.set(self.day_key(employee_id, day), payload)
+
+    async def invalidate(self, periods: Iterable[EventPeriod]) -> None:
+        """Удаление записей месяцев, затронутых периодами событий. Вызывается после коммита изменений"""
+        self.invalidations += 1
+        months = {
+            (employee_id, year, month)
+            for employee_id, start_time, end_time in periods
+            for year, month in months_of_period(start_time, end_time)
+        }
+        keys = []
+        for employee_id, year, month in months:
+            keys.append(self.month_key(employee_id, year, month))
+            days = range(1, monthrange(year, month)[1] + 1)
+            keys.extend(self.day_key(employee_id, date(year, month, day)) for day in days)
+        try:
+            await self.backend.delete_many(keys)
+        except Exception as e:
+            logger.error(f"Не удалось инвалидировать кэш календаря для {len(months)} месяцев: {e}")
+
+
+calendar_cache = CalendarViewCache(
+    LocalCacheBackend(maxsize=settings.CALENDAR_CACHE_MAXSIZE, ttl=settings.CALENDAR_CACHE_TTL)
+)
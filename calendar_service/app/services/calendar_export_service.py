@@ -0,0 +1,108 @@
+import hashlib
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.events import Event, EventSeries
+from app.repositories.event_repo import EventRepository
+from app.repositories.event_series_repo import EventSeriesRepository
+from app.utils.ical import (
+    calendar_footer,
+    calendar_header,
+    component,
+    datetime_property,
+    escape_text,
+    format_datetime,
+)
+from app.utils.recurrence import RecurrenceRule
+
+# Меняется при изменении формата выгрузки, чтобы клиенты не получили 304 на старую выгрузку
+ICS_FORMAT_VERSION = 1
+UID_DOMAIN = "calendar-service"
+
+
+def event_component(event: Event) -> str:
+    """VEVENT события"""
+    lines = [
+        f"UID:event-{event.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{format_datetime(event.updated_at)}",
+        datetime_property("DTSTART", event.start_time),
+    ]
+    if event.end_time and event.end_time > event.start_time:
+        lines.append(datetime_property("DTEND", event.end_time))
+    lines.append(f"SUMMARY:{escape_text(event.title)}")
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+    lines.append(f"CATEGORIES:{event.event_type.value.upper()}")
+    return component("VEVENT", lines)
+
+
+def series_component(series: EventSeries) -> str:
+    """
+    VEVENT серии с RRULE и EXDATE: вхождения вычисляет календарь клиента.
+    Время серии задается по местному времени ее часового пояса, чтобы повторения не сдвигались при переходе
+    на летнее время (TZID - идентификатор IANA, без VTIMEZONE)
+    """
+    lines = [
+        f"UID:series-{series.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{format_datetime(series.updated_at)}",
+        datetime_property("DTSTART", series.start_time, series.timezone),
+        datetime_property("DTEND", series.end_time, series.timezone),
+        f"RRULE:{RecurrenceRule.parse(series.rrule).format()}",
+    ]
+    lines.extend(datetime_property("EXDATE", exdate, series.timezone) for exdate in sorted(series.exdates))
+    lines.append(f"SUMMARY:{escape_text(series.title)}")
+    if series.description:
+        lines.append(f"DESCRIPTION:{escape_text(series.description)}")
+    lines.append(f"CATEGORIES:{series.event_type.value.upper()}")
+    return component("VEVENT", lines)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверка заголовка If-None-Match (слабое сравнение, RFC 9110)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+class CalendarExportService:
+    """Сервис выгрузки календаря в формате iCalendar"""
+
+    def __init__(self, session: AsyncSession):
+        self.repo = EventRepository(session)
+        self.series_repo = EventSeriesRepository(session)
+
+    async def get_etag(self, employee_id: int) -> str:
+        """
+        ETag выгрузки по версии событий и серий сотрудника, вычисляется агрегатом по индексу без чтения событий.
+        Изменение, удаление и создание события меняют количество или время последнего изменения
+        """
+        events_version = await self.repo.get_version(employee_id)
+        series_version = await self.series_repo.get_version(employee_id)
+        version = f"{ICS_FORMAT_VERSION}:{employee_id}:{events_version}:{series_version}"
+        return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+    @staticmethod
+    async def stream_calendar(
+        employee_id: int, name: str = "Календарь", batch_size: int = settings.CALENDAR_FEED_BATCH_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Выгрузка календаря частями по мере чтения событий серверным курсором.
+        Выполняется в собственной сессии: ответ отправляется после закрытия сессии запроса
+        """
+        async with SessionLocal() as session:
+            yield calendar_header(name).encode()
+            series = await EventSeriesRepository(session).get_by_employee(employee_id)
+            if series:
+                yield "".join(series_component(item) for item in series).encode()
+            chunk = []
+            async for event in EventRepository(session).stream_by_employee(employee_id, batch_size):
+                chunk.append(event_component(event))
+                if len(chunk) >= batch_size:
+                    yield "".join(chunk).encode()
+                    chunk.clear()
+            chunk.append(calendar_footer())
+            yield "".join(chunk).encode()
@@ -0,0 +1,44 @@
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.user_client import UserServiceClient
+from app.logging_config import logger
+from app.repositories.calendar_feed_repo import CalendarFeedRepository
+from app.schemas.calendar import CalendarFeedResponse
+from app.schemas.users import User
+from app.security import check_feed_enabled, create_feed_token, verify_feed_token
+
+
+class CalendarFeedService:
+    """Сервис подписок на календарь для внешних приложений (.ics)"""
+
+    def __init__(self, session: AsyncSession):
+        self.repo = CalendarFeedRepository(session)
+        self.user_client = UserServiceClient()
+
+    async def get_feed(self, user: User) -> CalendarFeedResponse:
+        """Токен и путь подписки на календарь пользователя"""
+        check_feed_enabled()
+        version = await self.repo.get_or_create_version(user.id)
+        await self.repo.session.commit()
+        token = create_feed_token(user.id, version)
+        return CalendarFeedResponse(token=token, path=f"/calendar/feed/{token}.ics")
+
+    async def revoke_feed(self, user: User) -> None:
+        """Отзыв выданной ссылки подписки, новая ссылка выдается через /calendar/feed"""
+        version = await self.repo.rotate_version(user.id)
+        await self.repo.session.commit()
+        logger.info(f"Подписка на календарь пользователя {user.id} отозвана, версия подписки {version}")
+
+    async def verify_token(self, token: str) -> int:
+        """
+        Проверка токена подписки: подписи, текущей версии подписки и активности пользователя.
+        Возвращает id пользователя
+        """
+        employee_id, version = verify_feed_token(token)
+        if version != await self.repo.get_version(employee_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Календарь не найден")
+        user = await self.user_client.get_user(employee_id)
+        if not user.get("is_active"):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Календарь не найден")
+        return employee_id
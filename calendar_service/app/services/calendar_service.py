@@ -1,11 +1,60 @@
-from datetime import date, datetime, timedelta
+import base64
+import binascii
+import heapq
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timedelta, timezone
+from operator import attrgetter
 
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.events import Event
+from app.config import settings
 from app.repositories.event_repo import EventRepository
-from app.schemas.calendar import CalendarDayResponse, CalendarMonthResponse, EventOut, YearMonthParams
+from app.repositories.event_series_repo import EventSeriesRepository
+from app.schemas.calendar import (
+    CalendarChangesParams,
+    CalendarChangesResponse,
+    CalendarDayResponse,
+    CalendarMonthResponse,
+    EventOut,
+    EventSeriesOut,
+    YearMonthParams,
+)
 from app.schemas.users import User
+from app.services.calendar_cache import calendar_cache
+from app.services.event_series_service import series_events
+
+CalendarMonthAdapter = TypeAdapter(list[CalendarMonthResponse])
+# Позиция синхронизации: (updated_at, id) последнего отданного изменения
+Position = tuple[datetime, int]
+
+
+def encode_cursor(events: Position, series: Position) -> str:
+    """Курсор синхронизации: позиции последних отданных изменений событий и серий"""
+    data = {"u": events[0].isoformat(), "i": events[1], "su": series[0].isoformat(), "si": series[1]}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Position, Position | None]:
+    """Позиции событий и серий. В курсоре, выданном до синхронизации серий, позиции серий нет"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        series = (datetime.fromisoformat(data["su"]), int(data["si"])) if "su" in data else None
+        return (datetime.fromisoformat(data["u"]), int(data["i"])), series
+    except (binascii.Error, KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор") from e
+
+
+def next_position(changes: list, has_more: bool, after: Position | None, before: datetime) -> Position:
+    """
+    Позиция после отданных изменений. Если изменений больше нет, позиция сдвигается на границу before,
+    чтобы курсор неактивного календаря не устаревал
+    """
+    if has_more:
+        return changes[-1].updated_at, changes[-1].id
+    return max(after, (before, 0)) if after else (before, 0)
 
 
 class CalendarService:
@@ -13,31 +62,93 @@ class CalendarService:
 
     def __init__(self, session: AsyncSession):
         self.repo = EventRepository(session)
+        self.series_repo = EventSeriesRepository(session)
 
-    def grouping_events_by_day(self, events: list[Event]) -> dict[str, list[EventOut]]:
+    def grouping_events_by_day(self, events: Iterable[EventOut]) -> dict[str, list[EventOut]]:
         """Группировка событий по дням"""
         calendar = {}
         for event in events:
             date = event.start_time.date().isoformat()
-            calendar.setdefault(date, []).append(EventOut.model_validate(event))
+            calendar.setdefault(date, []).append(event)
         return calendar
 
     def get_month_bounds(self, year: int, month: int) -> tuple[datetime, datetime]:
-        """Получение дат начала и конца месяца"""
-        start_date = datetime(year, month, 1)
+        """Получение дат начала и конца месяца (UTC)"""
+        start_date = datetime(year, month, 1, tzinfo=timezone.utc)
         end_date = (start_date + timedelta(days=31)).replace(day=1)
         return start_date, end_date
 
+    async def get_events(self, employee_id: int, start_time: datetime, end_time: datetime) -> Iterator[EventOut]:
+        """
+        События и вхождения повторяющихся событий за период в порядке начала.
+        Вхождения серий вычисляются лениво при переборе результата и только для запрошенного периода
+        """
+        events = await self.repo.get_by_period(employee_id, start_time, end_time)
+        series = await self.series_repo.get_overlapping([employee_id], start_time, end_time)
+        return heapq.merge(
+            (EventOut.model_validate(event) for event in events),
+            *(series_events(item, start_time, end_time) for item in series),
+            key=attrgetter("start_time"),
+        )
+
     async def get_monthly_events(self, params: YearMonthParams, user: User) -> list[CalendarMonthResponse]:
         """Получение события за определенный месяц"""
         start_date, end_date = self.get_month_bounds(params.year, params.month)
-        events = await self.repo.get_by_period(user.id, start_date, end_date)
-        calendar = self.grouping_events_by_day(events)
+        calendar = self.grouping_events_by_day(await self.get_events(user.id, start_date, end_date))
         return [CalendarMonthResponse(date=date, events=events) for date, events in sorted(calendar.items())]
 
-    async def get_daily_events(self, date: date, user: User) -> list[Event]:
+    async def get_daily_events(self, date: date, user: User) -> CalendarDayResponse:
         """Получение события за определенный день"""
-        start_date = date
+        start_date = datetime.combine(date, time.min, tzinfo=timezone.utc)
         end_date = start_date + timedelta(days=1)
-        events = await self.repo.get_by_period(user.id, start_date, end_date)
-        return CalendarDayResponse(events=[EventOut.model_validate(e) for e in events])
+        return CalendarDayResponse(events=list(await self.get_events(user.id, start_date, end_date)))
+
+    async def get_monthly_events_json(self, params: YearMonthParams, user: User) -> bytes:
+        """Сериализованные события за месяц, из кэша календаря или из БД"""
+        payload = await calendar_cache.get_month(user.id, params.year, params.month)
+        if payload is None:
+            invalidations = calendar_cache.invalidations
+            payload = CalendarMonthAdapter.dump_json(await self.get_monthly_events(params, user))
+            await calendar_cache.set_month(user.id, params.year, params.month, payload, invalidations)
+        return payload
+
+    async def get_daily_events_json(self, date: date, user: User) -> bytes:
+        """Сериализованные события за день, из кэша календаря или из БД"""
+        payload = await calendar_cache.get_day(user.id, date)
+        if payload is None:
+            invalidations = calendar_cache.invalidations
+            payload = (await self.get_daily_events(date, user)).model_dump_json().encode()
+            await calendar_cache.set_day(user.id, date, payload, invalidations)
+        return payload
+
+    async def get_changes(self, params: CalendarChangesParams, user: User) -> CalendarChangesResponse:
+        """
+        Изменения событий и серий повторяющихся событий календаря пользователя после курсора.
+        События и серии читаются по своим позициям курсора, в ответе не больше limit тех и других.
+
+        Отдаются только изменения старше CALENDAR_SYNC_LAG_SECONDS по часам БД: updated_at выставляется
+        в начале транзакции, и транзакция, закоммиченная позже, не должна оказаться позади выданного курсора.
+        """
+        now = await self.repo.get_database_time()
+        before = now - timedelta(seconds=settings.CALENDAR_SYNC_LAG_SECONDS)
+        after, series_after = decode_cursor(params.cursor) if params.cursor else (None, None)
+        expired = now - timedelta(days=settings.CALENDAR_TOMBSTONE_RETENTION_DAYS)
+        if after and (after[0] < expired or (series_after and series_after[0] < expired)):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE, detail="Курсор устарел, необходима полная синхронизация"
+            )
+        events = await self.repo.get_changes(user.id, after, before, params.limit + 1)
+        series = await self.series_repo.get_changes(user.id, series_after, before, params.limit + 1)
+        events_more, series_more = len(events) > params.limit, len(series) > params.limit
+        events, series = events[: params.limit], series[: params.limit]
+        cursor = encode_cursor(
+            next_position(events, events_more, after, before), next_position(series, series_more, series_after, before)
+        )
+        return CalendarChangesResponse(
+            updated=[EventOut.model_validate(event) for event in events if event.deleted_at is None],
+            deleted=[event.id for event in events if event.deleted_at is not None],
+            series_updated=[EventSeriesOut.model_validate(item) for item in series if item.deleted_at is None],
+            series_deleted=[item.id for item in series if item.deleted_at is not None],
+            cursor=cursor,
+            has_more=events_more or series_more,
+        )
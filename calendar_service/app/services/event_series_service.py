@@ -0,0 +1,108 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.events.change_notifier import change_notifier
+from app.models.events import EventSeries
+from app.repositories.event_repo import EventPeriod
+from app.repositories.event_series_repo import EventSeriesRepository
+from app.schemas.events import EventOut, EventSeriesCreate, EventSeriesUpdate
+from app.schemas.users import User
+from app.utils.intervals import Interval
+from app.utils.recurrence import RecurrenceRule
+
+# Горизонт сброса кэша календаря для бесконечной серии: более далекие месяцы устареют не дольше TTL кэша
+SERIES_INVALIDATION_HORIZON = timedelta(days=2 * 366)
+
+
+def expand_series(series: EventSeries, start_time: datetime, end_time: datetime) -> Iterator[Interval]:
+    """Ленивый перебор вхождений серии, пересекающихся с [start_time, end_time)"""
+    return RecurrenceRule.parse(series.rrule).occurrences(
+        series.start_time, series.end_time, ZoneInfo(series.timezone), start_time, end_time, series.exdates
+    )
+
+
+def series_events(series: EventSeries, start_time: datetime, end_time: datetime) -> Iterator[EventOut]:
+    """Вхождения серии в окне [start_time, end_time) в виде событий"""
+    for occurrence_start, occurrence_end in expand_series(series, start_time, end_time):
+        yield EventOut(
+            id=series.id,
+            series_id=series.id,
+            employee_id=series.employee_id,
+            title=series.title,
+            description=series.description,
+            start_time=occurrence_start,
+            end_time=occurrence_end,
+            event_type=series.event_type,
+            source_id=None,
+            created_at=series.created_at,
+        )
+
+
+def series_period(series: EventSeries) -> EventPeriod:
+    """Период серии для сброса кэша календаря, бесконечная серия ограничивается горизонтом"""
+    horizon = max(series.start_time, datetime.now(timezone.utc)) + SERIES_INVALIDATION_HORIZON
+    end_time = min(series.until_time, horizon) if series.until_time else horizon
+    return series.employee_id, series.start_time, end_time
+
+
+class EventSeriesService:
+    """Сервис для управления сериями повторяющихся событий"""
+
+    def __init__(self, session: AsyncSession):
+        self.repo = EventSeriesRepository(session)
+
+    @staticmethod
+    def get_until_time(start_time: datetime, end_time: datetime, rrule: str, tz: str) -> datetime | None:
+        """Конец последнего вхождения серии, None для бесконечной серии. Серия без вхождений не сохраняется"""
+        rule = RecurrenceRule.parse(rrule)
+        if not rule.has_occurrences(start_time, end_time, ZoneInfo(tz)):
+            detail = "Правило повторения не дает ни одного вхождения"
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+        return rule.last_end(start_time, end_time, ZoneInfo(tz))
+
+    async def create_series(self, series_data: EventSeriesCreate, user: User) -> EventSeries:
+        """Создание серии"""
+        data = series_data.model_dump()
+        data["until_time"] = self.get_until_time(data["start_time"], data["end_time"], data["rrule"], data["timezone"])
+        series = await self.repo.create(employee_id=user.id, **data)
+        await self.repo.session.commit()
+        await change_notifier.publish([series_period(series)])
+        return series
+
+    async def get_series(self, series_id: int, user: User) -> EventSeries:
+        """Получение серии"""
+        series = await self.repo.get(series_id)
+        if not (series and series.employee_id == user.id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Серия событий не найдена")
+        return series
+
+    async def update_series(self, series_id: int, series_data: EventSeriesUpdate, user: User) -> EventSeries:
+        """Обновление серии, изменения применяются ко всем вхождениям"""
+        series = await self.get_series(series_id, user)
+        old_period = series_period(series)
+        # None в запросе означает "не изменять": поля серии, кроме описания, обязательные
+        data = series_data.model_dump(exclude_unset=True, exclude_none=True)
+        start_time = data.get("start_time", series.start_time)
+        end_time = data.get("end_time", series.end_time)
+        if end_time <= start_time:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="end_time должен быть больше start_time"
+            )
+        data["until_time"] = self.get_until_time(
+            start_time, end_time, data.get("rrule", series.rrule), data.get("timezone", series.timezone)
+        )
+        series = await self.repo.update(series_id, **data)
+        await self.repo.session.commit()
+        await change_notifier.publish([old_period, series_period(series)])
+        return series
+
+    async def delete_series(self, series_id: int, user: User) -> None:
+        """Удаление серии со всеми вхождениями"""
+        series = await self.get_series(series_id, user)
+        await self.repo.delete(series_id)
+        await self.repo.session.commit()
+        await change_notifier.publish([series_period(series)])
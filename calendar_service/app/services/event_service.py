@@ -1,6 +1,7 @@
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.events.change_notifier import change_notifier
 from app.models.events import Event
 from app.repositories.event_repo import EventRepository
 from app.schemas.events import EventCreate, EventUpdate
@@ -15,14 +16,21 @@ class EventService:
 
     async def create_event(self, event_data: EventCreate, user: User) -> Event:
         """Создание события"""
-        return await self.repo.create(employee_id=user.id, **event_data.model_dump(exclude_unset=True))
+        event = await self.repo.create(employee_id=user.id, **event_data.model_dump(exclude_unset=True))
+        await self.repo.session.commit()
+        await change_notifier.publish([(event.employee_id, event.start_time, event.end_time)])
+        return event
 
     async def update_event(self, event_id: int, event_data: EventUpdate, user: User) -> Event:
         """Обновление событий"""
         event = await self.repo.get(event_id)
         if not (event and event.employee_id == user.id):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Событие не найдено")
-        return await self.repo.update(event_id, **event_data.model_dump(exclude_unset=True))
+        old_period = (event.employee_id, event.start_time, event.end_time)
+        event = await self.repo.update(event_id, **event_data.model_dump(exclude_unset=True))
+        await self.repo.session.commit()
+        await change_notifier.publish([old_period, (event.employee_id, event.start_time, event.end_time)])
+        return event
 
     async def get_event(self, event_id: int, user: User) -> None:
         """Получение события"""
@@ -37,3 +45,5 @@ class EventService:
         if not (event and event.employee_id == user.id):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Событие не найдено")
         await self.repo.delete(event_id)
+        await self.repo.session.commit()
+        await change_notifier.publish([(event.employee_id, event.start_time, event.end_time)])
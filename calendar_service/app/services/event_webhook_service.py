@@ -1,8 +1,84 @@
+import heapq
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from zoneinfo import ZoneInfo
+
+import asyncpg
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.event_repo import EventRepository
-from app.schemas.event_webhooks import EventParams, NewEventHook
+from app.config import settings
+from app.events.change_notifier import change_notifier
+from app.logging_config import logger
+from app.repositories.event_repo import EventRepository, SourceKey
+from app.repositories.event_series_repo import EventSeriesRepository
+from app.schemas.event_webhooks import (
+    BulkEventStatus,
+    EmployeeFreeBusy,
+    EventParams,
+    FreeBusyRequest,
+    FreeBusyResponse,
+    FreeSlotsRequest,
+    FreeSlotsResponse,
+    NewEventHook,
+    TimeInterval,
+)
+from app.services.calendar_cache import coalesce_periods
+from app.services.event_series_service import expand_series
+from app.utils.intervals import Interval, clip_intervals, daily_intervals, find_free_slots, merge_intervals
+from app.utils.json_stream import JSONStreamError, iter_json_array, iter_lines
+
+BULK_STATUSES = list(BulkEventStatus)
+
+
+class BulkEventsReport:
+    """
+    Результаты пакетной загрузки событий. Статусы хранятся по байту на событие,
+    сообщения об ошибках - только для событий с ошибками
+    """
+
+    def __init__(self):
+        self.statuses = bytearray()
+        self.errors: dict[int, str] = {}
+
+    def add(self, result: BulkEventStatus = BulkEventStatus.INVALID, error: str | None = None) -> int:
+        """Добавление события, возвращает его номер в пакете"""
+        self.statuses.append(BULK_STATUSES.index(result))
+        if error:
+            self.errors[len(self.statuses) - 1] = error
+        return len(self.statuses) - 1
+
+    def set(self, index: int, result: BulkEventStatus, error: str | None = None) -> None:
+        self.statuses[index] = BULK_STATUSES.index(result)
+        if error:
+            self.errors[index] = error
+
+    def counts(self) -> dict[str, int]:
+        return {"total": len(self.statuses)} | {
+            result.value: self.statuses.count(code) for code, result in enumerate(BULK_STATUSES)
+        }
+
+    async def iter_json(self, chunk_size: int = 1000) -> AsyncIterator[bytes]:
+        """Ответ в формате BulkEventsResponse частями, без построения всего списка результатов в памяти"""
+        yield json.dumps(self.counts())[:-1].encode() + b', "results": ['
+        for start in range(0, len(self.statuses), chunk_size):
+            items = []
+            for index in range(start, min(start + chunk_size, len(self.statuses))):
+                item = {"index": index, "status": BULK_STATUSES[self.statuses[index]].value}
+                if index in self.errors:
+                    item["error"] = self.errors[index]
+                items.append(json.dumps(item, ensure_ascii=False))
+            yield (", " if start else "").encode() + ", ".join(items).encode()
+        yield b"]}"
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, item['loc'])) or 'event'}: {item['msg']}" for item in error.errors())
 
 
 class EventWebhookService:
@@ -10,17 +86,152 @@ class EventWebhookService:
 
     def __init__(self, session: AsyncSession):
         self.repo = EventRepository(session)
+        self.series_repo = EventSeriesRepository(session)
 
     async def create_event(self, event_data: NewEventHook) -> None:
-        """Создание события"""
-        await self.repo.create(**event_data.model_dump())
+        """Создание события, повторный запрос обновляет ранее созданное событие"""
+        key = (event_data.source_id, event_data.event_type, event_data.employee_id)
+        periods = list(await self.repo.get_periods_by_source([key]))
+        await self.repo.upsert(**event_data.model_dump())
+        await self.repo.session.commit()
+        periods.append((event_data.employee_id, event_data.start_time, event_data.end_time))
+        await change_notifier.publish(periods)
 
     async def delete_event(self, event_data: EventParams) -> None:
         """Удаление события"""
-        await self.repo.delete_by_source(**event_data.model_dump())
+        periods = await self.repo.delete_by_source(**event_data.model_dump())
+        await change_notifier.publish(periods)
+
+    async def bulk_create_events(self, chunks: AsyncIterable[bytes], ndjson: bool) -> BulkEventsReport:
+        """
+        Пакетное создание и обновление событий из потока NDJSON или JSON-массива.
+
+        Поток разбирается по мере получения, события проверяются по одному и записываются пакетами
+        по BULK_EVENTS_BATCH_SIZE (COPY во временную таблицу и upsert), каждый пакет в своей транзакции.
+        Ошибка записи пакета отмечает его события как failed и не прерывает загрузку.
+        При нарушении структуры JSON-массива загрузка останавливается, записанные пакеты сохраняются.
+        """
+        report = BulkEventsReport()
+        batch: list[tuple[int, NewEventHook]] = []
+        try:
+            items = iter_lines(chunks) if ndjson else iter_json_array(chunks)
+            async for item in items:
+                try:
+                    event = (
+                        NewEventHook.model_validate_json(item) if ndjson else NewEventHook.model_validate(item)
+                    )
+                except ValidationError as e:
+                    report.add(error=format_validation_error(e))
+                    continue
+                batch.append((report.add(BulkEventStatus.CREATED), event))
+                if len(batch) >= settings.BULK_EVENTS_BATCH_SIZE:
+                    await self._write_batch(batch, report)
+                    batch = []
+        except JSONStreamError as e:
+            report.add(error=str(e))
+        await self._write_batch(batch, report)
+        logger.info(f"Пакетная загрузка событий: {report.counts()}")
+        return report
+
+    async def _write_batch(self, batch: list[tuple[int, NewEventHook]], report: BulkEventsReport) -> None:
+        """Запись пакета событий в одной транзакции, при повторе ключа в пакете применяется последнее событие"""
+        unique: dict[SourceKey, tuple[int, NewEventHook]] = {}
+        for index, event in batch:
+            key = (event.source_id, event.event_type, event.employee_id)
+            if key in unique:
+                report.set(unique[key][0], BulkEventStatus.DUPLICATE)
+            unique[key] = (index, event)
+        if not unique:
+            return
+        try:
+            updated, periods = await self.repo.copy_upsert([event.model_dump() for _, event in unique.values()])
+            await self.repo.session.commit()
+        except (SQLAlchemyError, asyncpg.PostgresError) as e:
+            await self.repo.session.rollback()
+            logger.error(f"Ошибка записи пакета из {len(unique)} событий: {e}")
+            for index, _ in unique.values():
+                report.set(index, BulkEventStatus.FAILED, str(e).splitlines()[0])
+            return
+        for key, (index, event) in unique.items():
+            report.set(index, BulkEventStatus.UPDATED if key in updated else BulkEventStatus.CREATED)
+            periods.append((event.employee_id, event.start_time, event.end_time))
+        await change_notifier.publish(coalesce_periods(periods))
 
     async def has_events_in_period(self, event_data: EventParams) -> None:
-        """Проверка на существование события в определенный период"""
+        """Проверка на существование события или вхождения повторяющегося события в определенный период"""
         event = await self.repo.has_events_in_period(**event_data.model_dump())
+        if not event:
+            series = await self.series_repo.get_overlapping(
+                [event_data.employee_id], event_data.start_time, event_data.end_time
+            )
+            # Достаточно первого вхождения в окне, остальные вхождения не вычисляются
+            event = any(
+                next(expand_series(item, event_data.start_time, event_data.end_time), None) for item in series
+            )
         if not event:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found event")
+
+    async def get_busy_by_employee(
+        self, employee_ids: list[int], start_time: datetime, end_time: datetime
+    ) -> dict[int, Iterator[Interval]]:
+        """
+        Интервалы занятости сотрудников в окне: события и вхождения повторяющихся событий,
+        отсортированные по началу. Вхождения серий вычисляются лениво при переборе
+        """
+        periods = await self.repo.get_busy_periods(employee_ids, start_time, end_time)
+        series = await self.series_repo.get_overlapping(employee_ids, start_time, end_time)
+        events_by_employee = {
+            employee_id: [(start, end) for _, start, end in rows]
+            for employee_id, rows in groupby(periods, key=itemgetter(0))
+        }
+        series_by_employee = {
+            employee_id: [expand_series(item, start_time, end_time) for item in items]
+            for employee_id, items in groupby(series, key=lambda item: item.employee_id)
+        }
+        return {
+            employee_id: heapq.merge(
+                events_by_employee.get(employee_id, []), *series_by_employee.get(employee_id, []), key=itemgetter(0)
+            )
+            for employee_id in events_by_employee.keys() | series_by_employee.keys()
+        }
+
+    async def get_free_busy(self, request: FreeBusyRequest) -> FreeBusyResponse:
+        """Объединенные интервалы занятости сотрудников в окне запроса"""
+        employee_ids = list(dict.fromkeys(request.employee_ids))
+        busy_by_employee = await self.get_busy_by_employee(employee_ids, request.start_time, request.end_time)
+        busy = {
+            employee_id: merge_intervals(clip_intervals(intervals, request.start_time, request.end_time))
+            for employee_id, intervals in busy_by_employee.items()
+        }
+        return FreeBusyResponse(
+            start_time=request.start_time,
+            end_time=request.end_time,
+            employees=[
+                EmployeeFreeBusy(
+                    employee_id=employee_id,
+                    busy=[TimeInterval(start_time=start, end_time=end) for start, end in busy.get(employee_id, [])],
+                )
+                for employee_id in employee_ids
+            ],
+        )
+
+    async def find_free_slots(self, request: FreeSlotsRequest) -> FreeSlotsResponse:
+        """Поиск ближайших слотов, в которые свободны все сотрудники, с учетом рабочих часов"""
+        employee_ids = list(dict.fromkeys(request.employee_ids))
+        busy_by_employee = await self.get_busy_by_employee(employee_ids, request.start_time, request.end_time)
+        working_intervals = None
+        if request.working_hours:
+            hours = request.working_hours
+            working_intervals = daily_intervals(
+                request.start_time, request.end_time, hours.start, hours.end, ZoneInfo(hours.timezone), hours.weekdays
+            )
+        slots = find_free_slots(
+            busy_by_employee.values(),
+            request.start_time,
+            request.end_time,
+            duration=timedelta(minutes=request.duration_minutes),
+            step=timedelta(minutes=request.step_minutes),
+            count=request.count,
+            working_intervals=working_intervals,
+        )
+        return FreeSlotsResponse(slots=[TimeInterval(start_time=start, end_time=end) for start, end in slots])
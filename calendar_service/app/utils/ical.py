@@ -0,0 +1,62 @@
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+PRODID = "-//business_management//calendar_service//RU"
+# Максимальная длина строки iCalendar в октетах без CRLF (RFC 5545, 3.1)
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value: str) -> str:
+    """Экранирование значения типа TEXT"""
+    value = value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    return value.replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def fold_line(line: str) -> str:
+    """Перенос длинной строки: продолжение начинается с пробела, многобайтовые символы не разрываются"""
+    if len(line.encode()) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    chunks, chunk, size = [], [], 0
+    for char in line:
+        char_size = len(char.encode())
+        # Пробел в начале строки продолжения тоже занимает октет
+        if size + char_size > MAX_LINE_OCTETS - bool(chunks):
+            chunks.append("".join(chunk))
+            chunk, size = [], 0
+        chunk.append(char)
+        size += char_size
+    chunks.append("".join(chunk))
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+def format_datetime(value: datetime) -> str:
+    """Дата и время в UTC: 20260105T090000Z"""
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def datetime_property(name: str, value: datetime, tz: str = "UTC") -> str:
+    """Свойство с датой и временем: в UTC или по местному времени часового пояса tz (DTSTART;TZID=...)"""
+    if tz == "UTC":
+        return f"{name}:{format_datetime(value)}"
+    return f"{name};TZID={tz}:{value.astimezone(ZoneInfo(tz)).strftime('%Y%m%dT%H%M%S')}"
+
+
+def component(name: str, lines: Iterable[str]) -> str:
+    """Компонент iCalendar (VEVENT и т.п.) из строк свойств"""
+    return f"BEGIN:{name}\r\n" + "".join(fold_line(line) for line in lines) + f"END:{name}\r\n"
+
+
+def calendar_header(name: str) -> str:
+    lines = (
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    )
+    return "BEGIN:VCALENDAR\r\n" + "".join(fold_line(line) for line in lines)
+
+
+def calendar_footer() -> str:
+    return "END:VCALENDAR\r\n"
@@ -0,0 +1,130 @@
+from collections.abc import Iterable, Iterator
+from datetime import datetime, time, timedelta, timezone
+from itertools import chain, islice
+from operator import itemgetter
+from zoneinfo import ZoneInfo
+
+Interval = tuple[datetime, datetime]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """
+    Объединение пересекающихся и смежных интервалов [start, end).
+    Интервалы должны быть отсортированы по началу, пустые интервалы пропускаются.
+    """
+    merged: list[Interval] = []
+    for start, end in intervals:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def clip_intervals(intervals: Iterable[Interval], window_start: datetime, window_end: datetime) -> list[Interval]:
+    """Обрезка интервалов по окну [window_start, window_end), интервалы вне окна пропускаются"""
+    clipped = []
+    for start, end in intervals:
+        start, end = max(start, window_start), min(end, window_end)
+        if start < end:
+            clipped.append((start, end))
+    return clipped
+
+
+def complement_intervals(busy: Iterable[Interval], window_start: datetime, window_end: datetime) -> Iterator[Interval]:
+    """Свободные промежутки окна между отсортированными объединенными интервалами занятости"""
+    cursor = window_start
+    for start, end in busy:
+        if start >= window_end:
+            break
+        if start > cursor:
+            yield cursor, start
+        cursor = max(cursor, end)
+        if cursor >= window_end:
+            return
+    if cursor < window_end:
+        yield cursor, window_end
+
+
+def intersect_intervals(first: Iterable[Interval], second: Iterable[Interval]) -> Iterator[Interval]:
+    """Пересечение двух отсортированных последовательностей непересекающихся интервалов за один проход"""
+    first, second = iter(first), iter(second)
+    a, b = next(first, None), next(second, None)
+    while a is not None and b is not None:
+        start, end = max(a[0], b[0]), min(a[1], b[1])
+        if start < end:
+            yield start, end
+        if a[1] <= b[1]:
+            a = next(first, None)
+        else:
+            b = next(second, None)
+
+
+def daily_intervals(
+    window_start: datetime,
+    window_end: datetime,
+    day_start: time,
+    day_end: time,
+    tz: ZoneInfo,
+    weekdays: Iterable[int] = range(7),
+) -> Iterator[Interval]:
+    """
+    Ежедневные интервалы [day_start, day_end) по местному времени tz в дни недели weekdays (0 - понедельник).
+    Если day_end не больше day_start, интервал заканчивается на следующий день. Результат в UTC.
+    """
+    weekdays = set(weekdays)
+    day = window_start.astimezone(tz).date() - timedelta(days=1)
+    last_day = window_end.astimezone(tz).date()
+    while day <= last_day:
+        if day.weekday() in weekdays:
+            start = datetime.combine(day, day_start, tzinfo=tz).astimezone(timezone.utc)
+            end_day = day if day_end > day_start else day + timedelta(days=1)
+            end = datetime.combine(end_day, day_end, tzinfo=tz).astimezone(timezone.utc)
+            start, end = max(start, window_start), min(end, window_end)
+            if start < end:
+                yield start, end
+        day += timedelta(days=1)
+
+
+def align(moment: datetime, step: timedelta) -> datetime:
+    """Округление момента вверх до сетки с шагом step от начала эпохи"""
+    remainder = (moment - EPOCH) % step
+    return moment + (step - remainder) if remainder else moment
+
+
+def iter_slots(free: Iterable[Interval], duration: timedelta, step: timedelta) -> Iterator[Interval]:
+    """Непересекающиеся слоты длительностью duration внутри свободных интервалов, начало слота кратно step"""
+    for start, end in free:
+        slot_start = align(start, step)
+        while slot_start + duration <= end:
+            yield slot_start, slot_start + duration
+            slot_start = align(slot_start + duration, step)
+
+
+def find_free_slots(
+    busy_by_employee: Iterable[Iterable[Interval]],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    step: timedelta,
+    count: int,
+    working_intervals: Iterable[Interval] | None = None,
+) -> list[Interval]:
+    """
+    Первые count слотов, в которые свободны все сотрудники.
+
+    Отсортированные интервалы занятости сотрудников сливаются в один список и объединяются в общую занятость
+    (сортировка по началу интервала быстро сливает уже отсортированные последовательности),
+    ее дополнение в окне пересекается с рабочими интервалами. Дополнение, пересечение и нарезка слотов -
+    ленивые проходы по отсортированным последовательностям, перебор останавливается на count-м слоте.
+    """
+    busy = sorted(chain.from_iterable(busy_by_employee), key=itemgetter(0))
+    free = complement_intervals(merge_intervals(busy), window_start, window_end)
+    if working_intervals is not None:
+        free = intersect_intervals(free, working_intervals)
+    return list(islice(iter_slots(free, duration, step), count))
@@ -0,0 +1,80 @@
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+
+# Элемент, который не удалось разобрать, не должен накапливаться в памяти без ограничения
+MAX_ITEM_BYTES = 1024 * 1024
+
+
+class JSONStreamError(ValueError):
+    """Нарушена структура потока, продолжить разбор невозможно"""
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Непустые строки потока байтов (NDJSON)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+        if len(buffer) > MAX_ITEM_BYTES:
+            raise JSONStreamError(f"Строка длиннее {MAX_ITEM_BYTES} байт")
+    if buffer.strip():
+        yield buffer
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[object]:
+    """
+    Элементы JSON-массива по мере получения потока: в памяти находится только неразобранный остаток.
+    Незавершенный элемент дочитывается из следующих частей потока
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, started, finished, after_comma = "", False, False, False
+    async for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        pos = 0
+        while True:
+            pos = skip_whitespace(buffer, pos)
+            if pos == len(buffer):
+                break
+            if finished:
+                raise JSONStreamError("Данные после конца массива")
+            if not started:
+                if buffer[pos] != "[":
+                    raise JSONStreamError("Ожидается JSON-массив")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                if after_comma:
+                    raise JSONStreamError("Ожидается элемент массива после ','")
+                finished, pos = True, pos + 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Элемент мог прийти не полностью
+                break
+            end = skip_whitespace(buffer, end)
+            if end == len(buffer):
+                # Разделитель еще не получен, элемент разберем повторно вместе со следующей частью
+                break
+            if buffer[end] not in ",]":
+                raise JSONStreamError(f"Ожидается ',' или ']' после элемента, получено {buffer[end]!r}")
+            yield item
+            after_comma = buffer[end] == ","
+            pos = end + 1 if after_comma else end
+        buffer = buffer[pos:]
+        if len(buffer) > MAX_ITEM_BYTES:
+            raise JSONStreamError(f"Некорректный элемент массива или элемент длиннее {MAX_ITEM_BYTES} байт")
+    buffer += utf8.decode(b"", final=True)
+    if buffer.strip() or not finished:
+        raise JSONStreamError("Поток закончился до конца JSON-массива")
+
+
+def skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in " \t\r\n":
+        pos += 1
+    return pos
@@ -0,0 +1,206 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import MAXYEAR, date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.utils.intervals import Interval
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+SUPPORTED_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY"}
+MAX_COUNT = 1000
+MAX_DATETIME = datetime.max.replace(tzinfo=timezone.utc)
+# Даты повторяются с григорианским циклом (400 лет): если за цикл в периодах правила не было ни одной
+# существующей даты (BYMONTHDAY=30 только в феврале), вхождений не будет
+EMPTY_PERIODS_LIMIT = {"MONTHLY": 400 * 12, "YEARLY": 400}
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    Правило повторения, подмножество RRULE (RFC 5545): FREQ=DAILY|WEEKLY|MONTHLY|YEARLY, INTERVAL,
+    COUNT или UNTIL, BYDAY (дни недели без номеров, только для WEEKLY), BYMONTHDAY (1..31, только для MONTHLY).
+    Несуществующие даты (31 число в коротком месяце, 29 февраля) пропускаются.
+    """
+
+    freq: str
+    interval: int = 1
+    count: int | None = None
+    until: datetime | None = None
+    byday: tuple[int, ...] = ()
+    bymonthday: tuple[int, ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> "RecurrenceRule":
+        parts = {}
+        for item in text.strip().removeprefix("RRULE:").split(";"):
+            name, sep, value = item.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Некорректная часть правила повторения: {item}")
+            parts[name.strip().upper()] = value.strip().upper()
+        unknown = parts.keys() - SUPPORTED_PARTS
+        if unknown:
+            raise ValueError(f"Не поддерживаются параметры правила повторения: {', '.join(sorted(unknown))}")
+        freq = parts.get("FREQ")
+        if freq not in FREQUENCIES:
+            raise ValueError(f"FREQ должен быть одним из {', '.join(FREQUENCIES)}")
+        interval = int(parts.get("INTERVAL", 1))
+        if interval < 1:
+            raise ValueError("INTERVAL должен быть положительным")
+        if "COUNT" in parts and "UNTIL" in parts:
+            raise ValueError("COUNT и UNTIL не могут быть заданы одновременно")
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT должен быть от 1 до {MAX_COUNT}")
+        until = parse_until(parts["UNTIL"]) if "UNTIL" in parts else None
+        byday = ()
+        if "BYDAY" in parts:
+            if freq != "WEEKLY":
+                raise ValueError("BYDAY поддерживается только для FREQ=WEEKLY")
+            try:
+                byday = tuple(sorted({WEEKDAYS[day] for day in parts["BYDAY"].split(",")}))
+            except KeyError as e:
+                raise ValueError(f"Некорректный день недели в BYDAY: {e.args[0]}") from e
+        bymonthday = ()
+        if "BYMONTHDAY" in parts:
+            if freq != "MONTHLY":
+                raise ValueError("BYMONTHDAY поддерживается только для FREQ=MONTHLY")
+            bymonthday = tuple(sorted({int(day) for day in parts["BYMONTHDAY"].split(",")}))
+            if any(not 1 <= day <= 31 for day in bymonthday):
+                raise ValueError("BYMONTHDAY должен быть от 1 до 31")
+        return cls(freq, interval, count, until, byday, bymonthday)
+
+    def format(self) -> str:
+        """Правило в формате RRULE, UNTIL всегда в UTC (RFC 5545 требует этого при DTSTART с часовым поясом)"""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        if self.until:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%dT%H%M%SZ')}")
+        if self.byday:
+            names = {index: name for name, index in WEEKDAYS.items()}
+            parts.append(f"BYDAY={','.join(names[day] for day in self.byday)}")
+        if self.bymonthday:
+            parts.append(f"BYMONTHDAY={','.join(map(str, self.bymonthday))}")
+        return ";".join(parts)
+
+    def _skip_periods(self, dtstart: datetime, target: datetime) -> int:
+        """Количество периодов правила, которые целиком раньше target (с запасом в один период)"""
+        if target <= dtstart:
+            return 0
+        if self.freq == "DAILY":
+            periods = (target.date() - dtstart.date()).days // self.interval
+        elif self.freq == "WEEKLY":
+            periods = (target.date() - dtstart.date()).days // 7 // self.interval
+        elif self.freq == "MONTHLY":
+            periods = ((target.year - dtstart.year) * 12 + target.month - dtstart.month) // self.interval
+        else:
+            periods = (target.year - dtstart.year) // self.interval
+        return max(periods - 1, 0)
+
+    def _periods(self, dtstart: datetime, period: int) -> Iterator[tuple[datetime, list[datetime]]]:
+        """
+        Периоды правила, начиная с period: начало периода и начала вхождений в нем по местному времени
+        (без часового пояса) в порядке возрастания. Список вхождений пуст, если в периоде нет существующих дат.
+        Перебор заканчивается на последнем годе, представимом datetime
+        """
+        clock = dtstart.time()
+        while True:
+            if self.freq == "DAILY":
+                first = dtstart.date() + timedelta(days=period * self.interval)
+                days = [first]
+            elif self.freq == "WEEKLY":
+                first = dtstart.date() - timedelta(days=dtstart.weekday()) + timedelta(weeks=period * self.interval)
+                days = [first + timedelta(days=weekday) for weekday in self.byday or (dtstart.weekday(),)]
+            elif self.freq == "MONTHLY":
+                year, month = divmod(dtstart.month - 1 + period * self.interval, 12)
+                if dtstart.year + year >= MAXYEAR:
+                    return
+                first = date(dtstart.year + year, month + 1, 1)
+                days = [safe_date(first.year, first.month, day) for day in self.bymonthday or (dtstart.day,)]
+            else:
+                if dtstart.year + period * self.interval >= MAXYEAR:
+                    return
+                first = date(dtstart.year + period * self.interval, 1, 1)
+                days = [safe_date(first.year, dtstart.month, dtstart.day)]
+            if first.year >= MAXYEAR:
+                return
+            candidates = [datetime.combine(day, clock) for day in days if day is not None]
+            yield datetime.combine(first, datetime.min.time()), [start for start in candidates if start >= dtstart]
+            period += 1
+
+    def occurrences(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        tz: ZoneInfo,
+        window_start: datetime,
+        window_end: datetime,
+        exdates: Iterable[datetime] = (),
+    ) -> Iterator[Interval]:
+        """
+        Вхождения серии, пересекающиеся с окном [window_start, window_end), в порядке возрастания.
+
+        start_time и end_time - первое вхождение серии. Повторение считается по местному времени tz,
+        поэтому время начала не сдвигается при переходе на летнее время. Вхождения вычисляются лениво:
+        без COUNT перебор начинается сразу с периода, в который попадает окно, и заканчивается на его конце.
+        Конец перебора определяется по началу периода, а не по вхождениям: в периодах правила может не быть
+        существующих дат. Если их нет целый григорианский цикл подряд, вхождений у серии нет.
+        """
+        duration = end_time - start_time
+        dtstart = start_time.astimezone(tz).replace(tzinfo=None)
+        # С COUNT вхождения нужно считать от начала серии
+        period = 0
+        if not self.count:
+            period = self._skip_periods(dtstart, (window_start - duration).astimezone(tz).replace(tzinfo=None))
+        skipped = set(exdates)
+        empty_limit = EMPTY_PERIODS_LIMIT.get(self.freq)
+        index = empty = 0
+        for period_start, candidates in self._periods(dtstart, period):
+            period_start = period_start.replace(tzinfo=tz).astimezone(timezone.utc)
+            if (self.until and period_start > self.until) or period_start >= window_end:
+                return
+            empty = 0 if candidates else empty + 1
+            if empty_limit and empty >= empty_limit:
+                return
+            for local_start in candidates:
+                start = local_start.replace(tzinfo=tz).astimezone(timezone.utc)
+                if (self.count and index >= self.count) or (self.until and start > self.until) or start >= window_end:
+                    return
+                index += 1
+                if start + duration > window_start and start not in skipped:
+                    yield start, start + duration
+
+    def has_occurrences(self, start_time: datetime, end_time: datetime, tz: ZoneInfo) -> bool:
+        """Есть ли у серии хотя бы одно вхождение"""
+        return next(self.occurrences(start_time, end_time, tz, start_time, MAX_DATETIME), None) is not None
+
+    def last_end(self, start_time: datetime, end_time: datetime, tz: ZoneInfo) -> datetime | None:
+        """Конец последнего вхождения серии, None для бесконечной серии"""
+        if self.until:
+            return self.until + (end_time - start_time)
+        if self.count:
+            last = None
+            for last in self.occurrences(start_time, end_time, tz, start_time, MAX_DATETIME):
+                pass
+            return last[1] if last else end_time
+        return None
+
+
+def safe_date(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_until(value: str) -> datetime:
+    """UNTIL в формате YYYYMMDD (конец дня по UTC) или YYYYMMDDTHHMMSSZ"""
+    try:
+        if "T" in value:
+            return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return datetime.strptime(value, "%Y%m%d").replace(tzinfo=timezone.utc) + timedelta(days=1, microseconds=-1)
+    except ValueError as e:
+        raise ValueError(f"Некорректный UNTIL: {value}") from e
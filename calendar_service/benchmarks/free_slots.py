@@ -0,0 +1,131 @@
+"""
+Бенчмарк поиска общих свободных слотов: 100 участников за 90 дней.
+
+Сравниваются find_free_slots (слияние отсортированных интервалов занятости и проход по ним)
+и перебор, которым пользуются клиенты: для каждого кандидата на сетке шагов проверяются события
+каждого участника за этот день (как при запросах /calendar/day по каждому участнику).
+Данные генерируются в памяти, БД не нужна. Запуск из каталога calendar_service:
+    python -m benchmarks.free_slots --participants 100 --days 90
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from app.utils.intervals import Interval, daily_intervals, find_free_slots
+
+WINDOW_START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+WORK_START = 9
+WORK_END = 18
+
+
+def generate_busy(participants: int, days: int, events_per_day: float, seed: int) -> list[list[Interval]]:
+    """
+    Отсортированные события участников в рабочее время, длительностью от 30 минут до 2 часов.
+    events_per_day - среднее количество событий участника в день.
+    """
+    rnd = random.Random(seed)
+    busy = []
+    for _ in range(participants):
+        events = []
+        for day in range(days):
+            day_start = WINDOW_START + timedelta(days=day, hours=WORK_START)
+            for _ in range(int(events_per_day) + (rnd.random() < events_per_day % 1)):
+                start = day_start + timedelta(minutes=15 * rnd.randrange((WORK_END - WORK_START) * 4))
+                events.append((start, start + timedelta(minutes=30 * rnd.randint(1, 4))))
+        busy.append(sorted(events))
+    return busy
+
+
+def brute_force(
+    busy: list[list[Interval]], days: int, duration: timedelta, step: timedelta, count: int
+) -> list[Interval]:
+    """Перебор кандидатов по сетке с проверкой событий каждого участника за день"""
+    by_day = [defaultdict(list) for _ in busy]
+    for index, events in enumerate(busy):
+        for start, end in events:
+            by_day[index][start.date()].append((start, end))
+    slots = []
+    for day in range(days):
+        candidate = WINDOW_START + timedelta(days=day, hours=WORK_START)
+        if candidate.weekday() > 4:
+            continue
+        day_end = candidate.replace(hour=WORK_END)
+        while candidate + duration <= day_end:
+            slot_end = candidate + duration
+            if all(
+                end <= candidate or start >= slot_end
+                for events in by_day
+                for start, end in events.get(candidate.date(), [])
+            ):
+                slots.append((candidate, slot_end))
+                if len(slots) == count:
+                    return slots
+                candidate = slot_end
+            else:
+                candidate += step
+    return slots
+
+
+def engine(
+    busy: list[list[Interval]], days: int, duration: timedelta, step: timedelta, count: int
+) -> list[Interval]:
+    window_end = WINDOW_START + timedelta(days=days)
+    working = daily_intervals(
+        WINDOW_START,
+        window_end,
+        datetime.min.time().replace(hour=WORK_START),
+        datetime.min.time().replace(hour=WORK_END),
+        timezone.utc,
+        range(5),
+    )
+    return find_free_slots(busy, WINDOW_START, window_end, duration, step, count, working)
+
+
+def measure(func, *args, repeat: int) -> tuple[float, list[Interval]]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска общих свободных слотов")
+    parser.add_argument("--participants", type=int, default=100)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument(
+        "--events-per-day",
+        type=float,
+        nargs="+",
+        default=[0.05, 0.5, 3],
+        help="среднее количество событий участника в день, по прогону на каждое значение",
+    )
+    parser.add_argument("--duration", type=int, default=60, help="длительность слота, минут")
+    parser.add_argument("--step", type=int, default=15, help="шаг сетки, минут")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    duration, step = timedelta(minutes=args.duration), timedelta(minutes=args.step)
+    print(f"Участников: {args.participants}, дней: {args.days}")
+    print(f"{'событий/день':>12} {'событий':>8} {'слотов':>8} {'engine, мс':>12} {'перебор, мс':>12} {'найдено':>8}")
+    for events_per_day in args.events_per_day:
+        busy = generate_busy(args.participants, args.days, events_per_day, args.seed)
+        total_events = sum(map(len, busy))
+        for count in (1, 10, 10_000):
+            engine_ms, engine_slots = measure(engine, busy, args.days, duration, step, count, repeat=args.repeat)
+            brute_ms, brute_slots = measure(brute_force, busy, args.days, duration, step, count, repeat=args.repeat)
+            if engine_slots != brute_slots:
+                raise SystemExit(f"Результаты не совпадают: {events_per_day=}, {count=}")
+            print(
+                f"{events_per_day:>12} {total_events:>8} {count:>8} "
+                f"{engine_ms:>12.2f} {brute_ms:>12.2f} {len(engine_slots):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Сравнение поиска пересечений периодов событий: btree индексы по employee_id и start_time
+(start_time < end AND end_time > start) против GiST индекса (employee_id, period) и оператора &&.
+
+Таблицы bench_events_btree и bench_events_gist заполняются одинаковыми данными через generate_series.
+Запуск из каталога calendar_service (нужна БД из настроек сервиса):
+    python -m benchmarks.period_overlap --events 10000000 --employees 2000 --queries 500
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.database import DATABASE_URL
+
+BASE_TIME = datetime(2020, 1, 1, tzinfo=timezone.utc)
+SPAN_DAYS = 5 * 365
+
+CREATE_TABLES = """
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+DROP TABLE IF EXISTS bench_events_btree, bench_events_gist;
+CREATE UNLOGGED TABLE bench_events_btree (
+    id bigserial PRIMARY KEY,
+    employee_id integer NOT NULL,
+    start_time timestamptz NOT NULL,
+    end_time timestamptz
+);
+CREATE UNLOGGED TABLE bench_events_gist (
+    id bigserial PRIMARY KEY,
+    employee_id integer NOT NULL,
+    start_time timestamptz NOT NULL,
+    end_time timestamptz,
+    period tstzrange GENERATED ALWAYS AS (
+        CASE WHEN end_time > start_time THEN tstzrange(start_time, end_time) END
+    ) STORED
+);
+"""
+
+# Распределение событий по сотрудникам неравномерное: у сотрудников с меньшими id событий больше
+FILL_TABLE = """
+INSERT INTO bench_events_btree (employee_id, start_time, end_time)
+SELECT
+    1 + floor(CAST(:employees AS integer) * power(random(), 2))::int,
+    start_time,
+    start_time + make_interval(mins => 15 * (1 + floor(random() * 16))::int)
+FROM (
+    SELECT
+        CAST(:base_time AS timestamptz)
+        + make_interval(secs => random() * CAST(:span_seconds AS integer)) AS start_time
+    FROM generate_series(1, CAST(:events AS integer))
+) s;
+INSERT INTO bench_events_gist (employee_id, start_time, end_time)
+SELECT employee_id, start_time, end_time FROM bench_events_btree;
+"""
+
+CREATE_INDEXES = """
+CREATE INDEX ix_bench_btree_employee_id ON bench_events_btree (employee_id);
+CREATE INDEX ix_bench_btree_start_time ON bench_events_btree (start_time);
+CREATE INDEX ix_bench_gist_employee_period ON bench_events_gist USING gist (employee_id, period);
+ANALYZE bench_events_btree;
+ANALYZE bench_events_gist;
+"""
+
+QUERIES = {
+    "btree: get_by_period": """
+        SELECT id FROM bench_events_btree
+        WHERE employee_id = :employee_id AND start_time < :end_time AND end_time > :start_time
+    """,
+    "gist: get_by_period": """
+        SELECT id FROM bench_events_gist
+        WHERE employee_id = :employee_id AND period && tstzrange(:start_time, :end_time)
+    """,
+    "btree: has_events_in_period": """
+        SELECT EXISTS (
+            SELECT 1 FROM bench_events_btree
+            WHERE employee_id = :employee_id AND start_time < :end_time AND end_time > :start_time
+        )
+    """,
+    "gist: has_events_in_period": """
+        SELECT EXISTS (
+            SELECT 1 FROM bench_events_gist
+            WHERE employee_id = :employee_id AND period && tstzrange(:start_time, :end_time)
+        )
+    """,
+}
+
+
+async def execute_script(conn: AsyncConnection, script: str, **params) -> None:
+    for statement in filter(str.strip, script.split(";")):
+        await conn.execute(text(statement), params)
+
+
+async def prepare(conn: AsyncConnection, events: int, employees: int) -> None:
+    started = time.perf_counter()
+    await execute_script(conn, CREATE_TABLES)
+    await execute_script(
+        conn,
+        FILL_TABLE,
+        events=events,
+        employees=employees,
+        base_time=BASE_TIME,
+        span_seconds=SPAN_DAYS * 24 * 60 * 60,
+    )
+    await execute_script(conn, CREATE_INDEXES)
+    print(f"Подготовлено {events} событий за {time.perf_counter() - started:.1f} сек")
+
+
+def make_params(queries: int, employees: int, seed: int) -> list[dict]:
+    """Случайные периоды от часа до месяца, сотрудники выбираются с тем же перекосом, что и при заполнении"""
+    rnd = random.Random(seed)
+    params = []
+    for _ in range(queries):
+        start_time = BASE_TIME + timedelta(seconds=rnd.random() * SPAN_DAYS * 24 * 60 * 60)
+        duration = rnd.choice([timedelta(hours=1), timedelta(days=1), timedelta(days=7), timedelta(days=31)])
+        params.append(
+            {
+                "employee_id": 1 + int(employees * rnd.random() ** 2),
+                "start_time": start_time,
+                "end_time": start_time + duration,
+            }
+        )
+    return params
+
+
+async def run_query(conn: AsyncConnection, sql: str, params: list[dict]) -> list[float]:
+    timings = []
+    for item in params:
+        started = time.perf_counter()
+        await conn.execute(text(sql), item)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска пересечений периодов событий")
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-prepare", action="store_true", help="использовать ранее заполненные таблицы")
+    parser.add_argument("--keep", action="store_true", help="не удалять таблицы после бенчмарка")
+    args = parser.parse_args()
+
+    engine = create_async_engine(DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            if not args.skip_prepare:
+                await prepare(conn, args.events, args.employees)
+        params = make_params(args.queries, args.employees, args.seed)
+        async with engine.connect() as conn:
+            # Прогрев кэша, чтобы сравнение не зависело от порядка запуска
+            for sql in QUERIES.values():
+                await run_query(conn, sql, params[:20])
+            print(f"{'запрос':<30} {'median, мс':>12} {'p95, мс':>10} {'max, мс':>10}")
+            for name, sql in QUERIES.items():
+                timings = sorted(await run_query(conn, sql, params))
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                print(f"{name:<30} {statistics.median(timings):>12.3f} {p95:>10.3f} {timings[-1]:>10.3f}")
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP TABLE IF EXISTS bench_events_btree, bench_events_gist"))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,36 +1,47 @@
+from datetime import datetime
+
 import httpx
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 
+from app.clients.http import http_clients
 from app.config import settings
 from app.logging_config import logger
 
 BASE_URL_CALENDAR = settings.get_calendar_url()
+# Максимальное количество сотрудников в одном запросе занятости к Calendar Service
+FREE_BUSY_BATCH_SIZE = 1000
+BusyIntervals = TypeAdapter(dict[int, list[tuple[datetime, datetime]]])
 
 
 class CalendarServiceClient:
     """Клиент для управление событиями в сервисе Calendar Service"""
 
-    def __init__(self, base_url: str = BASE_URL_CALENDAR):
+    def __init__(self, base_url: str = BASE_URL_CALENDAR, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
         self.headers = {"X-API-KEY": settings.API_KEY_CALENDAR}
-        self.timeout = httpx.Timeout(10.0, connect=5.0)
 
     async def _request(self, method: str, endpoint: str, *, json=None, params=None) -> bool:
+        response = await self._send(method, endpoint, json=json, params=params)
+        return response.status_code == status.HTTP_200_OK
+
+    async def _send(self, method: str, endpoint: str, *, json=None, params=None) -> httpx.Response:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method,
-                    f"{self.base_url}{endpoint}",
-                    headers=self.headers,
-                    json=json,
-                    params=params,
-                )
-                response.raise_for_status()
-                return response.status_code == status.HTTP_200_OK
+            client = self.http_client or http_clients.get("calendar")
+            response = await client.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                headers=self.headers,
+                json=json,
+                params=params,
+            )
+            response.raise_for_status()
+            return response
         except httpx.HTTPStatusError as e:
             # Специальная обработка 404 только для verify
             if method == "GET" and response.status_code == status.HTTP_404_NOT_FOUND:
-                return False
+                return response
             logger.error(f"Ошибка при запросе {e.request.url}: {e}")
             raise HTTPException(status_code=e.response.status_code, detail="Неизвестная ошибка") from e
         except httpx.ConnectError as e:
@@ -50,3 +61,24 @@ class CalendarServiceClient:
     async def has_events_in_period(self, meeting: dict) -> bool:
         """Проверка назначенных событий у пользователя в заданный период"""
         return await self._request("GET", "/webhooks/verify-event", params=meeting)
+
+    async def get_free_busy(
+        self, employee_ids: list[int], start_time: datetime, end_time: datetime
+    ) -> dict[int, list[tuple[datetime, datetime]]]:
+        """Объединенные интервалы занятости нескольких сотрудников в заданный период"""
+        busy = {}
+        for start in range(0, len(employee_ids), FREE_BUSY_BATCH_SIZE):
+            payload = {
+                "employee_ids": employee_ids[start : start + FREE_BUSY_BATCH_SIZE],
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+            }
+            response = await self._send("POST", "/webhooks/free-busy", json=payload)
+            data = {
+                employee["employee_id"]: [
+                    (interval["start_time"], interval["end_time"]) for interval in employee["busy"]
+                ]
+                for employee in response.json()["employees"]
+            }
+            busy |= BusyIntervals.validate_python(data)
+        return busy
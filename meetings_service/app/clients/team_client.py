@@ -1,30 +1,39 @@
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 from app.logging_config import logger
 
 BASE_TEAM_URL = settings.get_team_url()
+inflight = SingleFlight()
 
 
 class TeamServiceClient:
     """Клиент для запросов на Team Service"""
 
-    def __init__(self, base_url: str = BASE_TEAM_URL):
+    def __init__(self, base_url: str = BASE_TEAM_URL, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
-        self.timeout = httpx.Timeout(10.0, connect=5.0)
+        self.http_client = http_client
+        self.headers = {"X-API-KEY": settings.TEAM_API_KEY}
 
     async def _request(self, method: str, endpoint: str, *, json=None, params=None) -> bool:
+        response = await self._send(method, endpoint, json=json, params=params)
+        return response.status_code == status.HTTP_200_OK
+
+    async def _send(self, method: str, endpoint: str, *, json=None, params=None) -> httpx.Response:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method,
-                    f"{self.base_url}{endpoint}",
-                    json=json,
-                    params=params,
-                )
-                response.raise_for_status()
-                return response.status_code == status.HTTP_200_OK
+            client = self.http_client or http_clients.get("team")
+            response = await client.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                headers=self.headers,
+                json=json,
+                params=params,
+            )
+            response.raise_for_status()
+            return response
         except httpx.HTTPStatusError as e:
             logger.error(f"Ошибка при запросе {e.request.url}: {e}")
             raise HTTPException(status_code=e.response.status_code, detail=str(e)) from e
@@ -35,9 +44,18 @@ class TeamServiceClient:
             ) from e
 
     async def get_employee(self, team_id: int, user_id: int):
-        """Получение работника команды из Team Service"""
-        return await self._request("GET", f"/teams/{team_id}/employees/{user_id}")
+        """Получение работника команды из Team Service, одновременные одинаковые запросы объединяются"""
+        endpoint = f"/teams/{team_id}/employees/{user_id}"
+        return await inflight.do(endpoint, lambda: self._request("GET", endpoint))
 
     async def get_team_members(self, team_id: int) -> list[dict]:
-        """Получение участников команды из Team Service"""
-        return await self._request("GET", f"/teams/{team_id}/employees")
+        """Получение участников команды из Team Service, одновременные одинаковые запросы объединяются"""
+        endpoint = f"/teams/{team_id}/employees"
+        return await inflight.do(endpoint, lambda: self._request("GET", endpoint))
+
+    async def get_employees_batch(self, team_id: int, employee_ids: list[int]) -> list[dict]:
+        """Получение работников команды из Team Service одним запросом, не состоящие в команде не возвращаются"""
+        response = await self._send(
+            "POST", "/teams/employees/batch", json={"team_id": team_id, "employee_ids": employee_ids}
+        )
+        return response.json()
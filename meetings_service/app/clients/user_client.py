@@ -1,24 +1,42 @@
 import httpx
 from fastapi import HTTPException
 
+from app.clients.cache import TTLCache, token_key, token_ttl
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 
 BASE_URL = settings.get_user_url()
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL)
+inflight = SingleFlight()
 
 
 class UserServiceClient:
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(self, base_url: str = BASE_URL, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
 
-    async def verify_token(self, token: str) -> dict:
-        """Верификация токена"""
+    async def verify_token(self, token: str, cached: bool = True) -> dict:
+        """
+        Верификация токена с кэшированием успешного результата до истечения TTL или срока действия токена.
+        С cached=False кэш не читается и токен всегда проверяется в User Service
+        """
+        key = token_key(token)
+        user = token_cache.get(key) if cached else None
+        if user is None:
+            user = await inflight.do(key, lambda: self._verify_token(token))
+            token_cache.set(key, user, token_ttl(token))
+        return user
+
+    async def _verify_token(self, token: str) -> dict:
+        """Верификация токена в User Service"""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0)) as client:
-                response = await client.get(
-                    f"{self.base_url}/auth/verify", headers={"Authorization": f"Bearer {token}"}
-                )
-                response.raise_for_status()
-                return response.json()
+            client = self.http_client or http_clients.get("user")
+            response = await client.get(
+                f"{self.base_url}/auth/verify", headers={"Authorization": f"Bearer {token}"}
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail="Неверный токен или пользователь") from e
         except httpx.ConnectError as e:
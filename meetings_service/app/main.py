@@ -2,16 +2,20 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.clients.http import http_clients
 from app.clients.rabbitmq.event_publisher import EventPublisher
 from app.routers.meetings import router as meeting_router
+from app.routers.token_cache import router as token_cache_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Подключение клиента для брокера сообщений RabbitMQ"""
+    """Подключение клиента для брокера сообщений RabbitMQ и HTTP-клиентов для других сервисов"""
     app.rmq_producer = EventPublisher("calendar_events")
     await app.rmq_producer.start_connection()
+    http_clients.open("user", "team", "org", "calendar")
     yield
+    await http_clients.close()
     await app.rmq_producer.disconnect()
 
 
@@ -19,3 +23,4 @@ app = FastAPI(root_path="/meeting-service", lifespan=lifespan)
 
 
 app.include_router(meeting_router, prefix="/meetings", tags=["meetings"])
+app.include_router(token_cache_router, tags=["token cache"])
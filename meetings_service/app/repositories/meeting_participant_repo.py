@@ -1,4 +1,4 @@
-from sqlalchemy import delete, exists, select
+from sqlalchemy import delete, exists, insert, select
 
 from app.models.meeting import MeetingParticipant
 from app.repositories.base_repository import BaseRepository
@@ -14,6 +14,11 @@ class MeetingParticipantRepository(BaseRepository):
         stmt = select(exists().where(self.model.meeting_id == meeting_id, self.model.participant_id == participant_id))
         return bool(await self.session.scalar(stmt))
 
+    async def create_participants(self, meeting_id: int, participant_ids: list[int]) -> None:
+        """Добавление участников встречи одним запросом"""
+        values = [{"meeting_id": meeting_id, "participant_id": participant_id} for participant_id in participant_ids]
+        await self.session.execute(insert(self.model).values(values))
+
     async def delete_participant(self, meeting_id: int, participant_id: int) -> bool:
         """Удаление участника из встречи"""
         stmt = delete(self.model).where(
@@ -5,10 +5,10 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.clients.rabbitmq.event_publisher import EventPublisher
-from app.clients.user_client import UserServiceClient
 from app.config import settings
 from app.database import get_session
-from app.schemas.users import EmployeeRole, User
+from app.schemas.users import EmployeeRole, Status, User
+from app.security import TokenVerifier, token_verifier
 from app.services.meeting_service import MeetingService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.URL_TOKEN}")
@@ -33,12 +33,15 @@ async def meeting_service(
 MeetingServiceDeps = Annotated[MeetingService, Depends(meeting_service)]
 
 
-UserClientDeps = Annotated[UserServiceClient, Depends(lambda: UserServiceClient())]
+TokenVerifierDeps = Annotated[TokenVerifier, Depends(lambda: token_verifier)]
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_client: UserClientDeps) -> User:
-    """Проверяет токен через User Service, возвращает данные (id, status, team_role)."""
-    user_data = await user_client.verify_token(token)
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], verifier: TokenVerifierDeps) -> User:
+    """
+    Проверяет токен по публичным ключам User Service (в строгом режиме - и через User Service),
+    возвращает данные (id, status, team_role).
+    """
+    user_data = await verifier.verify(token)
     if not user_data["is_active"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
     return User.model_validate(user_data)
@@ -47,6 +50,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_c
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def require_system_admin(user: CurrentUser) -> None:
+    """Пользователь с доступом администратора системы"""
+    if user.status != Status.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не достаточно прав")
+
+
+SystemAdminDeps = Depends(require_system_admin)
+
+
 async def require_manager_or_admin(user: Annotated[User, Depends(get_current_user)]) -> User:
     """
     Разрешает действия только админам руководителям команды (role="менеджер", "админ")"""
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Participant(BaseModel):
@@ -18,6 +18,7 @@ class MeetingCreate(BaseModel):
     start_time: datetime
     end_time: datetime
     team_id: int
+    participants: list[Participant] = Field(default_factory=list, max_length=1000)
 
 
 class MeetingUpdate(BaseModel):
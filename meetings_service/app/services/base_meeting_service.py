@@ -27,8 +27,8 @@ class BaseMeetingService:
 
     async def create_meeting(self, user: User, new_data: MeetingCreate) -> Meeting:
         """Создание встречи"""
-        meeting = await self.repo.create(creator_id=user.id, **new_data.model_dump())
-        self.session.commit()
+        meeting = await self.repo.create(creator_id=user.id, **new_data.model_dump(exclude={"participants"}))
+        await self.session.commit()
         logger.info(f"Создание встречи с идентификатором {meeting.id=}")
         return meeting
 
@@ -57,12 +57,20 @@ class BaseMeetingService:
 
     async def add_participant(self, meeting_id: int, participant: Participant, user: User) -> Meeting:
         """Добавить участника ко встрече"""
+        return await self.add_participants(meeting_id, [participant.participant_id], user)
+
+    async def add_participants(self, meeting_id: int, participant_ids: list[int], user: User) -> Meeting:
+        """Добавить участников ко встрече"""
         meeting = await self._get_meeting_or_404(meeting_id, user.id)
-        if await self.meeting_participant_repo.exists_participant(meeting_id, participant.participant_id):
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Участник уже присоединен к встрече")
-        await self.meeting_participant_repo.create(meeting_id=meeting_id, participant_id=participant.participant_id)
+        joined = set(await self.meeting_participant_repo.get_participant_ids(meeting_id)) & set(participant_ids)
+        if joined:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Участники уже присоединены к встрече: {sorted(joined)}",
+            )
+        await self.meeting_participant_repo.create_participants(meeting_id, participant_ids)
         await self.session.commit()
-        logger.info(f"Добавление участника {participant.participant_id=} ко встрече с идентификатором {meeting_id=}")
+        logger.info(f"Добавление участников {participant_ids=} ко встрече с идентификатором {meeting_id=}")
         return meeting
 
     async def delete_participant(self, meeting_id: int, participant_id: int, user: User) -> Meeting:
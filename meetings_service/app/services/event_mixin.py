@@ -2,7 +2,7 @@ from app.clients.calendar_service_client import CalendarServiceClient
 from app.clients.rabbitmq.event_publisher import EventPublisher
 from app.logging_config import logger
 from app.models.meeting import Meeting
-from app.schemas.event_webhooks import NewEventHook
+from app.schemas.meeting import MeetingCreate
 from app.schemas.meeting_events import EventType, MeetingCreatedEvent, MeetingDeletedEvent
 
 
@@ -15,9 +15,11 @@ class EventMixin:
     def add_producer(self, rmq_producer: EventPublisher) -> None:
         self.rmq_producer = rmq_producer
 
-    async def create_event(self, meeting: Meeting) -> None:
-        """Создание события в Calendar Service"""
+    async def create_event(self, meeting: Meeting, employee_id: int | None = None) -> None:
+        """Создание события в Calendar Service для сотрудника employee_id (по умолчанию для создателя встречи)"""
         payload = MeetingCreatedEvent.model_validate(meeting, by_alias=True).model_dump(mode="json")
+        if employee_id is not None:
+            payload["employee_id"] = employee_id
         event = {"type": EventType.CREATED.value, "payload": payload}
         await self.rmq_producer.publish(event)
         logger.info(f"Событие о создании встречи {meeting.id} отправлено в сервисе Calendar Service")
@@ -36,11 +38,7 @@ class EventMixin:
         await self.rmq_producer.publish(event)
         logger.info(f"Событие об обновлении встречи {meeting.id} отправлено в сервисе Calendar Service")
 
-    # TODO: Придумать как сделать проверку события через RabbitMQ
-    async def has_events_in_period(self, meeting: Meeting, user_id: int) -> bool:
-        """Проверка на существование события в Calendar Service"""
-        event_data = NewEventHook.model_validate(meeting, by_alias=True).model_dump(
-            mode="json", include=["start_time", "end_time"]
-        )
-        event_data["employee_id"] = user_id
-        return await self.calendar_client.has_events_in_period(event_data)
+    async def get_busy_employees(self, meeting: Meeting | MeetingCreate, user_ids: list[int]) -> set[int]:
+        """Сотрудники, у которых есть события на время встречи, одним запросом в Calendar Service"""
+        busy = await self.calendar_client.get_free_busy(user_ids, meeting.start_time, meeting.end_time)
+        return {user_id for user_id, intervals in busy.items() if intervals}
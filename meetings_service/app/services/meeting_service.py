@@ -1,5 +1,8 @@
 from fastapi import HTTPException, status
 
+from app.clients.team_client import TeamServiceClient
+from app.models.meeting import Meeting
+from app.schemas.meeting import MeetingCreate
 from app.services.base_meeting_service import BaseMeetingService
 from app.services.event_mixin import EventMixin
 
@@ -7,10 +10,38 @@ from app.services.event_mixin import EventMixin
 class MeetingService(BaseMeetingService, EventMixin):
     """Сервис для управления встречами"""
 
+    team_client = TeamServiceClient()
+
+    async def check_participants(self, meeting: Meeting | MeetingCreate, participant_ids: list[int]) -> None:
+        """
+        Проверка участников встречи: участие в команде встречи и отсутствие событий на время встречи.
+        Каждая проверка выполняется одним запросом для всех участников
+        """
+        members = await self.team_client.get_employees_batch(meeting.team_id, participant_ids)
+        outsiders = set(participant_ids) - {member["employee_id"] for member in members}
+        if outsiders:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Пользователи не состоят в команде: {sorted(outsiders)}",
+            )
+        busy = await self.get_busy_employees(meeting, participant_ids)
+        if busy:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"У пользователей назначены события на это время: {sorted(busy)}",
+            )
+
     async def create_meeting(self, user, new_data):
-        """Создание встречи с добавлением создания события в Calendar Service"""
+        """Создание встречи с участниками и добавлением создания событий в Calendar Service"""
+        participant_ids = list(dict.fromkeys(participant.participant_id for participant in new_data.participants))
+        if participant_ids:
+            await self.check_participants(new_data, participant_ids)
         meeting = await super().create_meeting(user, new_data)
         await self.create_event(meeting, user.id)
+        if participant_ids:
+            await super().add_participants(meeting.id, participant_ids, user)
+            for participant_id in participant_ids:
+                await self.create_event(meeting, participant_id)
         return meeting
 
     async def delete_meeting(self, user, meeting_id):
@@ -18,18 +49,18 @@ class MeetingService(BaseMeetingService, EventMixin):
         meeting = await super().delete_meeting(user, meeting_id)
         await self.delete_event(meeting, user.id)
 
-    async def add_participant(self, meeting_id, participant, user):
+    async def add_participants(self, meeting_id, participant_ids, user):
         """
-        Добавление участника ко встречи с созданием события для участника в Calendar Service
-        и проверкой наличия события
+        Добавление участников ко встрече с созданием событий для участников в Calendar Service,
+        проверкой участия в команде встречи и наличия событий
         """
-        meeting = await self.repo.get(meeting_id)
-        if await self.has_events_in_period(meeting, participant.participant_id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="У пользователя назначено событие на это время"
-            )
-        await self.create_event(meeting, participant.participant_id)
-        return await super().add_participant(meeting_id, participant, user)
+        meeting = await self._get_meeting_or_404(meeting_id, user.id)
+        participant_ids = list(dict.fromkeys(participant_ids))
+        await self.check_participants(meeting, participant_ids)
+        meeting = await super().add_participants(meeting_id, participant_ids, user)
+        for participant_id in participant_ids:
+            await self.create_event(meeting, participant_id)
+        return meeting
 
     async def delete_participant(self, meeting_id, participant_id, user):
         """Удаление участника из встречи с удалением события из Calendar Service"""
@@ -1,25 +1,32 @@
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 from app.schemas.team_response import TeamEmployeeResponse, TeamResponse
 
 TEAM_BASE_URL: str = settings.get_team_service__url()
+inflight = SingleFlight()
 
 
 class TeamServiceClient:
     """Клиент для взаимодействия с Team Service"""
 
-    def __init__(self, base_url: str = TEAM_BASE_URL):
+    def __init__(self, base_url: str = TEAM_BASE_URL, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
-        self._timeout = httpx.Timeout(10.0, connect=5.0)
+        self.http_client = http_client
 
     async def _get(self, url: str) -> dict | None:
+        """GET-запрос в Team Service, одновременные одинаковые запросы объединяются"""
+        return await inflight.do(url, lambda: self._fetch(url))
+
+    async def _fetch(self, url: str) -> dict | None:
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(f"{self.base_url}{url}")
-                response.raise_for_status()
-                return response.json()
+            client = self.http_client or http_clients.get("team")
+            response = await client.get(f"{self.base_url}{url}")
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             if e.response.status_code == status.HTTP_404_NOT_FOUND:
                 return None
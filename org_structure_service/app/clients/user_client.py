@@ -1,21 +1,28 @@
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.cache import TTLCache, token_key, token_ttl
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL)
+inflight = SingleFlight()
+
 
 class AuthClient:
     """Клиент для запросов на User Service для аутентификации"""
 
-    def __init__(self, base_url: str = settings.get_user_url()):
+    def __init__(self, base_url: str = settings.get_user_url(), http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
 
     async def _request(self, method: str, url: str, **kwargs) -> dict:
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0)) as client:
-                response = await client.request(method, url, **kwargs)
-                response.raise_for_status()
-                return response.json()
+            client = self.http_client or http_clients.get("user")
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             if method == "GET" and "/verify" in url:
                 raise HTTPException(status_code=e.response.status_code, detail="Invalid token or user") from e
@@ -32,6 +39,19 @@ class AuthClient:
         )
         return response["access_token"]
 
-    async def verify_token(self, token: str) -> dict:
-        """Верификация токена"""
-        return await self._request("GET", f"{self.base_url}/auth/verify", headers={"Authorization": f"Bearer {token}"})
+    async def verify_token(self, token: str, cached: bool = True) -> dict:
+        """
+        Верификация токена с кэшированием успешного результата до истечения TTL или срока действия токена.
+        С cached=False кэш не читается и токен всегда проверяется в User Service
+        """
+        key = token_key(token)
+        user = token_cache.get(key) if cached else None
+        if user is None:
+            user = await inflight.do(
+                key,
+                lambda: self._request(
+                    "GET", f"{self.base_url}/auth/verify", headers={"Authorization": f"Bearer {token}"}
+                ),
+            )
+            token_cache.set(key, user, token_ttl(token))
+        return user
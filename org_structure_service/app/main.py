@@ -1,16 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.clients.http import http_clients
 from app.routers.departments import router as department_router
 from app.routers.divisions import router as division_router
 from app.routers.employees import router as employee_router
 from app.routers.structures import router as structure_router
+from app.routers.token_cache import router as token_cache_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Открытие HTTP-клиентов для других сервисов"""
+    http_clients.open("user", "team")
+    yield
+    await http_clients.close()
+
 
-app = FastAPI(root_path="/org")
+app = FastAPI(root_path="/org", lifespan=lifespan)
 
 app.include_router(structure_router, prefix="/teams", tags=["teams"])
 app.include_router(division_router, prefix="/teams", tags=["divisions"])
 app.include_router(department_router, prefix="/teams", tags=["departments"])
 app.include_router(employee_router, prefix="/departments", tags=["employees"])
+app.include_router(token_cache_router, tags=["token cache"])
 
 
 if __name__ == "__main__":
@@ -4,11 +4,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.clients.user_client import AuthClient
 from app.config import settings
 from app.database import get_session
 from app.repositories.department_repo import DepartmentRepository
-from app.schemas.users import EmployeeRole, User
+from app.schemas.users import EmployeeRole, Status, User
+from app.security import TokenVerifier, token_verifier
 from app.services.department_service import DepartmentService
 from app.services.division_service import DivisionService
 from app.services.employee_service import EmployeeService
@@ -45,12 +45,15 @@ async def employee_service(session: Annotated[AsyncSession, Depends(get_session)
 EmployeeServiceDeps = Annotated[EmployeeService, Depends(employee_service)]
 
 
-AuthClientDeps = Annotated[AuthClient, Depends(lambda: AuthClient())]
+TokenVerifierDeps = Annotated[TokenVerifier, Depends(lambda: token_verifier)]
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_client: AuthClientDeps) -> User:
-    """Проверяет токен через User Service, возвращает данные (id, email, is_active, status, team_id, team_role)."""
-    user_data = await user_client.verify_token(token)
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], verifier: TokenVerifierDeps) -> User:
+    """
+    Проверяет токен по публичным ключам User Service (в строгом режиме - и через User Service),
+    возвращает данные (id, email, is_active, status, team_id, team_role).
+    """
+    user_data = await verifier.verify(token)
     if not user_data["is_active"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
     return User.model_validate(user_data)
@@ -59,6 +62,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_c
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def require_system_admin(user: CurrentUser) -> None:
+    """Пользователь с доступом администратора системы"""
+    if user.status != Status.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не достаточно прав")
+
+
+SystemAdminDeps = Depends(require_system_admin)
+
+
 async def require_admin(user: CurrentUser) -> User:
     """
     Разрешает действия только администраторам команды"""
@@ -0,0 +1,123 @@
+import asyncio
+import re
+import time
+
+import httpx
+from fastapi import HTTPException, status
+from jose import ExpiredSignatureError, JWTError, jwt
+
+from app.clients.http import http_clients
+from app.clients.user_client import AuthClient
+from app.config import settings
+from app.logging_config import logger
+
+TOKEN_ALGORITHMS = ["RS256"]
+JWKS_URL = f"{settings.get_user_url()}/auth/.well-known/jwks.json"
+# Минимальный интервал между запросами JWKS при неизвестном kid или недоступном User Service
+JWKS_MIN_REFRESH_INTERVAL = 30
+REQUIRED_CLAIMS = ("sub", "email", "status", "team_id", "role")
+
+
+class TokenVerifier:
+    """
+    Верификация JWT-токенов по публичным ключам User Service (JWKS).
+
+    Подпись и срок действия токена проверяются локально, без запроса на /auth/verify.
+    Если проверить токен локально невозможно (ключи недоступны, токен подписан старым
+    симметричным ключом или в нем нет нужных claims), выполняется запрос на User Service.
+    В строгом режиме после локальной проверки токен дополнительно проверяется в User Service без кэша,
+    чтобы учитывать деактивацию пользователей до истечения срока действия токена.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str = JWKS_URL,
+        jwks_ttl: int = settings.JWKS_CACHE_TTL,
+        local: bool = settings.LOCAL_TOKEN_VERIFICATION,
+        strict: bool = settings.STRICT_TOKEN_VERIFICATION,
+    ):
+        self.jwks_url = jwks_url
+        self.jwks_ttl = jwks_ttl
+        self.local = local
+        self.strict = strict
+        self.user_client = AuthClient()
+
+        self._keys: dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._last_fetch = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> dict:
+        """Верификация токена, возвращает данные пользователя в формате ответа /auth/verify"""
+        claims = await self._decode(token) if self.local else None
+        if claims is None or self.strict:
+            return await self.user_client.verify_token(token, cached=not self.strict)
+        return {
+            "id": int(claims["sub"]),
+            "email": claims["email"],
+            "status": claims["status"],
+            "is_active": True,
+            "team_id": claims["team_id"],
+            "role": claims["role"],
+        }
+
+    async def _decode(self, token: str) -> dict | None:
+        """Локальная проверка подписи и срока действия токена"""
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise self._credentials_exception() from e
+        if header.get("alg") not in TOKEN_ALGORITHMS or not header.get("kid"):
+            return None
+        key = await self._get_key(header["kid"])
+        if key is None:
+            return None
+        try:
+            claims = jwt.decode(token, key, algorithms=TOKEN_ALGORITHMS)
+        except ExpiredSignatureError as e:
+            raise self._credentials_exception("Token has expired") from e
+        except JWTError as e:
+            raise self._credentials_exception() from e
+        if any(claims.get(claim) is None for claim in REQUIRED_CLAIMS):
+            return None
+        return claims
+
+    async def _get_key(self, kid: str) -> dict | None:
+        """Получение публичного ключа по kid с обновлением JWKS при необходимости"""
+        now = time.monotonic()
+        if kid in self._keys and now < self._expires_at:
+            return self._keys[kid]
+        async with self._lock:
+            now = time.monotonic()
+            stale = now >= self._expires_at
+            if (stale or kid not in self._keys) and now - self._last_fetch >= JWKS_MIN_REFRESH_INTERVAL:
+                await self._refresh_keys()
+        return self._keys.get(kid)
+
+    async def _refresh_keys(self) -> None:
+        """Загрузка JWKS из User Service. При ошибке продолжаем использовать ранее полученные ключи"""
+        self._last_fetch = time.monotonic()
+        try:
+            response = await http_clients.get("user").get(self.jwks_url, timeout=httpx.Timeout(5.0, connect=2.0))
+            response.raise_for_status()
+            jwks = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Не удалось получить JWKS из User Service: {e}")
+            return
+        self._keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+        self._expires_at = self._last_fetch + self._max_age(response.headers.get("Cache-Control"))
+        logger.info(f"Получены публичные ключи User Service: {list(self._keys)}")
+
+    def _max_age(self, cache_control: str | None) -> int:
+        """TTL ключей из заголовка Cache-Control, иначе значение из настроек"""
+        match = re.search(r"max-age=(\d+)", cache_control or "")
+        return int(match.group(1)) if match else self.jwks_ttl
+
+    @staticmethod
+    def _credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+token_verifier = TokenVerifier()
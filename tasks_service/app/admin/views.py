@@ -1,22 +1,24 @@
 from fastapi import HTTPException, status
 from sqladmin import ModelView
 
-from app.clients.team_client import TeamServiceClient
+from app.database import SessionLocal
 from app.models.task_evaluation import TaskEvaluation
 from app.models.tasks import Task
 from app.services.event_mixin import EventMixin
+from app.services.team_membership_service import TeamMembershipService
 
 
 class BaseTaskAdmin(ModelView, model=Task):
     """Базовое представление для модели Task"""
 
-    team_client = TeamServiceClient()
-
     column_list = [Task.id, Task.title]
     form_excluded_columns = [Task.created_at, Task.updated_at, "task_evaluations"]
 
     async def on_model_change(self, data, model, is_created, request) -> None:
-        assignee_membership = await self.team_client.get_employee(data["team_id"], data["assignee_id"])
+        async with SessionLocal() as session:
+            membership_service = TeamMembershipService(session)
+            assignee_membership = await membership_service.get_employee(data["team_id"], data["assignee_id"])
+            await session.commit()
         if not assignee_membership:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Исполнитель не является членом команды"
@@ -1,6 +1,7 @@
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.http import http_clients
 from app.config import settings
 from app.logging_config import logger
 
@@ -10,16 +11,17 @@ BASE_ORG_URL = settings.get_org_url()
 class OrgServiceClient:
     """Клиент для запросов на Org Structure Service"""
 
-    def __init__(self, base_url: str = BASE_ORG_URL):
+    def __init__(self, base_url: str = BASE_ORG_URL, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
 
     async def get_membership(self, employee_id: int) -> dict:
         """Получение всех коллег работника по департаменту"""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0)) as client:
-                response = await client.get(f"{self.base_url}/departments/{employee_id}/department_members")
-                response.raise_for_status()
-                return response.json()
+            client = self.http_client or http_clients.get("org")
+            response = await client.get(f"{self.base_url}/departments/{employee_id}/department_members")
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.info(f"Ошибка при запросе на {e.request.url}: {e}")
             if e.response.status_code == status.HTTP_404_NOT_FOUND:
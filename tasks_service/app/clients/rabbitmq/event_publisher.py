@@ -1,4 +1,5 @@
 import json
+from datetime import datetime, timezone
 
 import aio_pika
 
@@ -48,7 +49,11 @@ class EventPublisher:
 
         Args:
             event (dict): Событие для отправки. Ожидается структура с полями 'type' и 'payload'.
+
+        Время публикации передается в payload.sent_at: по нему получатель отбрасывает изменения,
+        пришедшие позже более новых (например, после повторной обработки).
         """
+        event = {**event, "payload": {**event["payload"], "sent_at": datetime.now(timezone.utc).isoformat()}}
         message = aio_pika.Message(body=json.dumps(event).encode(), delivery_mode=aio_pika.DeliveryMode.PERSISTENT)
         await self.exchange.publish(message, routing_key="")
         logger.info(f"Опубликованное событие {event['type']} для задачи {event['payload']['source_id']}")
@@ -1,25 +1,34 @@
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 from app.logging_config import logger
 
 BASE_TEAM_URL = settings.get_team_url()
+inflight = SingleFlight()
 
 
 class TeamServiceClient:
     """Клиент для взаимодействия с сервисом Team Service"""
 
-    def __init__(self, base_url: str = BASE_TEAM_URL):
+    def __init__(self, base_url: str = BASE_TEAM_URL, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
 
     async def get_employee(self, team_id: int, user_id: int) -> dict:
-        """Получение работника из Team Service"""
+        """Получение работника из Team Service, одновременные одинаковые запросы объединяются"""
+        url = f"{self.base_url}/teams/{team_id}/employees/{user_id}"
+        return await inflight.do(url, lambda: self._get_employee(team_id, user_id))
+
+    async def _get_employee(self, team_id: int, user_id: int) -> dict:
+        """Запрос работника в Team Service"""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0)) as client:
-                response = await client.get(f"{self.base_url}/teams/{team_id}/employees/{user_id}")
-                response.raise_for_status()
-                return response.json()
+            client = self.http_client or http_clients.get("team")
+            response = await client.get(f"{self.base_url}/teams/{team_id}/employees/{user_id}")
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.info(f"Ошибка при запросе на {e.request.url}: {e}")
             if e.response.status_code == status.HTTP_404_NOT_FOUND:
@@ -35,3 +44,14 @@ class TeamServiceClient:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Сервис Team service не доступен"
             ) from e
+
+    async def get_memberships(self, after_id: int = 0, limit: int = 1000) -> list[dict]:
+        """Получение порции участников всех команд из Team Service для синхронизации"""
+        client = self.http_client or http_clients.get("team")
+        response = await client.get(
+            f"{self.base_url}/webhook/memberships/",
+            params={"after_id": after_id, "limit": limit},
+            headers={"X-API-KEY": settings.TEAM_API_KEY},
+        )
+        response.raise_for_status()
+        return response.json()
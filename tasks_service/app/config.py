@@ -12,6 +12,7 @@ class Setting(BaseSettings):
     USER_HOST: str
     USER_PORT: str
     URL_TOKEN: str
+    TEAM_API_KEY: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
@@ -20,6 +21,18 @@ class Setting(BaseSettings):
 
     RABBITMQ_URL: str
 
+    LOCAL_TOKEN_VERIFICATION: bool = True
+    STRICT_TOKEN_VERIFICATION: bool = False
+    JWKS_CACHE_TTL: int = 300
+
+    TOKEN_CACHE_TTL: int = 30
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+    MEMBERSHIP_SYNC_PAGE_SIZE: int = 1000
+
     LOG_DIR: Path = Path(__file__).parent.parent / "logs"
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import aio_pika
+from pydantic import ValidationError
+
+from app.config import settings
+from app.database import SessionLocal
+from app.logging_config import logger
+from app.schemas.membership_events import MembershipEvent, MembershipEventType
+from app.services.team_membership_service import TeamMembershipService
+
+# Пауза перед повторным подключением или синхронизацией, если брокер или Team Service недоступны (сек)
+RETRY_DELAY = 5
+
+
+class MembershipEventConsumer:
+    """
+    Консьюмер событий изменения состава команд из Team Service.
+
+    События применяются к локальной копии состава команд. Очередь именованная и durable:
+    события, опубликованные пока сервис остановлен, будут обработаны после запуска,
+    а несколько экземпляров сервиса разбирают одну очередь.
+    """
+
+    def __init__(
+        self,
+        exchange_name: str = "team_membership",
+        queue_name: str = "tasks_service.team_membership",
+        rabbitmq_url: str = settings.RABBITMQ_URL,
+    ):
+        self.rabbitmq_url = rabbitmq_url
+        self.exchange_name = exchange_name
+        self.queue_name = queue_name
+        self.connection: aio_pika.abc.AbstractRobustConnection | None = None
+
+    async def start_consumer(self) -> None:
+        """Подключение к брокеру и запуск консьюмера"""
+        while self.connection is None:
+            try:
+                self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
+            except (aio_pika.exceptions.AMQPError, OSError) as e:
+                logger.warning(f"Брокер сообщений недоступен, повторное подключение через {RETRY_DELAY} сек: {e}")
+                await asyncio.sleep(RETRY_DELAY)
+        logger.info("Открыто соединение с брокером")
+        try:
+            channel = await self.connection.channel()
+            exchange = await channel.declare_exchange(self.exchange_name, aio_pika.ExchangeType.FANOUT)
+            queue = await channel.declare_queue(self.queue_name, durable=True)
+            await queue.bind(exchange)
+            await queue.consume(self.handle_event)
+            logger.info("[Tasks Service] Waiting for team membership events...")
+            await asyncio.Future()
+        finally:
+            await self.connection.close()
+            logger.info("Соединение с брокером закрыто")
+
+    async def handle_event(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        """Обработчик событий, при ошибке сохранения событие возвращается в очередь"""
+        async with message.process(requeue=True):
+            try:
+                data = json.loads(message.body)
+                event_id = int(data["id"])
+                event_type = MembershipEventType(data["type"])
+                event = MembershipEvent.model_validate(data["payload"])
+            except (KeyError, TypeError, ValueError, ValidationError) as e:
+                logger.error(f"Некорректное событие изменения состава команды: {e}")
+                return
+            async with SessionLocal() as session:
+                await TeamMembershipService(session).apply_event(event_id, event_type, event)
+            logger.info(
+                f"Применено событие {event_type.value} для работника {event.employee_id} в команде {event.team_id}"
+            )
+
+
+async def sync_team_memberships() -> None:
+    """Начальная синхронизация состава команд, повторяется, пока Team Service недоступен"""
+    while True:
+        try:
+            async with SessionLocal() as session:
+                await TeamMembershipService(session).sync()
+            return
+        except Exception as e:
+            logger.warning(f"Не удалось синхронизировать состав команд, повтор через {RETRY_DELAY} сек: {e}")
+            await asyncio.sleep(RETRY_DELAY)
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -5,19 +6,36 @@ from sqladmin import Admin
 
 from app.admin.authentication import authentication_backend
 from app.admin.views import TaskAdmin, TaskEvaluationAdmin
+from app.clients.http import http_clients
 from app.clients.rabbitmq.event_publisher import EventPublisher
 from app.database import SessionLocal
+from app.events.membership_consumer import MembershipEventConsumer, sync_team_memberships
+from app.logging_config import logger
 from app.routers.comments import router as comment_router
 from app.routers.task_evaluation import router as task_evaluation_router
 from app.routers.tasks import router as task_router
+from app.routers.token_cache import router as token_cache_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Подключение клиента для брокера сообщений RabbitMQ"""
+    """
+    Подключение клиента для брокера сообщений RabbitMQ и HTTP-клиентов для других сервисов,
+    запуск синхронизации состава команд и консьюмера событий изменения состава команд
+    """
     app.rqm_producer = EventPublisher("calendar_events")
     await app.rqm_producer.start_connection()
+    http_clients.open("user", "team", "org")
+    tasks = [
+        asyncio.create_task(MembershipEventConsumer().start_consumer()),
+        asyncio.create_task(sync_team_memberships()),
+    ]
     yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    logger.info("Фоновые задачи состава команд остановлены")
+    await http_clients.close()
     await app.rqm_producer.disconnect()
 
 
@@ -27,6 +45,7 @@ app = FastAPI(root_path="/tasks-service", lifespan=lifespan)
 app.include_router(task_router, prefix="/tasks", tags=["tasks"])
 app.include_router(comment_router, prefix="/tasks", tags=["comments"])
 app.include_router(task_evaluation_router, prefix="/tasks", tags=["task evaluation"])
+app.include_router(token_cache_router, tags=["token cache"])
 
 admin = Admin(app, session_maker=SessionLocal, authentication_backend=authentication_backend)
 admin.add_view(TaskAdmin)
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 import app.models.comments  # noqa: F401 загружаем модели для Alembic
 import app.models.task_evaluation  # noqa: F401 загружаем модели для Alembic
 import app.models.tasks  # noqa: F401 загружаем модели для Alembic
+import app.models.team_membership  # noqa: F401 загружаем модели для Alembic
 from app.database import DATABASE_URL, Base
 
 logger = logging.getLogger("alembic.env")
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Enum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.tasks import EmployeeRole
+
+
+class TeamMembership(Base):
+    """
+    Локальная копия состава команд из Team Service.
+
+    Заполняется синхронизацией при старте сервиса и обновляется событиями Team Service.
+    Удаленный из команды работник хранится с is_member=False, чтобы запоздавшее событие
+    с меньшим event_id не вернуло его в команду.
+    """
+
+    __tablename__ = "team_membership"
+
+    team_id: Mapped[int] = mapped_column(primary_key=True)
+    employee_id: Mapped[int] = mapped_column(primary_key=True)
+    role: Mapped[EmployeeRole | None] = mapped_column(Enum(EmployeeRole, native_enum=False), nullable=True)
+    is_member: Mapped[bool] = mapped_column(default=True)
+    # id последнего примененного события Team Service, 0 - запись получена синхронизацией
+    event_id: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"TeamMembership(team_id={self.team_id}, employee_id={self.employee_id}, is_member={self.is_member})"
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.tasks import EmployeeRole
+from app.models.team_membership import TeamMembership
+from app.repositories.base_repository import BaseRepository
+
+
+class TeamMembershipRepository(BaseRepository):
+    """Репозиторий локальной копии состава команд"""
+
+    model: type[TeamMembership] = TeamMembership
+
+    async def get_membership(self, team_id: int, employee_id: int) -> TeamMembership | None:
+        """Получение записи о работнике команды"""
+        stmt = select(self.model).where(self.model.team_id == team_id, self.model.employee_id == employee_id)
+        return await self.session.scalar(stmt)
+
+    async def apply_event(
+        self, team_id: int, employee_id: int, role: EmployeeRole | None, is_member: bool, event_id: int
+    ) -> None:
+        """Применение события Team Service, события старше уже примененного игнорируются"""
+        stmt = insert(self.model).values(
+            team_id=team_id,
+            employee_id=employee_id,
+            role=role,
+            is_member=is_member,
+            event_id=event_id,
+            updated_at=datetime.now(timezone.utc),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.team_id, self.model.employee_id],
+            set_={
+                "role": stmt.excluded.role,
+                "is_member": stmt.excluded.is_member,
+                "event_id": stmt.excluded.event_id,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            where=self.model.event_id < stmt.excluded.event_id,
+        )
+        await self.session.execute(stmt)
+
+    async def add_synced(self, memberships: list[dict], synced_at: datetime) -> None:
+        """
+        Сохранение участников команд, полученных из Team Service.
+        Записи, уже обновленные событиями, не перезаписываются: события новее снимка.
+        """
+        if not memberships:
+            return
+        stmt = insert(self.model).values(
+            [
+                {
+                    "team_id": membership["team_id"],
+                    "employee_id": membership["employee_id"],
+                    "role": membership["role"],
+                    "is_member": True,
+                    "event_id": 0,
+                    "updated_at": synced_at,
+                }
+                for membership in memberships
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.team_id, self.model.employee_id],
+            set_={"role": stmt.excluded.role, "is_member": True, "updated_at": stmt.excluded.updated_at},
+            where=self.model.event_id == 0,
+        )
+        await self.session.execute(stmt)
+
+    async def delete_stale_synced(self, synced_at: datetime) -> None:
+        """Удаление полученных синхронизацией записей, которых нет в последнем снимке"""
+        stmt = delete(self.model).where(self.model.event_id == 0, self.model.updated_at < synced_at)
+        await self.session.execute(stmt)
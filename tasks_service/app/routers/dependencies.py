@@ -6,11 +6,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.clients.rabbitmq.event_publisher import EventPublisher
-from app.clients.user_client import UserServiceClient
 from app.config import settings
 from app.database import get_session
 from app.models.tasks import Task
-from app.schemas.users import EmployeeRole, User
+from app.schemas.users import EmployeeRole, Status, User
+from app.security import TokenVerifier, token_verifier
 from app.services.comment_service import CommentService
 from app.services.task_evaluation_service import TaskEvaluationService
 from app.services.task_service import TaskService
@@ -50,12 +50,15 @@ async def evaluation_service(session: Annotated[AsyncSession, Depends(get_sessio
 
 TaskEvaluationServiceDeps = Annotated[TaskEvaluationService, Depends(evaluation_service)]
 
-UserClientDeps = Annotated[UserServiceClient, Depends(lambda: UserServiceClient())]
+TokenVerifierDeps = Annotated[TokenVerifier, Depends(lambda: token_verifier)]
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_client: UserClientDeps) -> User:
-    """Проверяет токен через User Service, возвращает данные (id, status, is_active, team_id, team_role)."""
-    user_data = await user_client.verify_token(token)
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], verifier: TokenVerifierDeps) -> User:
+    """
+    Проверяет токен по публичным ключам User Service (в строгом режиме - и через User Service),
+    возвращает данные (id, status, is_active, team_id, team_role).
+    """
+    user_data = await verifier.verify(token)
     if not user_data["is_active"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
     return User.model_validate(user_data)
@@ -64,6 +67,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_c
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def require_system_admin(user: CurrentUser) -> None:
+    """Пользователь с доступом администратора системы"""
+    if user.status != Status.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не достаточно прав")
+
+
+SystemAdminDeps = Depends(require_system_admin)
+
+
 async def require_manager_or_admin(user: Annotated[User, Depends(get_current_user)]) -> User:
     """
     Разрешает действия только админам руководителям команды (role="менеджер", "админ")"""
@@ -1,12 +1,12 @@
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.clients.team_client import TeamServiceClient
 from app.logging_config import logger
 from app.models.tasks import Task, TaskStatus
 from app.repositories.task_repo import TaskRepository
 from app.schemas.tasks import TaskCreate, TaskUpdate
 from app.schemas.users import User
+from app.services.team_membership_service import TeamMembershipService
 
 
 class BaseTaskService:
@@ -16,7 +16,7 @@ class BaseTaskService:
         super().__init__(**kwargs)
         self.session = session
         self.repo = TaskRepository(session)
-        self.team_client = TeamServiceClient()
+        self.membership_service = TeamMembershipService(session)
 
     async def _get_task_or_404(self, task_id: int) -> Task:
         """Получение объекта Task или выброс исключения 404"""
@@ -37,7 +37,7 @@ class BaseTaskService:
     async def create_task(self, user: User, task_data: TaskCreate) -> Task:
         """Создание задачи"""
         # Проверяем принадлежность исполнителя к команде
-        assignee_membership = await self.team_client.get_employee(task_data.team_id, task_data.assignee_id)
+        assignee_membership = await self.membership_service.get_employee(task_data.team_id, task_data.assignee_id)
         if not assignee_membership:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Исполнитель не является членом команды"
@@ -51,7 +51,7 @@ class BaseTaskService:
         """Обновление задачи"""
         task = await self._get_task_or_404(task_id)
         if update_data.assignee_id:
-            membership = await self.team_client.get_employee(task.team_id, update_data.assignee_id)
+            membership = await self.membership_service.get_employee(task.team_id, update_data.assignee_id)
             if not membership:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Новый исполнитель не является членом команды"
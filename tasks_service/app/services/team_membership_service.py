@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.team_client import TeamServiceClient
+from app.config import settings
+from app.logging_config import logger
+from app.repositories.team_membership_repo import TeamMembershipRepository
+from app.schemas.membership_events import MembershipEvent, MembershipEventType
+
+
+class TeamMembershipService:
+    """Проверка принадлежности работников к командам по локальной копии состава команд"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = TeamMembershipRepository(session)
+        self.team_client = TeamServiceClient()
+
+    async def get_employee(self, team_id: int, employee_id: int) -> dict:
+        """
+        Получение работника команды.
+        Если записи о работнике в локальной копии нет (например, синхронизация еще не выполнена),
+        работник запрашивается в Team Service и сохраняется локально.
+        """
+        membership = await self.repo.get_membership(team_id, employee_id)
+        if membership is None:
+            employee = await self.team_client.get_employee(team_id, employee_id)
+            await self.repo.add_synced([employee], datetime.now(timezone.utc))
+            return employee
+        if not membership.is_member:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Работник с {employee_id} не существует")
+        return {"employee_id": membership.employee_id, "team_id": membership.team_id, "role": membership.role}
+
+    async def apply_event(self, event_id: int, event_type: MembershipEventType, event: MembershipEvent) -> None:
+        """Применение события изменения состава команды из Team Service"""
+        await self.repo.apply_event(
+            team_id=event.team_id,
+            employee_id=event.employee_id,
+            role=event.role,
+            is_member=event_type != MembershipEventType.REMOVED,
+            event_id=event_id,
+        )
+        await self.session.commit()
+
+    async def sync(self, page_size: int = settings.MEMBERSHIP_SYNC_PAGE_SIZE) -> int:
+        """Полная синхронизация состава команд с Team Service, возвращает количество записей"""
+        synced_at = datetime.now(timezone.utc)
+        after_id, total = 0, 0
+        while True:
+            memberships = await self.team_client.get_memberships(after_id, page_size)
+            await self.repo.add_synced(memberships, synced_at)
+            total += len(memberships)
+            if len(memberships) < page_size:
+                break
+            after_id = memberships[-1]["id"]
+        await self.repo.delete_stale_synced(synced_at)
+        await self.session.commit()
+        logger.info(f"Синхронизирован состав команд из Team Service: {total} записей")
+        return total
@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    In-memory кэш с ограничением размера (LRU) и временем жизни записей.
+
+    Атрибуты:
+        maxsize (int): Максимальное количество записей, при превышении вытесняются давно не использованные.
+        ttl (float): Время жизни записи по умолчанию в секундах.
+        hits (int): Количество попаданий в кэш.
+        misses (int): Количество промахов кэша.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Получение значения из кэша"""
+        item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Сохранение значения, время жизни не больше ttl по умолчанию"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Удаление значения из кэша"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистка кэша"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Статистика использования кэша"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+def token_key(token: str) -> str:
+    """Ключ кэша для токена: в памяти храним хеш, а не сам токен"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_ttl(token: str) -> float | None:
+    """Оставшееся время жизни токена по claim exp (без проверки подписи)"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - time.time()
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
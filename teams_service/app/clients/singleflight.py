@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых запросов.
+
+    Пока запрос с ключом key выполняется, остальные вызовы с тем же ключом не отправляют свой запрос,
+    а ожидают результат уже выполняющегося. Результат или исключение получают все ожидающие.
+    После завершения запроса ключ освобождается, результат не кэшируется.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Выполнение func или ожидание результата уже выполняющегося вызова с тем же ключом"""
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # shield: отмена одного ожидающего не должна отменять запрос для остальных
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Помечаем исключение полученным, даже если все ожидающие были отменены
+            future.exception()
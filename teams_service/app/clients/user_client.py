@@ -1,30 +1,35 @@
 import httpx
 from fastapi import HTTPException, status
 
+from app.clients.cache import TTLCache, token_key, token_ttl
+from app.clients.http import http_clients
+from app.clients.singleflight import SingleFlight
 from app.config import settings
 from app.logging_config import logger
 from app.schemas.employees import UserResponse
 
 BASE_URL_USER_SERVICE = settings.get_user_url()
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL)
+inflight = SingleFlight()
 
 
 class UserServiceClient:
     """Клиент для запросов к user service"""
 
-    def __init__(self, base_url: str = BASE_URL_USER_SERVICE):
+    def __init__(self, base_url: str = BASE_URL_USER_SERVICE, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
-        self.timeout = httpx.Timeout(10.0, connect=5.0)
+        self.http_client = http_client
 
     async def _request(self, method: str, endpoint: str, *, json=None) -> dict:
         url = f"{self.base_url}{endpoint}"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(method, url, json=json)
-                response.raise_for_status()
-                if response.content:
-                    return response.json()
-                return {}
+            client = self.http_client or http_clients.get("user")
+            response = await client.request(method, url, json=json)
+            response.raise_for_status()
+            if response.content:
+                return response.json()
+            return {}
         except httpx.HTTPStatusError as e:
             logger.error(f"Ошибка при запросе {e.request.url}: {e}")
             status_code = e.response.status_code
@@ -59,15 +64,16 @@ class UserServiceClient:
 class AuthClient:
     """Клиент для запросов на User Service для аутентификации"""
 
-    def __init__(self, base_url: str = BASE_URL_USER_SERVICE):
+    def __init__(self, base_url: str = BASE_URL_USER_SERVICE, http_client: httpx.AsyncClient | None = None):
         self.base_url = base_url
+        self.http_client = http_client
 
     async def _request(self, method: str, url: str, **kwargs) -> dict | None:
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0)) as client:
-                response = await client.request(method, url, **kwargs)
-                response.raise_for_status()
-                return response.json()
+            client = self.http_client or http_clients.get("user")
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"Ошибка при запросе {e.request.url}: {e}")
             if method == "GET" and "/verify" in url:
@@ -87,5 +93,15 @@ class AuthClient:
         return response["access_token"]
 
     async def verify_token(self, token: str) -> dict:
-        """Верификация токена"""
-        return await self._request("GET", f"{self.base_url}/auth/verify", headers={"Authorization": f"Bearer {token}"})
+        """Верификация токена с кэшированием успешного результата до истечения TTL или срока действия токена"""
+        key = token_key(token)
+        user = token_cache.get(key)
+        if user is None:
+            user = await inflight.do(
+                key,
+                lambda: self._request(
+                    "GET", f"{self.base_url}/auth/verify", headers={"Authorization": f"Bearer {token}"}
+                ),
+            )
+            token_cache.set(key, user, token_ttl(token))
+        return user
@@ -8,7 +8,19 @@ class Setting(BaseSettings):
     USER_HOST: str
     USER_PORT: str
     USER_API_KEY: str
+    TASK_API_KEY: str
+    MEETING_API_KEY: str
     URL_TOKEN: str
+    RABBITMQ_URL: str
+
+    TOKEN_CACHE_TTL: int = 30
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 5.0
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
@@ -0,0 +1,77 @@
+import asyncio
+
+from app.clients.rabbitmq.event_publisher import EventPublisher
+from app.config import settings
+from app.database import SessionLocal
+from app.logging_config import logger
+from app.repositories.outbox_repo import MembershipOutboxRepository
+
+
+class OutboxRelay:
+    """
+    Публикация событий изменения состава команд из outbox в RabbitMQ.
+
+    Событие попадает в outbox в одной транзакции с изменением, поэтому публикуется
+    только после успешного коммита и не теряется, если брокер недоступен.
+    После коммита сервисы будят relay через notify, дополнительно outbox периодически
+    проверяется на случай записей, сделанных другими экземплярами сервиса.
+    Доставка at-least-once: потребители должны быть идемпотентны, id события монотонно растет.
+    """
+
+    def __init__(
+        self,
+        exchange_name: str = "team_membership",
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+    ):
+        self.publisher = EventPublisher(exchange_name)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """Сигнал о новых событиях в outbox"""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Цикл публикации событий"""
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    published = await self.publish_pending()
+                except Exception as e:
+                    logger.error("Ошибка при публикации событий изменения состава команд", exc_info=e)
+                    published = 0
+                if published < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.publisher.disconnect()
+
+    async def publish_pending(self) -> int:
+        """Публикация очередной порции событий, возвращает количество опубликованных"""
+        async with SessionLocal() as session:
+            repo = MembershipOutboxRepository(session)
+            events = await repo.get_pending(self.batch_size)
+            if not events:
+                return 0
+            if self.publisher.exchange is None:
+                await self.publisher.start_connection()
+            for event in events:
+                await self.publisher.publish(
+                    {
+                        "id": event.id,
+                        "type": event.event_type,
+                        "payload": event.payload,
+                        "created_at": event.created_at.isoformat(),
+                    }
+                )
+            await repo.delete_many([event.id for event in events])
+            await session.commit()
+        return len(events)
+
+
+outbox_relay = OutboxRelay()
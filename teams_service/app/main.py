@@ -1,15 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from sqladmin import Admin
 
 from app.admin.authentication import authentication_backend
 from app.admin.views import TeamAdmin, TeamEmployeeAdmin, TeamNewsAdmin
+from app.clients.http import http_clients
 from app.database import async_engine
+from app.events.outbox_relay import outbox_relay
+from app.logging_config import logger
 from app.routers.employees import router as employee_router
 from app.routers.team_news import router as team_news_router
 from app.routers.teams import router as team_router
+from app.routers.token_cache import router as token_cache_router
 from app.routers.webhook import router as webhook
 
-app = FastAPI(root_path="/teams")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Открытие HTTP-клиентов для других сервисов и запуск публикации событий изменения состава команд"""
+    http_clients.open("user")
+    task = asyncio.create_task(outbox_relay.run())
+    yield
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        logger.info("Публикация событий изменения состава команд остановлена")
+    await http_clients.close()
+
+
+app = FastAPI(root_path="/teams", lifespan=lifespan)
 admin = Admin(app, async_engine, authentication_backend=authentication_backend)
 
 admin.add_view(TeamAdmin)
@@ -21,3 +43,4 @@ app.include_router(team_router, prefix="/teams", tags=["teams"])
 app.include_router(employee_router, prefix="/teams", tags=["employees"])
 app.include_router(team_news_router, prefix="/teams", tags=["team_news"])
 app.include_router(webhook, prefix="/webhook", tags=["webhook"])
+app.include_router(token_cache_router, tags=["token cache"])
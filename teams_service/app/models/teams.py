@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import TEXT, DateTime, Enum, ForeignKey, String, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -58,3 +58,19 @@ class TeamNews(Base):
 
     def __str__(self):
         return f"News: {self.title}"
+
+
+class MembershipOutbox(Base):
+    """
+    События изменения состава команд, ожидающие публикации в брокер сообщений.
+    Записываются в одной транзакции с изменением, публикуются и удаляются после коммита.
+    """
+
+    __tablename__ = "membership_outbox"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_type: Mapped[str] = mapped_column(String(32))
+    payload: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def __str__(self):
+        return f"Outbox event {self.id}: {self.event_type}"
@@ -0,0 +1,24 @@
+from sqlalchemy import delete, select
+
+from app.models.teams import MembershipOutbox
+from app.repositories.base_repository import BaseRepository
+
+
+class MembershipOutboxRepository(BaseRepository):
+    """Репозиторий исходящих событий изменения состава команд"""
+
+    model: type[MembershipOutbox] = MembershipOutbox
+
+    async def get_pending(self, limit: int) -> list[MembershipOutbox]:
+        """
+        Получение неопубликованных событий в порядке их записи.
+        Строки блокируются до конца транзакции, заблокированные другим экземпляром сервиса пропускаются.
+        """
+        stmt = select(self.model).order_by(self.model.id).limit(limit).with_for_update(skip_locked=True)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def delete_many(self, ids: list[int]) -> None:
+        """Удаление опубликованных событий"""
+        stmt = delete(self.model).where(self.model.id.in_(ids))
+        await self.session.execute(stmt)
@@ -1,4 +1,4 @@
-from sqlalchemy import delete, exists, select, update
+from sqlalchemy import and_, delete, exists, false, or_, select, tuple_, update
 
 from app.models.teams import TeamEmployee
 from app.repositories.base_repository import BaseRepository
@@ -21,6 +21,31 @@ class TeamEmployeeRepository(BaseRepository):
         result = await self.session.scalars(stmt)
         return result.first()
 
+    async def get_employees_batch(
+        self, employee_ids: list[int], team_id: int | None, pairs: list[tuple[int, int]]
+    ) -> list[TeamEmployee]:
+        """Получение работников команд одним запросом по списку работников и/или пар (команда, работник)"""
+        conditions = []
+        if employee_ids:
+            by_ids = self.model.employee_id.in_(employee_ids)
+            conditions.append(by_ids if team_id is None else and_(by_ids, self.model.team_id == team_id))
+        if pairs:
+            # Порядок (employee_id, team_id) совпадает с уникальным индексом uq_employee_team
+            conditions.append(
+                tuple_(self.model.employee_id, self.model.team_id).in_(
+                    [(employee_id, team_id) for team_id, employee_id in pairs]
+                )
+            )
+        stmt = select(self.model).where(or_(false(), *conditions)).order_by(self.model.team_id, self.model.employee_id)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def get_memberships(self, after_id: int, limit: int) -> list[TeamEmployee]:
+        """Получение участников всех команд порциями по возрастанию id"""
+        stmt = select(self.model).where(self.model.id > after_id).order_by(self.model.id).limit(limit)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
     async def exists_employee_team(self, team_id: int, employee_id: int) -> bool:
         """Проверка на существование работника в команде"""
         stmt = select(exists().where(self.model.team_id == team_id, self.model.employee_id == employee_id))
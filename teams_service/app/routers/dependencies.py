@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.clients.user_client import AuthClient
 from app.config import settings
 from app.database import get_session
-from app.schemas.users import EmployeeRole, User
+from app.schemas.users import EmployeeRole, Status, User
 from app.services.employee_service import TeamEmployeeService
 from app.services.team_news_service import TeamNewsService
 from app.services.team_service import TeamService
@@ -57,6 +57,15 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_c
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def require_system_admin(user: CurrentUser) -> None:
+    """Пользователь с доступом администратора системы"""
+    if user.status != Status.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не достаточно прав")
+
+
+SystemAdminDeps = Depends(require_system_admin)
+
+
 async def require_admin(team_id: int, user: Annotated[User, Depends(get_current_user)]) -> User:
     """
     Разрешает действия только администраторам команды"""
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from app.routers.dependencies import AdminDeps, TeamEmployeeServiceDeps
-from app.schemas.employees import EmployeeCreate, EmployeeUpdateRole, TeamEmployeeResponse
+from app.schemas.employees import EmployeeBatchRequest, EmployeeCreate, EmployeeUpdateRole, TeamEmployeeResponse
+from app.security import verify_service_api_key
 
 router = APIRouter()
 
@@ -28,6 +29,18 @@ async def get_team_employees(team_emp_service: TeamEmployeeServiceDeps, team_id:
     return await team_emp_service.get_team_employees(team_id)
 
 
+@router.post(
+    "/employees/batch",
+    response_model=list[TeamEmployeeResponse],
+    dependencies=[Depends(verify_service_api_key)],
+    summary="Пакетное получение сотрудников команд",
+)
+async def get_employees_batch(
+    team_emp_service: TeamEmployeeServiceDeps, data: EmployeeBatchRequest
+) -> list[TeamEmployeeResponse]:
+    return await team_emp_service.get_employees_batch(data)
+
+
 @router.get(
     "/{team_id}/employees/{employee_id}",
     response_model=TeamEmployeeResponse,
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
 
 from app.routers.dependencies import WebHookServiceDeps
 from app.schemas.employees import TeamEmployeeResponse
 from app.schemas.users import EmployeeCreate
-from app.security import verify_api_key
+from app.security import verify_api_key, verify_task_api_key
 
 router = APIRouter()
 
@@ -11,3 +13,16 @@ router = APIRouter()
 @router.post("/add_employee/", dependencies=[Depends(verify_api_key)], summary="Регистрация в команде по team_code")
 async def add_employee_to_team(team_service: WebHookServiceDeps, new_employee: EmployeeCreate) -> TeamEmployeeResponse:
     return await team_service.add_employee(new_employee)
+
+
+@router.get(
+    "/memberships/",
+    dependencies=[Depends(verify_task_api_key)],
+    summary="Получение участников всех команд для синхронизации",
+)
+async def get_memberships(
+    team_service: WebHookServiceDeps,
+    after_id: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=5000)] = 1000,
+) -> list[TeamEmployeeResponse]:
+    return await team_service.get_memberships(after_id, limit)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 from app.models.teams import EmployeeRole
 
@@ -38,3 +38,28 @@ class EmployeeCreate(BaseModel):
     email: EmailStr
     password: str
     role: EmployeeRole = EmployeeRole.EMPLOYEE
+
+
+class TeamEmployeeKey(BaseModel):
+    """Пара команда-работник"""
+
+    team_id: int
+    employee_id: int
+
+
+class EmployeeBatchRequest(BaseModel):
+    """
+    Пакетный запрос работников команд.
+    employee_ids - работники в команде team_id (в любых командах, если team_id не указан),
+    pairs - конкретные пары команда-работник.
+    """
+
+    team_id: int | None = None
+    employee_ids: list[int] = Field(default_factory=list, max_length=1000)
+    pairs: list[TeamEmployeeKey] = Field(default_factory=list, max_length=1000)
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "EmployeeBatchRequest":
+        if not (self.employee_ids or self.pairs):
+            raise ValueError("Необходимо указать employee_ids или pairs")
+        return self
@@ -0,0 +1,19 @@
+import enum
+
+from pydantic import BaseModel
+
+from app.models.teams import EmployeeRole
+
+
+class MembershipEventType(str, enum.Enum):
+    ADDED = "added"
+    ROLE_CHANGED = "role_changed"
+    REMOVED = "removed"
+
+
+class MembershipEvent(BaseModel):
+    """Изменение состава команды или роли работника"""
+
+    employee_id: int
+    team_id: int
+    role: EmployeeRole | None = None
@@ -7,3 +7,15 @@ def verify_api_key(x_api_key: str = Header(...)):
     """Функция верифицирует заголовок API KEY"""
     if x_api_key != settings.USER_API_KEY:
         raise HTTPException(status_code=403, detail="Invalid API Key")
+
+
+def verify_task_api_key(x_api_key: str = Header(...)):
+    """Функция верифицирует заголовок API KEY сервиса задач"""
+    if x_api_key != settings.TASK_API_KEY:
+        raise HTTPException(status_code=403, detail="Invalid API Key")
+
+
+def verify_service_api_key(x_api_key: str = Header(...)):
+    """Функция верифицирует заголовок API KEY сервисов, которые запрашивают работников команд"""
+    if x_api_key not in [settings.USER_API_KEY, settings.TASK_API_KEY, settings.MEETING_API_KEY]:
+        raise HTTPException(status_code=403, detail="Invalid API Key")
@@ -6,11 +6,13 @@ from app.logging_config import logger
 from app.models.teams import TeamEmployee
 from app.repositories.team_employee_repo import TeamEmployeeRepository
 from app.repositories.team_repo import TeamRepository
-from app.schemas.employees import EmployeeCreate, EmployeeUpdateRole
+from app.schemas.employees import EmployeeBatchRequest, EmployeeCreate, EmployeeUpdateRole
+from app.schemas.membership_events import MembershipEventType
+from app.services.membership_event_mixin import MembershipEventMixin
 
 
-class TeamEmployeeService:
-    """Сервис для управления работниками в команде"""
+class TeamEmployeeService(MembershipEventMixin):
+    """Сервис для управления работниками в команде с публикацией событий изменения состава команды"""
 
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -23,7 +25,8 @@ class TeamEmployeeService:
         await self._exists_team(team_id)
         new_user = await self.user_client.create_user(**data.model_dump(exclude=["role"]), team_id=team_id)
         new_employee = await self.repo.create(team_id=team_id, employee_id=new_user.id, role=data.role)
-        await self.session.commit()
+        await self.add_membership_event(MembershipEventType.ADDED, team_id, new_employee.employee_id, new_employee.role)
+        await self.commit_with_events()
         logger.info(f"Зарегистрирован работник {new_employee.employee_id} в команде {team_id}")
         return new_employee
 
@@ -41,11 +44,17 @@ class TeamEmployeeService:
             )
         return employee
 
+    async def get_employees_batch(self, data: EmployeeBatchRequest) -> list[TeamEmployee]:
+        """Пакетное получение работников команд, отсутствующие в командах работники не возвращаются"""
+        pairs = [(pair.team_id, pair.employee_id) for pair in data.pairs]
+        return await self.repo.get_employees_batch(data.employee_ids, data.team_id, pairs)
+
     async def update_role(self, team_id: int, employee_id: int, role: EmployeeUpdateRole) -> TeamEmployee:
         """Обновление роли работника"""
         await self._exists_employee_team(team_id, employee_id)
         update_employee = await self.repo.update_role(team_id, employee_id, role.model_dump())
-        await self.session.commit()
+        await self.add_membership_event(MembershipEventType.ROLE_CHANGED, team_id, employee_id, update_employee.role)
+        await self.commit_with_events()
         logger.info(f"Обновлена роль работника {employee_id} в команде {team_id}")
         return update_employee
 
@@ -54,7 +63,8 @@ class TeamEmployeeService:
         await self._exists_employee_team(team_id, employee_id)
         await self.user_client.delete_user(employee_id)
         await self.repo.delete_employee(team_id, employee_id)
-        await self.session.commit()
+        await self.add_membership_event(MembershipEventType.REMOVED, team_id, employee_id)
+        await self.commit_with_events()
         logger.info(f"Удален работник {employee_id} из команды {team_id}")
 
     async def _exists_employee_team(self, team_id: int, employee_id: int) -> None:
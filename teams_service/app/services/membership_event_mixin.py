@@ -0,0 +1,24 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.events.outbox_relay import outbox_relay
+from app.models.teams import EmployeeRole
+from app.repositories.outbox_repo import MembershipOutboxRepository
+from app.schemas.membership_events import MembershipEvent, MembershipEventType
+
+
+class MembershipEventMixin:
+    """Класс миксин добавляет запись событий изменения состава команды для других сервисов"""
+
+    session: AsyncSession
+
+    async def add_membership_event(
+        self, event_type: MembershipEventType, team_id: int, employee_id: int, role: EmployeeRole | None = None
+    ) -> None:
+        """Запись события в outbox в текущей транзакции"""
+        payload = MembershipEvent(employee_id=employee_id, team_id=team_id, role=role).model_dump(mode="json")
+        await MembershipOutboxRepository(self.session).create(event_type=event_type.value, payload=payload)
+
+    async def commit_with_events(self) -> None:
+        """Коммит транзакции и публикация записанных событий"""
+        await self.session.commit()
+        outbox_relay.notify()
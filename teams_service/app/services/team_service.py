@@ -3,16 +3,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.logging_config import logger
 from app.models.teams import Team
+from app.repositories.team_employee_repo import TeamEmployeeRepository
 from app.repositories.team_repo import TeamRepository
+from app.schemas.membership_events import MembershipEventType
 from app.schemas.teams import TeamUpdate
+from app.services.membership_event_mixin import MembershipEventMixin
 
 
-class TeamService:
+class TeamService(MembershipEventMixin):
     """Сервис для управления командами"""
 
     def __init__(self, session: AsyncSession):
         self.session = session
         self.repo = TeamRepository(session)
+        self.employee_repo = TeamEmployeeRepository(session)
 
     async def get_team_by_code(self, team_code: str) -> Team:
         """Получение команды по специально коду"""
@@ -34,10 +38,12 @@ class TeamService:
         return team
 
     async def delete_team(self, team_id: int) -> None:
-        """Удаление команды"""
+        """Удаление команды вместе с ее работниками"""
         await self._exists_team(team_id)
+        for employee in await self.employee_repo.get_team_employees(team_id):
+            await self.add_membership_event(MembershipEventType.REMOVED, team_id, employee.employee_id)
         await self.repo.delete(team_id)
-        await self.session.commit()
+        await self.commit_with_events()
         logger.info(f"Удалена команда {team_id}")
 
     async def _exists_team(self, team_id: int) -> None:
@@ -5,10 +5,12 @@ from app.logging_config import logger
 from app.models.teams import TeamEmployee
 from app.repositories.team_employee_repo import TeamEmployeeRepository
 from app.repositories.team_repo import TeamRepository
+from app.schemas.membership_events import MembershipEventType
 from app.schemas.users import EmployeeCreate
+from app.services.membership_event_mixin import MembershipEventMixin
 
 
-class WebHookService:
+class WebHookService(MembershipEventMixin):
     """Сервис для добавление сотрудника при регистрации на основе кода команды"""
 
     def __init__(self, session: AsyncSession):
@@ -22,6 +24,11 @@ class WebHookService:
         if not team:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Неверный код")
         employee = await self.employee_repo.create(employee_id=data.employee_id, team_id=team.id)
-        await self.session.commit()
+        await self.add_membership_event(MembershipEventType.ADDED, team.id, employee.employee_id, employee.role)
+        await self.commit_with_events()
         logger.info(f"Добавлен работник {data.employee_id} в команду {team.id}")
         return employee
+
+    async def get_memberships(self, after_id: int, limit: int) -> list[TeamEmployee]:
+        """Получение участников всех команд для синхронизации в других сервисах"""
+        return await self.employee_repo.get_memberships(after_id, limit)